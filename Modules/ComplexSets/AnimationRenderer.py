@@ -0,0 +1,236 @@
+from .Colorizer import Colorizer
+from .ComplexSet import ComplexSet
+from .CoordinateRange import CoordinateRange
+from .SetData import SetData
+from .Sets import DeepMandelbrot
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from decimal import Decimal, localcontext
+from PIL import Image
+import itertools
+import os
+
+def render_frame(frame:ComplexSet) -> SetData:
+    """Generates a frame in a worker process.
+
+    Args:
+        frame (complexset): The set of the frame, seeded with the pixels it shares with an earlier frame.
+
+    Returns:
+        setdata: The final set data of the frame.
+
+    """
+    return frame.generate_set()
+
+class AnimationRenderer(object):
+    """Renders a zoom along a path of keyframes into a sequence of frames, streamed one at a time.
+
+    Every keyframe places the center of the view and the width of its real axis (scale) at a frame number. Between
+    keyframes the scale changes geometrically, so the zoom runs at a steady speed, while the center moves along with
+    the scale, so the point being zoomed into drifts steadily across the screen.
+
+    Frames are generated across a pool of worker processes, one frame per worker ahead of the frame being written, and
+    always come out in order. Every frame is snapped onto the grid of the nearest earlier frame that has finished by
+    the time it is submitted and reuses the pixels the two grids share, see ComplexSet.reuse(). With every worker busy,
+    that frame is usually about as many frames back as there are workers, and the first frame of every worker has
+    nothing to reuse. Only the frames in flight are held in memory.
+
+    Args:
+        complex_set (complexset): The set to animate, every frame is a view of it, see ComplexSet.view().
+        keyframes (list[dict]): The keyframes, each with a 'frame' number, a 'center' ({'real', 'imag'}) and a 'scale'.
+        workers (int, optional): Number of worker processes, defaults to the number of CPUs.
+
+    Attributes:
+        complex_set (complexset): The set to animate.
+        keyframes (list[dict]): The keyframes, sorted by frame number.
+        workers (int): Number of worker processes.
+        frame_count (int): Number of frames, up to and including the last keyframe.
+        executor (concurrent.futures.processpoolexecutor): The worker pool, started on first use.
+        DEFAULT_DURATION (int): Default display time of every frame of an animated image, in milliseconds.
+
+    Raises:
+        ValueError: If there are fewer than two keyframes.
+
+    """
+
+    DEFAULT_DURATION = 40
+
+    def __init__(self, complex_set:ComplexSet, keyframes:list, workers=None):
+        if len(keyframes) < 2:
+            raise ValueError('A zoom path needs at least two keyframes.')
+
+        self._complex_set = complex_set
+        self._keyframes = sorted(keyframes, key=lambda keyframe: keyframe['frame'])
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._executor = None
+
+    @property
+    def complex_set(self) -> ComplexSet:
+        """complexset: The set to animate."""
+        return self._complex_set
+
+    @property
+    def keyframes(self) -> list:
+        """list[dict]: The keyframes, sorted by frame number."""
+        return self._keyframes
+
+    @property
+    def workers(self) -> int:
+        """int: Number of worker processes."""
+        return self._workers
+
+    @property
+    def frame_count(self) -> int:
+        """int: Number of frames, up to and including the last keyframe."""
+        return self._keyframes[-1]['frame'] + 1
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """concurrent.futures.processpoolexecutor: The worker pool, started on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def view(self, frame:int) -> CoordinateRange:
+        """Finds the coordinate range of a frame along the zoom path.
+
+        Args:
+            frame (int): The frame number.
+
+        Returns:
+            coordinaterange: The XY range of the frame, in decimals for deep sets.
+
+        """
+        start, end = self._keyframes[0], self._keyframes[1]
+        for start, end in zip(self._keyframes, self._keyframes[1:]):
+            if frame <= end['frame']:
+                break
+
+        with localcontext() as ctx:
+            ctx.prec = 60
+            c0 = (Decimal(str(start['center']['real'])), Decimal(str(start['center']['imag'])))
+            c1 = (Decimal(str(end['center']['real'])), Decimal(str(end['center']['imag'])))
+            s0 = Decimal(str(start['scale']))
+            s1 = Decimal(str(end['scale']))
+
+            t = Decimal(frame - start['frame']) / Decimal(max(1, end['frame'] - start['frame']))
+            scale = s0 * (s1 / s0) ** t
+
+            # The center covers the same share of its path as the scale, so it moves steadily on screen.
+            share = (s0 - scale) / (s0 - s1) if s0 != s1 else t
+            cx = c0[0] + (c1[0] - c0[0]) * share
+            cy = c0[1] + (c1[1] - c0[1]) * share
+
+            width, height = self.complex_set.xy_vals
+            half_x = scale / 2
+            half_y = half_x * height / width
+            bounds = (cx - half_x, cx + half_x, cy - half_y, cy + half_y)
+
+        # Only deep sets iterate decimal coordinates, the others need floats.
+        if not isinstance(self.complex_set, DeepMandelbrot):
+            bounds = [float(bound) for bound in bounds]
+        return CoordinateRange(*bounds)
+
+    def frames(self):
+        """Generates every frame in order.
+
+        Yields:
+            setdata: The final set data of every frame.
+
+        """
+        pending = deque()
+        last = None
+
+        def finish(complex_set:ComplexSet, future) -> ComplexSet:
+            if complex_set.iteration < complex_set.max_iterations:
+                complex_set.data = future.result()
+                complex_set.iteration = complex_set.max_iterations
+            return complex_set
+
+        def nearest() -> ComplexSet:
+            # Frames in flight are later than the last written frame, so the latest finished one is the nearest.
+            for complex_set, future in reversed(pending):
+                if future.done() and future.exception() is None:
+                    return finish(complex_set, future)
+            return last
+
+        def submit(frame:int):
+            complex_set = self.complex_set.view(self.view(frame), self.complex_set.xy_vals)
+            previous = nearest()
+            if previous is not None and complex_set.can_reuse(previous):
+                complex_set.coord_range = previous.snap(complex_set.coord_range)
+                complex_set.reuse(previous)
+            pending.append((complex_set, self.executor.submit(render_frame, complex_set)))
+
+        # One frame per worker keeps every worker busy while the next frame in order is being written.
+        numbers = iter(range(self.frame_count))
+        for frame in itertools.islice(numbers, self.workers):
+            submit(frame)
+
+        while pending:
+            complex_set = finish(*pending.popleft())
+            last = complex_set
+
+            frame = next(numbers, None)
+            if frame is not None:
+                submit(frame)
+            yield complex_set.data
+
+    def images(self, colormap=Colorizer.DEFAULT_COLORMAP):
+        """Generates and colors every frame in order.
+
+        Args:
+            colormap (str, optional): The name of the matplotlib colormap.
+
+        Yields:
+            pil.image: The image of every frame.
+
+        """
+        colorizer = Colorizer.shared(colormap)
+        for data in self.frames():
+            yield Image.fromarray(colorizer.colorize(data.count))
+
+    def save(self, path:str, colormap=Colorizer.DEFAULT_COLORMAP, duration=DEFAULT_DURATION, progress=None):
+        """Writes every frame, as one image per frame or as a single animated image.
+
+        Paths with a printf-style number, such as 'frames/%05d.png', are written as one image per frame as soon as it
+        is generated, so only the frames in flight are held in memory. Any other path is written as a single animated
+        image, such as an animated PNG or GIF. Pillow only encodes animated images once it has every frame, so the
+        colored frames are all held in memory until the end, use numbered frames for long animations. Either way, the
+        set data of every frame is dropped as soon as it is colored.
+
+        Args:
+            path (str): The path of the output.
+            colormap (str, optional): The name of the matplotlib colormap.
+            duration (int, optional): Display time of every frame of an animated image, in milliseconds.
+            progress (function(int), optional): Called with the frame number after every frame is generated.
+
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        def colored():
+            for frame, image in enumerate(self.images(colormap)):
+                if progress is not None:
+                    progress(frame)
+                yield image
+
+        if '%' in path:
+            for frame, image in enumerate(colored()):
+                image.save(path % frame)
+        else:
+            images = list(colored())
+            images[0].save(path, save_all=True, append_images=images[1:], duration=duration, loop=0)
+
+    def close(self):
+        """Shuts down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,225 @@
+from .BufferPool import BufferPool
+from .Colorizer import Colorizer
+from .ComplexSet import ComplexSet
+from .CoordinateRange import CoordinateRange
+from .SetData import SetData
+from .TileCache import TileCache
+from .Sets import Mandelbrot, Julia, DeepMandelbrot
+from decimal import localcontext
+from PIL import Image
+import numpy as np
+import os
+
+class InvalidJob(Exception):
+    """Raised if a render job is missing a setting or one of its settings is invalid."""
+    pass
+
+class BatchRenderer(object):
+    """Renders views of complex sets to image and array files without a GUI.
+
+    Every job is a dictionary describing one view with the keys of the set section of config.json, on top of DEFAULTS:
+    'set', 'maxIterations', 'precision', 'compact', 'xRange' and 'yRange' ({'min', 'max'}), 'julia_constant'
+    ({'real', 'imag'}), 'dimensions' ({'width', 'height'}), 'colormap' and 'output'. A view may be given by its
+    'center' ({'real', 'imag'}) and the 'scale' of its real axis instead of its ranges. Deep Mandelbrot coordinates
+    may be strings to keep their precision.
+
+    Outputs ending in .npy hold the divergence grid, any other extension is written as an image. Every job shares the
+    buffer pool of the batch renderer, so consecutive views of the same size reuse warm buffers.
+
+    Args:
+        renderer (object, optional): A renderer with a render(complex_set) method, see Renderers, None to generate sets directly.
+        cache (tilecache, optional): A tile cache to seed views from, only used for views that lie on one of its grids.
+
+    Attributes:
+        renderer (object): The renderer, or None to generate sets directly.
+        cache (tilecache): The tile cache, or None.
+        pool (bufferpool): The buffer pool shared by every job.
+        SETS (dict[str, type]): The set class of every set name, in lowercase.
+        DEFAULTS (dict): The settings of a job that leaves them out.
+
+    """
+
+    SETS = {'mandelbrot': Mandelbrot, 'julia': Julia, 'deep mandelbrot': DeepMandelbrot}
+    DEFAULTS = {
+        'set': 'Mandelbrot',
+        'maxIterations': 1000,
+        'precision': 'float64',
+        'compact': True,
+        'xRange': {'min': -2.5, 'max': 1},
+        'yRange': {'min': -1.75, 'max': 1.75},
+        'julia_constant': {'real': -0.835, 'imag': -0.2321},
+        'dimensions': {'width': 650, 'height': 650},
+        'colormap': Colorizer.DEFAULT_COLORMAP
+    }
+
+    def __init__(self, renderer=None, cache=None):
+        self._renderer = renderer
+        self._cache = cache
+        self._pool = BufferPool()
+
+    @property
+    def renderer(self):
+        """object: The renderer, or None to generate sets directly."""
+        return self._renderer
+
+    @property
+    def cache(self) -> TileCache:
+        """tilecache: The tile cache, or None."""
+        return self._cache
+
+    @property
+    def pool(self) -> BufferPool:
+        """bufferpool: The buffer pool shared by every job."""
+        return self._pool
+
+    @staticmethod
+    def coord_range(job:dict) -> CoordinateRange:
+        """Finds the coordinate range of a job, from its center and scale if it has them, otherwise from its ranges.
+
+        Args:
+            job (dict): The job.
+
+        Returns:
+            coordinaterange: The XY range of the view.
+
+        """
+        deep = str(job['set']).lower() == 'deep mandelbrot'
+        number = DeepMandelbrot.to_decimal if deep else float
+
+        if 'center' in job or 'scale' in job:
+            try:
+                cx = number(job['center']['real'])
+                cy = number(job['center']['imag'])
+                scale = number(job['scale'])
+            except KeyError as e:
+                raise InvalidJob('A job given by its center and scale needs both, %s is missing.' % e)
+
+            dimensions = job['dimensions']
+            with localcontext() as ctx:
+                # Deep views keep every digit of their center down to well below the size of a pixel.
+                if deep:
+                    ctx.prec = max(30, 20 + max(cx.adjusted(), cy.adjusted(), 0) - scale.adjusted())
+
+                # Pixels are square, so the imaginary axis is scaled by the aspect ratio.
+                half_x = scale / 2
+                half_y = half_x * dimensions['height'] / dimensions['width']
+                return CoordinateRange(cx - half_x, cx + half_x, cy - half_y, cy + half_y)
+
+        xRange = job['xRange']
+        yRange = job['yRange']
+        return CoordinateRange(number(xRange['min']), number(xRange['max']), number(yRange['min']), number(yRange['max']))
+
+    @staticmethod
+    def build(job:dict) -> ComplexSet:
+        """Creates the set of a job.
+
+        Args:
+            job (dict): The job.
+
+        Returns:
+            complexset: The set, ready to be generated.
+
+        Raises:
+            InvalidJob: If the set name is unknown.
+
+        """
+        name = str(job['set']).lower()
+        if name not in BatchRenderer.SETS:
+            raise InvalidJob('Unknown set "%s", expected one of %s.' % (job['set'], ', '.join(BatchRenderer.SETS)))
+
+        coord_range = BatchRenderer.coord_range(job)
+        xy_vals = (int(job['dimensions']['width']), int(job['dimensions']['height']))
+        iterations = int(job['maxIterations'])
+
+        if name == 'julia':
+            constant = complex(job['julia_constant']['real'], job['julia_constant']['imag'])
+            return Julia(iterations, coord_range, xy_vals, constant, compact=job['compact'], precision=job['precision'])
+        if name == 'deep mandelbrot':
+            return DeepMandelbrot(iterations, coord_range, xy_vals)
+        return Mandelbrot(iterations, coord_range, xy_vals, compact=job['compact'], precision=job['precision'])
+
+    def render(self, complex_set:ComplexSet) -> SetData:
+        """Generates a set with the renderer, if any, seeding it with the tile cache.
+
+        The requested view is always rendered as is. Views the cache can hold, see TileCache.locate(), are seeded with
+        its cached tiles and their new tiles are cached, any other view skips the cache.
+
+        Args:
+            complex_set (complexset): The set to generate.
+
+        Returns:
+            setdata: The final set data.
+
+        """
+        complex_set.pool = self.pool
+        cached = self.cache is not None and self.cache.seed(complex_set) is not None
+
+        if self.renderer is not None:
+            data = self.renderer.render(complex_set)
+        else:
+            data = complex_set.generate_set()
+
+        if cached:
+            self.cache.store(complex_set, data)
+        return data
+
+    def write(self, path:str, data:SetData, colormap:str):
+        """Writes the divergence grid of a set to a .npy file, or colors it and writes it as an image.
+
+        Args:
+            path (str): The path of the file, its extension picks the format.
+            data (setdata): The set data.
+            colormap (str): The name of the matplotlib colormap of images.
+
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if path.lower().endswith('.npy'):
+            np.save(path, data.count)
+        else:
+            Image.fromarray(Colorizer.shared(colormap).colorize(data.count)).save(path)
+
+    def run(self, job:dict) -> str:
+        """Renders a job and writes its output.
+
+        Args:
+            job (dict): The job, missing settings are taken from DEFAULTS.
+
+        Returns:
+            str: The path of the output.
+
+        Raises:
+            InvalidJob: If the job has no output or an invalid setting.
+
+        """
+        job = {**BatchRenderer.DEFAULTS, **job}
+        if 'output' not in job:
+            raise InvalidJob('Every job needs an output path.')
+
+        complex_set = self.build(job)
+        data = None
+        try:
+            data = self.render(complex_set)
+            self.write(job['output'], data, job['colormap'])
+        finally:
+            # Generated sets and renderers hold their data in pooled buffers, which the next job reuses.
+            if data is not None and data is not complex_set.data:
+                self.pool.release(data.re, data.im, data.count)
+            complex_set.release()
+        return job['output']
+
+    def run_all(self, jobs:list, defaults=None):
+        """Renders many jobs in order.
+
+        Args:
+            jobs (list[dict]): The jobs.
+            defaults (dict, optional): Settings shared by every job, on top of DEFAULTS.
+
+        Yields:
+            str: The path of the output of every job, as soon as it is written.
+
+        """
+        for job in jobs:
+            yield self.run({**(defaults or {}), **job})
@@ -0,0 +1,144 @@
+from collections import defaultdict
+import numpy as np
+import threading
+
+class BufferPool(object):
+    """Pool of reusable arrays, keyed by their shape and dtype.
+
+    Sets draw the working arrays of every generation from the pool and give them back once the generation is
+    discarded, so generating view after view of the same size doesn't allocate the full grid again every time.
+    Arrays drawn from the pool may hold values from an earlier generation, see zeros() for cleared arrays.
+
+    The pool is shared by the threads of a renderer. Copies sent to other processes start out empty.
+
+    Args:
+        depth (int, optional): The maximum number of arrays kept for every shape and dtype.
+
+    Attributes:
+        depth (int): The maximum number of arrays kept for every shape and dtype.
+        nbytes (int): The size of the pooled arrays in bytes.
+        hits (int): How many arrays were drawn from the pool.
+        misses (int): How many arrays had to be allocated.
+        DEFAULT_DEPTH (int): Default depth, enough for the data and mask of a set and its previous view.
+
+    """
+
+    DEFAULT_DEPTH = 4
+
+    def __init__(self, depth=DEFAULT_DEPTH):
+        self._depth = depth
+        self._arrays = defaultdict(list)
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def depth(self) -> int:
+        """int: The maximum number of arrays kept for every shape and dtype."""
+        return self._depth
+
+    @depth.setter
+    def depth(self, depth:int):
+        self._depth = depth
+
+    @property
+    def nbytes(self) -> int:
+        """int: The size of the pooled arrays in bytes."""
+        return self._nbytes
+
+    @property
+    def hits(self) -> int:
+        """int: How many arrays were drawn from the pool."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """int: How many arrays had to be allocated."""
+        return self._misses
+
+    def empty(self, shape:tuple, dtype:np.dtype) -> np.ndarray:
+        """Draws an array from the pool, allocating it if the pool has none of its shape and dtype.
+
+        Args:
+            shape (tuple): The shape of the array.
+            dtype (numpy.dtype): The dtype of the array.
+
+        Returns:
+            numpy.ndarray: The array, holding arbitrary values.
+
+        """
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            arrays = self._arrays.get(key)
+            if arrays:
+                array = arrays.pop()
+                self._nbytes -= array.nbytes
+                self._hits += 1
+                return array
+
+            self._misses += 1
+        return np.empty(shape, dtype=dtype)
+
+    def full(self, shape:tuple, value, dtype:np.dtype) -> np.ndarray:
+        """Draws an array from the pool and fills it, see empty().
+
+        Args:
+            shape (tuple): The shape of the array.
+            value (scalar): The value to fill the array with.
+            dtype (numpy.dtype): The dtype of the array.
+
+        Returns:
+            numpy.ndarray: The array, filled with the value.
+
+        """
+        array = self.empty(shape, dtype)
+        array.fill(value)
+        return array
+
+    def zeros(self, shape:tuple, dtype:np.dtype) -> np.ndarray:
+        """Draws an array from the pool and clears it, see empty().
+
+        Args:
+            shape (tuple): The shape of the array.
+            dtype (numpy.dtype): The dtype of the array.
+
+        Returns:
+            numpy.ndarray: The array, filled with zeros.
+
+        """
+        return self.full(shape, 0, dtype)
+
+    def release(self, *arrays):
+        """Gives arrays back to the pool. They must not be used by their previous owner afterwards.
+
+        Arrays that don't own their memory, such as views and memory-mapped arrays, are left alone, as are arrays
+        whose shape and dtype already fill their place in the pool. Arrays given more than once are only kept once.
+
+        Args:
+            *arrays (numpy.ndarray): The arrays, None is ignored.
+
+        """
+        with self._lock:
+            for array in arrays:
+                if array is None or array.base is not None or not array.flags.writeable or not array.flags.c_contiguous:
+                    continue
+
+                pooled = self._arrays[(array.shape, array.dtype)]
+                if len(pooled) < self.depth and not any(p is array for p in pooled):
+                    pooled.append(array)
+                    self._nbytes += array.nbytes
+
+    def clear(self):
+        """Drops every pooled array and resets the counters."""
+        with self._lock:
+            self._arrays.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def __getstate__(self):
+        return {'_depth': self._depth}
+
+    def __setstate__(self, state):
+        self.__init__(state['_depth'])
@@ -0,0 +1,148 @@
+from matplotlib import cm
+import matplotlib
+import numpy as np
+import threading
+
+class Colorizer(object):
+    """Maps divergence grids to RGB images through a lookup table sampled from a matplotlib colormap.
+
+    Counts are scaled linearly from the smallest to the largest count of the grid, like the default normalization of
+    matplotlib, so images match the ones matplotlib would draw. Every lookup table has LUT_SIZE colors whatever the
+    colormap, so the indices of a grid can be colored with any colormap, see apply(). Only the colormap registry of
+    matplotlib is used, pyplot and its GUI backends are never imported.
+
+    Args:
+        colormap (str, optional): The name of the matplotlib colormap.
+
+    Attributes:
+        colormap (str): The name of the matplotlib colormap.
+        lut (numpy.ndarray): The (LUT_SIZE, 3) lookup table of 8-bit RGB colors.
+        DEFAULT_COLORMAP (str): Default colormap, the default of the viewer.
+        LUT_SIZE (int): Number of colors of every lookup table, a multiple of the 256 colors of most colormaps.
+
+    """
+
+    DEFAULT_COLORMAP = 'coolwarm'
+    LUT_SIZE = 4096
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    def __init__(self, colormap=DEFAULT_COLORMAP):
+        self._colormap = colormap
+        self._lut = Colorizer.lookup_table(colormap)
+
+    @staticmethod
+    def shared(colormap=DEFAULT_COLORMAP):
+        """Looks up the colorizer of a colormap, so its lookup table is only sampled once.
+
+        Args:
+            colormap (str, optional): The name of the matplotlib colormap.
+
+        Returns:
+            colorizer: The shared colorizer.
+
+        """
+        with Colorizer._lock:
+            if colormap not in Colorizer._cache:
+                Colorizer._cache[colormap] = Colorizer(colormap)
+            return Colorizer._cache[colormap]
+
+    @staticmethod
+    def colormaps() -> list:
+        """Lists the names of the matplotlib colormaps.
+
+        Returns:
+            list[str]: The sorted colormap names.
+
+        """
+        return sorted(matplotlib.colormaps) if hasattr(matplotlib, 'colormaps') else sorted(cm.cmap_d)
+
+    @property
+    def colormap(self) -> str:
+        """str: The name of the matplotlib colormap."""
+        return self._colormap
+
+    @property
+    def lut(self) -> np.ndarray:
+        """numpy.ndarray: The (LUT_SIZE, 3) lookup table of 8-bit RGB colors."""
+        return self._lut
+
+    @staticmethod
+    def lookup_table(colormap:str) -> np.ndarray:
+        """Samples every color of a matplotlib colormap, repeating them to fill LUT_SIZE colors.
+
+        Args:
+            colormap (str): The name of the matplotlib colormap.
+
+        Returns:
+            numpy.ndarray: The (LUT_SIZE, 3) lookup table of 8-bit RGB colors.
+
+        Raises:
+            ValueError: If matplotlib has no colormap with that name.
+
+        """
+        # Older matplotlib releases only have the registry functions of the cm module.
+        cmap = matplotlib.colormaps[colormap] if hasattr(matplotlib, 'colormaps') else cm.get_cmap(colormap)
+        colors = cmap(np.arange(cmap.N), bytes=True)[:, :3]
+
+        # Each color fills an equal run of the table, so colormaps with 256 colors pick exactly the color matplotlib would.
+        return np.ascontiguousarray(colors[np.arange(Colorizer.LUT_SIZE) * cmap.N // Colorizer.LUT_SIZE])
+
+    def indices(self, count:np.ndarray, limits=None) -> np.ndarray:
+        """Scales a divergence grid to indices into the lookup table.
+
+        Args:
+            count (numpy.ndarray): The divergence grid.
+            limits (tuple, optional): The (lowest, highest) counts mapped to the ends of the colormap, defaults to the
+                smallest and largest count of the grid. Fixed limits color separate grids, such as tiles, alike.
+
+        Returns:
+            numpy.ndarray: The 16-bit index of the color of every pixel.
+
+        """
+        n = Colorizer.LUT_SIZE
+        lo, hi = limits if limits is not None else (count.min(), count.max())
+        if limits is not None:
+            count = np.clip(count, lo, hi)
+        if hi == lo:
+            return np.zeros(count.shape, dtype=np.uint16)
+
+        scale = n / (float(hi) - float(lo))
+        if np.issubdtype(count.dtype, np.integer) and int(hi) - int(lo) < count.size:
+            # Integer grids map every count through a table of their own, so the grid is scaled with a single take.
+            table = np.arange(int(hi) - int(lo) + 1, dtype=np.float64)
+            table *= scale
+            table = np.minimum(table.astype(np.intp), n - 1).astype(np.uint16)
+            return np.take(table, count - lo)
+
+        scaled = np.subtract(count, lo, dtype=np.float64)
+        scaled *= scale
+        return np.minimum(scaled.astype(np.intp), n - 1).astype(np.uint16)
+
+    def apply(self, indices:np.ndarray, out=None) -> np.ndarray:
+        """Colors a grid of lookup table indices.
+
+        Args:
+            indices (numpy.ndarray): Indices into the lookup table, see indices().
+            out (numpy.ndarray, optional): A (rows, columns, 3) uint8 array to write the colors into.
+
+        Returns:
+            numpy.ndarray: The (rows, columns, 3) 8-bit RGB image.
+
+        """
+        return np.take(self._lut, indices, axis=0, out=out)
+
+    def colorize(self, count:np.ndarray, out=None, limits=None) -> np.ndarray:
+        """Colors a divergence grid.
+
+        Args:
+            count (numpy.ndarray): The divergence grid, its first row being the lowest imaginary part.
+            out (numpy.ndarray, optional): A (rows, columns, 3) uint8 array to write the colors into.
+            limits (tuple, optional): The (lowest, highest) counts mapped to the ends of the colormap, see indices().
+
+        Returns:
+            numpy.ndarray: The (rows, columns, 3) 8-bit RGB image, its first row being the highest imaginary part.
+
+        """
+        return self.apply(self.indices(count, limits)[::-1], out)
@@ -1,10 +1,19 @@
+from .BufferPool import BufferPool
 from .CoordinateRange import CoordinateRange
+from .SetData import SetData
+from .Template import Template
 import numpy as np
+import copy
+import math
 from abc import ABC, abstractclassmethod
 
 class TemplateNotGenerated(Exception):
     pass
 
+class InvalidPrecision(Exception):
+    """Raised if the precision is not one of the supported precisions."""
+    pass
+
 class ComplexSet(ABC):
     """Abstract base class for complex sets.
 
@@ -13,29 +22,65 @@ class ComplexSet(ABC):
         coord_range (coordinaterange) ((float, float), (float, float)): X and Y range values, respectively.
         xy_vals (tuple) (int, int): How many intervals to split the x and y axis into.
         name (str, optional): Name of the set, usually called by inherited classes.
+        compact (bool, optional): Whether to iterate only a compacted array of the points that haven't diverged.
+        periodicity (bool, optional): Whether to stop iterating points once their orbit is detected to be periodic.
+        precision (str, optional): Floating point precision of the generation, 'float32', 'float64' or 'auto'.
 
     Attributes:
-        template (numpy.ndarray): A grid of complex numbers to match the x and y values given across the given XY ranges.
+        template (template): A grid of complex numbers to match the x and y values given across the given XY ranges.
         name (str): The name of the set.
-        data (numpy.ndarray): The current set data during the generation process.
+        data (setdata): The current set data during the generation process.
         iteration (int): The current iteration during the generation process.
         coord_range (coordinaterange) ((float, float), (float, float)): The XY range of the set generation.
         max_iterations (int): The maximum number of iterations for the set generation.
         mask (numpy.ndarray): Grid of boolean values focusing only on set numbers that haven't diverged.
+        compact (bool): Whether to iterate only a compacted array of the points that haven't diverged.
+        xy_vals (tuple) (int, int): How many intervals the full x and y axis are split into.
+        window (tuple) (slice, slice): The (rows, columns) of the full grid this set is restricted to, if any.
+        selection (numpy.ndarray): Grid of boolean values selecting which pixels of the full grid to generate, or None for every pixel.
+        connected (bool): Whether the set is connected, so regions enclosed by pixels that never diverge are inside the set.
+        landmarks (tuple[complex]): Points of the template known to never diverge, empty if none are known.
+        cacheable (bool): Whether the pixels of the set only depend on their coordinates, so they can be cached across views.
+        periodicity (bool): Whether to stop iterating points once their orbit is detected to be periodic.
+        periodicity_tolerance (float): How close an orbit must return to its checkpoint to be considered periodic.
+        periods (numpy.ndarray): Grid of detected orbit periods, 0 where no period was detected, or None if periodicity is disabled.
+        precision (str): Floating point precision of the generation, 'float32', 'float64' or 'auto'.
+        float_dtype (numpy.dtype): The dtype of the real and imaginary parts for the resolved precision.
+        count_dtype (numpy.dtype): The narrowest unsigned dtype that fits every divergence count, up to one past the maximum iterations.
+        pool (bufferpool): The pool the working arrays of every generation are drawn from, shared by the copies of the set.
+        FLOAT_DTYPES (dict[str, numpy.dtype]): The dtype of the real and imaginary parts for each precision.
+        PERIODICITY_TOLERANCE (float): The default periodicity tolerance.
+        AUTO_PRECISION_MARGIN (float): How many float32 epsilons the pixel spacing must span for 'auto' to pick float32.
+        SPACING_BITS (int): How many significant bits of the pixel spacing tell grids apart, see pixel_grid().
      
     """
-    def __init__(self, iterations:int, coord_range:CoordinateRange, xy_vals:tuple, name='Generic'):
-        self._set = None
-        self._setmask = None
+
+    FLOAT_DTYPES = {'float32': np.dtype(np.float32), 'float64': np.dtype(np.float64)}
+    PERIODICITY_TOLERANCE = 1e-12
+    AUTO_PRECISION_MARGIN = 1024
+    SPACING_BITS = 24
+
+    def __init__(self, iterations:int, coord_range:CoordinateRange, xy_vals:tuple, name='Generic', compact=False, periodicity=False, precision='float64'):
+        self.precision = precision
+        self._compact = compact
+        self._periodicity = periodicity
+        self._periodicity_tolerance = ComplexSet.PERIODICITY_TOLERANCE
+        self._clear_state()
         self._coord_range = coord_range
         self._max_iterations = iterations
         self._name = name
-        self._iteration = 0
-        self._set_template = self.generate_template(xy_vals[0], xy_vals[1])
+        self._xy_vals = xy_vals
+        self._window = None
+        self._seed = None
+        self._selection = None
+        self._pool = BufferPool()
+        self._set_template = None
 
     @property
-    def template(self) -> np.ndarray:
-        """numpy.ndarray: The complex grid template to use for set generation."""
+    def template(self) -> Template:
+        """template: The complex grid template to use for set generation, generated on first use."""
+        if self._set_template is None:
+            self.generate_template(self.xy_vals[0], self.xy_vals[1])
         return self._set_template
     
     @property
@@ -48,12 +93,12 @@ class ComplexSet(ABC):
         self._name = name
     
     @property
-    def data(self) -> np.ndarray:
-        """numpy.ndarray: Data generated by set generation."""
+    def data(self) -> SetData:
+        """setdata: Data generated by set generation."""
         return self._set
     
     @data.setter
-    def data(self, datagrid:np.ndarray):
+    def data(self, datagrid:SetData):
         self._set = datagrid
     
     @property
@@ -91,7 +136,129 @@ class ComplexSet(ABC):
     @mask.setter
     def mask(self, setmask:np.ndarray):
         self._setmask = setmask
+
+    @property
+    def compact(self) -> bool:
+        """bool: Whether to iterate only a compacted array of the points that haven't diverged."""
+        return self._compact
+
+    @compact.setter
+    def compact(self, compact:bool):
+        self._compact = compact
+
+    @property
+    def periodicity(self) -> bool:
+        """bool: Whether to stop iterating points once their orbit is detected to be periodic."""
+        return self._periodicity
+
+    @periodicity.setter
+    def periodicity(self, periodicity:bool):
+        self._periodicity = periodicity
+
+    @property
+    def periodicity_tolerance(self) -> float:
+        """float: How close an orbit must return to its checkpoint to be considered periodic."""
+        return self._periodicity_tolerance
+
+    @periodicity_tolerance.setter
+    def periodicity_tolerance(self, tolerance:float):
+        self._periodicity_tolerance = tolerance
+
+    @property
+    def periods(self) -> np.ndarray:
+        """numpy.ndarray: Grid of detected orbit periods, 0 where no period was detected, or None if periodicity is disabled."""
+        return self._periods
+
+    @property
+    def precision(self) -> str:
+        """str: Floating point precision of the generation, 'float32', 'float64' or 'auto'."""
+        return self._precision
+
+    @precision.setter
+    def precision(self, precision:str):
+        if precision != 'auto' and precision not in ComplexSet.FLOAT_DTYPES:
+            raise InvalidPrecision('Precision must be "auto" or one of %s.' % ', '.join(ComplexSet.FLOAT_DTYPES))
+        
+        self._precision = precision
+
+    @property
+    def float_dtype(self) -> np.dtype:
+        """numpy.dtype: The dtype of the real and imaginary parts for the resolved precision."""
+        return ComplexSet.FLOAT_DTYPES[self.resolve_precision()]
+
+    @property
+    def count_dtype(self) -> np.dtype:
+        """numpy.dtype: The narrowest unsigned dtype that fits every divergence count, up to one past the maximum iterations."""
+        # Iterating a set until StopIteration, rather than stepping it, runs one iteration past the maximum and records
+        # points diverging on it, as sets always have. Their count must not wrap around to 0 and pass for the set, so
+        # a maximum of exactly 65535 takes uint32 rather than uint16.
+        return np.min_scalar_type(self.max_iterations + 1)
+
+    def resolve_precision(self) -> str:
+        """Resolves the 'auto' precision for the current coordinate range and grid size.
+
+        float32 is picked when the pixel spacing is comfortably larger than the float32 rounding error of the
+        coordinates and of the iterated points, which are bounded by 2 until they diverge.
+
+        Returns:
+            str: 'float32' or 'float64'.
+        
+        """
+        if self.precision != 'auto':
+            return self.precision
+        
+        xRange = self.coord_range.x_range
+        yRange = self.coord_range.y_range
+        x_spacing = (xRange[1] - xRange[0]) / max(1, self.xy_vals[0] - 1)
+        y_spacing = (yRange[1] - yRange[0]) / max(1, self.xy_vals[1] - 1)
+        magnitude = max(2, abs(xRange[0]), abs(xRange[1]), abs(yRange[0]), abs(yRange[1]))
+
+        threshold = ComplexSet.AUTO_PRECISION_MARGIN * np.finfo(np.float32).eps * magnitude
+        return 'float32' if min(x_spacing, y_spacing) > threshold else 'float64'
+
+    @property
+    def xy_vals(self) -> tuple:
+        """tuple (int, int): How many intervals the full x and y axis are split into."""
+        return self._xy_vals
+
+    @property
+    def window(self) -> tuple:
+        """tuple (slice, slice): The (rows, columns) of the full grid this set is restricted to, or None for the full grid."""
+        return self._window
     
+    @property
+    def selection(self) -> np.ndarray:
+        """numpy.ndarray: Grid of boolean values selecting which pixels of the full grid to generate, or None for every pixel."""
+        return self._selection
+
+    @selection.setter
+    def selection(self, selection:np.ndarray):
+        self._selection = selection
+
+    @property
+    def pool(self) -> BufferPool:
+        """bufferpool: The pool the working arrays of every generation are drawn from, shared by the copies of the set."""
+        return self._pool
+
+    @pool.setter
+    def pool(self, pool:BufferPool):
+        self._pool = pool
+
+    @property
+    def connected(self) -> bool:
+        """bool: Whether the set is connected, so regions enclosed by pixels that never diverge are inside the set."""
+        return False
+
+    @property
+    def landmarks(self) -> tuple:
+        """tuple[complex]: Points of the template known to never diverge, empty if none are known."""
+        return ()
+
+    @property
+    def cacheable(self) -> bool:
+        """bool: Whether the pixels of the set only depend on their coordinates, so they can be cached across views."""
+        return True
+
     def generate_template(self, xVals:int, yVals:int):
         """Genereates a complex template to use in the set generation.
 
@@ -100,25 +267,394 @@ class ComplexSet(ABC):
             yVals (int): The number of intervals to split the imaginary axis into
 
         returns:
-            (numpy.ndarray): A grid of complex numbers to match the x and y values given across the given XY ranges.
+            (template): A grid of complex numbers to match the x and y values given across the given XY ranges.
         
         """
 
-        xRange = self.coord_range.x_range
-        yRange = self.coord_range.y_range
+        self._xy_vals = (xVals, yVals)
+        real_parts, imag_parts = self.axes()
+
+        # Restricted sets slice the full axes so their points match the full grid exactly.
+        if self.window is not None:
+            imag_parts = imag_parts[self.window[0]]
+            real_parts = real_parts[self.window[1]]
+
+        self._set_template = Template.shared(real_parts, imag_parts, self.float_dtype)
+        return self._set_template
+
+    def allocate(self, shape:tuple) -> SetData:
+        """Draws a cleared grid of set data from the buffer pool.
+
+        Args:
+            shape (tuple) (int, int): The (rows, columns) of the grid.
+
+        Returns:
+            setdata: The grid, filled with zeros.
+
+        """
+        return SetData.from_arrays(self.pool.zeros(shape, self.float_dtype), self.pool.zeros(shape, self.float_dtype),
+                                   self.pool.zeros(shape, self.count_dtype))
+
+    def release(self):
+        """Gives the working arrays of the generation back to the buffer pool and clears the generation state.
+
+        The set data of the generation must not be used afterwards, copy it first if it's still needed.
+
+        """
+        if self.data is not None:
+            self.pool.release(self.data.re, self.data.im, self.data.count)
+        self.pool.release(self.mask, self.periods)
+        self._set_template = None
+        self._clear_state()
+
+    def axes(self, coord_range=None) -> tuple:
+        """Computes the real and imaginary axes of the full grid.
+
+        Every axis lies on the grid of its pixel spacing, see pixel_grid(), so views with the same spacing have the
+        same coordinates, bit for bit, wherever they overlap.
+
+        Args:
+            coord_range (coordinaterange, optional): The XY range to compute the axes for, defaults to the range of the set.
+        
+        Returns:
+            tuple (numpy.ndarray, numpy.ndarray): The real parts of every column and the imaginary parts of every row.
+        
+        """
+        coord_range = coord_range if coord_range is not None else self.coord_range
+
+        axes = []
+        for bounds, values in zip((coord_range.x_range, coord_range.y_range), self.xy_vals):
+            grid = ComplexSet.pixel_grid(bounds, values)
+            axes.append(ComplexSet.grid_axis(grid[0], grid[1], values) if grid is not None else np.linspace(bounds[0], bounds[1], values))
+        return tuple(axes)
+
+    @staticmethod
+    def pixel_grid(bounds:tuple, values:int) -> tuple:
+        """Finds the grid an axis lies on.
+
+        The pixels of a grid sit on whole multiples of its spacing, so they have the same coordinates in every view
+        with that spacing. The spacing is rounded to SPACING_BITS significant bits, so axes whose spacings only differ
+        by rounding errors share a grid, and the first pixel moves by at most half a pixel onto the grid.
+
+        Args:
+            bounds (tuple) (float, float): The first and last value of the axis.
+            values (int): How many values the axis is split into.
+        
+        Returns:
+            tuple (int, float): The pixel index of the first value and the spacing of the grid, or None if the axis
+            has no spacing.
+        
+        """
+        low, high = float(bounds[0]), float(bounds[1])
+        step = (high - low) / max(1, values - 1)
+        if not 0 < step < math.inf:
+            return None
+
+        mantissa, exponent = math.frexp(step)
+        spacing = math.ldexp(round(mantissa * 2**ComplexSet.SPACING_BITS), exponent - ComplexSet.SPACING_BITS)
+        first = low / spacing if spacing > 0 else math.inf
+        if not math.isfinite(first):
+            return None
+        return (round(first), spacing)
+
+    @staticmethod
+    def grid_axis(first:int, spacing:float, values:int) -> np.ndarray:
+        """Computes an axis lying on a grid, see pixel_grid().
+
+        Every value is its pixel index times the spacing, rounded once, so it doesn't depend on where the axis starts.
+
+        Args:
+            first (int): The pixel index of the first value.
+            spacing (float): The spacing of the grid.
+            values (int): How many values the axis is split into.
+        
+        Returns:
+            numpy.ndarray: The axis.
+        
+        """
+        return (float(first) + np.arange(values, dtype=np.float64)) * spacing
+
+    def snap(self, coord_range:CoordinateRange) -> CoordinateRange:
+        """Moves a coordinate range onto the grid of its pixel spacing, see pixel_grid().
+
+        Each axis moves by at most half a pixel, onto the pixels the range covers with the values of this set. Its
+        pixels are then exactly the pixels of this set wherever the two grids share them, such as after zooming by a
+        power of two.
+
+        Args:
+            coord_range (coordinaterange): The XY range to move.
+        
+        Returns:
+            coordinaterange: The moved XY range.
+        
+        """
+        snapped = []
+        for bounds, values in zip((coord_range.x_range, coord_range.y_range), self.xy_vals):
+            grid = ComplexSet.pixel_grid(bounds, values)
+            snapped += [grid[0] * grid[1], (grid[0] + values - 1) * grid[1]] if grid is not None else [bounds[0], bounds[1]]
+        
+        return CoordinateRange(*snapped)
+
+    def offset(self, columns:int, rows:int) -> CoordinateRange:
+        """Shifts the coordinate range of this set by a whole number of pixels.
+
+        The shifted grid lines up with the grid of this set, so every pixel the two share can be reused, see reuse().
+
+        Args:
+            columns (int): How many pixels to shift the real axis by.
+            rows (int): How many pixels to shift the imaginary axis by.
+        
+        Returns:
+            coordinaterange: The shifted XY range.
+        
+        """
+        shifted = []
+        for shift, bounds, values in zip((columns, rows), (self.coord_range.x_range, self.coord_range.y_range), self.xy_vals):
+            grid = ComplexSet.pixel_grid(bounds, values)
+            if grid is None:
+                shifted += [bounds[0], bounds[1]]
+                continue
+
+            first, spacing = grid
+            shifted += [(first + shift) * spacing, (first + shift + values - 1) * spacing]
+        return CoordinateRange(*shifted)
+
+    def can_reuse(self, previous) -> bool:
+        """Checks whether the pixels of a previously generated set are valid for this set.
+
+        Args:
+            previous (complexset): The previously generated set.
+        
+        Returns:
+            bool: True if the pixels are computed the same way as the pixels of this set.
+        
+        """
+        return (type(previous) is type(self) and previous.data is not None and previous.iteration > 0 and previous.window is None and self.window is None
+                and previous.xy_vals == self.xy_vals and previous.data.float_dtype == self.float_dtype)
+
+    def reuse(self, previous) -> np.ndarray:
+        """Seeds the next generation with the pixels of a previously generated set that land on the grid of this set.
+
+        Pixels land on the new grid when their coordinates are exactly the coordinates of a new pixel, see axes().
+        Diverged pixels are final as soon as they diverge, while pixels that haven't diverged are only reused from a
+        complete generation with the same maximum iterations. Only the remaining pixels are iterated.
+
+        Args:
+            previous (complexset): The previously generated set.
         
-        real_parts = np.linspace(xRange[0], xRange[1], xVals)
-        imag_parts = np.linspace(yRange[0], yRange[1], yVals)
-        real, imag = np.meshgrid(real_parts, imag_parts, indexing="xy")
+        Returns:
+            numpy.ndarray: A preview of the divergence grid, resampled from the nearest previous pixels and 0 outside
+            the previous view, or None if the previous pixels can't be reused.
+        
+        """
+        self._seed = None
+        if not self.can_reuse(previous):
+            return None
 
-        pointdt = np.dtype([('point', np.complex128), ('divergence', np.uint32)])
+        maps = [ComplexSet.map_axis(old, new) for old, new in zip(previous.axes(), self.axes())]
+        (cols, col_inside, col_exact), (rows, row_inside, row_exact) = maps
+
+        count = previous.data.count[np.ix_(rows, cols)]
+        preview = np.where(np.outer(row_inside, col_inside), count, 0).astype(self.count_dtype)
+
+        complete = previous.iteration >= previous.max_iterations and previous.max_iterations == self.max_iterations
+        final = np.logical_and(count > 0, count <= self.max_iterations) if not complete else np.ones(count.shape, dtype=bool)
+        known = np.logical_and(np.outer(row_exact, col_exact), final)
+
+        if known.any():
+            data = previous.data[np.ix_(rows, cols)]
+            periods = previous.periods[np.ix_(rows, cols)] if previous.periods is not None else None
+            self.seed(known, data, periods)
+        
+        return preview
 
-        complex_grid = np.zeros((yVals, xVals), dtype=pointdt)
-        complex_grid['point'].real = real
-        complex_grid['point'].imag = imag
+    def seed(self, known:np.ndarray, data:SetData, periods=None):
+        """Seeds the next generation with pixels that are already known, on top of any earlier seed.
+
+        The known pixels are copied into the set data and left out of the mask, so only the remaining pixels are iterated.
+
+        Args:
+            known (numpy.ndarray): Grid of boolean values selecting the known pixels of the full grid.
+            data (setdata): The full grid of set data holding the known pixels.
+            periods (numpy.ndarray, optional): The full grid of detected orbit periods holding the known pixels.
+        
+        """
+        if self._seed is not None:
+            seeded, seeded_data, seeded_periods = self._seed
+            merged = seeded_data.copy()
+            merged.re[known] = data.re[known]
+            merged.im[known] = data.im[known]
+            merged.count[known] = data.count[known]
+            if periods is not None and seeded_periods is not None:
+                periods = np.where(known, periods, seeded_periods)
+            else:
+                periods = seeded_periods if periods is None else periods
+
+            known = np.logical_or(seeded, known)
+            data = merged
+        
+        self._seed = (known, data, periods)
 
-        self._set_template = complex_grid
-        return complex_grid
+    def can_extend(self, target) -> bool:
+        """Checks whether this generation can be continued up to the maximum iterations of another set instead of starting over.
+
+        Pixels that haven't diverged must still be iterated by this set, so generations whose data was filled in from
+        elsewhere, or that were seeded with pixels that haven't diverged, can't be continued.
+
+        Args:
+            target (complexset): The set to generate, with more iterations than this set.
+
+        Returns:
+            bool: True if the target covers the same view as this set and continuing this set generates it.
+
+        """
+        if type(target) is not type(self) or self.data is None or self.mask is None or self.iteration == 0:
+            return False
+
+        if (target.max_iterations <= self.max_iterations or target.window is not None or self.window is not None
+                or target.selection is not None or self.selection is not None):
+            return False
+
+        if (tuple(target.coord_range.x_range) != tuple(self.coord_range.x_range) or tuple(target.coord_range.y_range) != tuple(self.coord_range.y_range)
+                or target.xy_vals != self.xy_vals or target.float_dtype != self.data.float_dtype
+                or target.compact != self.compact or target.periodicity != self.periodicity):
+            return False
+
+        if self._seed is not None:
+            known, data, periods = self._seed
+            stale = np.logical_and(known, data.count == 0)
+            if periods is not None:
+                stale = np.logical_and(stale, periods == 0)
+            return not stale.any()
+
+        return True
+
+    def extend(self, iterations:int):
+        """Raises the maximum iterations of a finished or paused generation, see can_extend().
+
+        Iterating the set again only continues the points that haven't diverged yet from where they stopped.
+
+        Args:
+            iterations (int): The new maximum number of iterations.
+
+        """
+        self.max_iterations = iterations
+
+        # More iterations may not fit the divergence counts anymore.
+        if self.data.count_dtype != self.count_dtype:
+            self.data = SetData.from_arrays(self.data.re, self.data.im, self.data.count.astype(self.count_dtype))
+
+    def resume(self, data:SetData):
+        """Takes over the final set data of a generation run outside of this set, such as by a renderer, so it can be extended.
+
+        Every pixel of the data must be exact up to the maximum iterations. The points that haven't diverged are
+        continued from where they stopped, except for the ones the set leaves out up front or was seeded with.
+
+        Args:
+            data (setdata): The final set data of the full grid.
+
+        """
+        self.release()
+        iter(self)
+        np.copyto(self.data.re, data.re)
+        np.copyto(self.data.im, data.im)
+        np.copyto(self.data.count, data.count)
+        np.logical_and(self.mask, data.count == 0, out=self.mask)
+
+        if self._active_idx is not None:
+            remaining = self.mask.flat[self._active_idx]
+            self._active_idx = self._active_idx[remaining]
+            self._active_z = self.data.take(self._active_idx)
+            if not np.isscalar(self._active_c):
+                self._active_c = self._active_c[remaining]
+
+        self.iteration = self.max_iterations
+
+    @staticmethod
+    def map_axis(old:np.ndarray, new:np.ndarray) -> tuple:
+        """Maps every value of a new axis to the nearest value of an old axis.
+
+        Args:
+            old (numpy.ndarray): The evenly spaced old axis.
+            new (numpy.ndarray): The new axis.
+        
+        Returns:
+            tuple (numpy.ndarray, numpy.ndarray, numpy.ndarray): The index of the nearest old value, whether the new
+            value lies within the old axis, and whether it equals the nearest old value exactly, for every new value.
+        
+        """
+        step = (old[-1] - old[0]) / max(1, len(old) - 1)
+        nearest = np.rint((new - old[0]) / step)
+        inside = np.logical_and(nearest >= 0, nearest < len(old))
+        nearest = np.clip(nearest, 0, len(old) - 1).astype(np.intp)
+        exact = np.logical_and(inside, old[nearest] == new)
+        return (nearest, inside, exact)
+
+    def restrict(self, rows:slice, cols:slice):
+        """Creates a copy of this set restricted to a window of the full grid.
+
+        The template of the copy is only generated once it is iterated, so the copy is cheap to send to other processes.
+
+        Args:
+            rows (slice): The rows of the full grid to restrict the copy to.
+            cols (slice): The columns of the full grid to restrict the copy to.
+        
+        Returns:
+            complexset: The restricted copy, starting from the first iteration.
+        
+        """
+        restricted = self.clone()
+        restricted._window = (rows, cols)
+        if self._seed is not None:
+            known, data, periods = self._seed
+            restricted._seed = (known[rows, cols], data[rows, cols], periods[rows, cols] if periods is not None else None)
+        if self._selection is not None:
+            restricted._selection = self._selection[rows, cols]
+        return restricted
+
+    def view(self, coord_range:CoordinateRange, xy_vals:tuple):
+        """Creates a copy of this set generating another view.
+
+        Args:
+            coord_range (coordinaterange): The XY range of the view.
+            xy_vals (tuple) (int, int): How many intervals to split the x and y axis of the view into.
+        
+        Returns:
+            complexset: The copy, starting from the first iteration.
+        
+        """
+        viewed = self.clone()
+        viewed._coord_range = coord_range
+        viewed._xy_vals = xy_vals
+        viewed._window = None
+        viewed._selection = None
+        return viewed
+
+    def clone(self):
+        """Creates a copy of the parameters of this set, sharing its buffer pool, without copying any generation state.
+
+        Returns:
+            complexset: The copy, starting from the first iteration.
+        
+        """
+        cloned = copy.copy(self)
+        cloned._seed = None
+        cloned._set_template = None
+        cloned._clear_state()
+        return cloned
+
+    def _clear_state(self):
+        """Clears all of the generation state."""
+        self._set = None
+        self._setmask = None
+        self._iteration = 0
+        self._periods = None
+        self._checkpoint = None
+        self._checkpoint_iteration = 0
+        self._active_z = None
+        self._active_c = None
+        self._active_idx = None
+        self._active_checkpoint = None
 
     def generate_set(self):
         """Genereates the full complex set up to the maximum number of iterations.
@@ -128,22 +664,187 @@ class ComplexSet(ABC):
             yVals (int): The number of intervals to split the imaginary axis into
 
         returns:
-            data (numpy.ndarray): The final set data after the generation process.
+            data (setdata): The final set data after the generation process.
         
         """
         set_ = iter(self)
-        for _ in range(0, self.max_iterations):
-            next(set_)
+
+        # Sets may skip ahead while setting up, so iterate until the maximum rather than a fixed number of times.
+        while set_.step():
+            pass
         
         return set_.data
 
+    def step(self) -> bool:
+        """Runs the next iteration of the generation, unless it reached the maximum iterations.
+
+        Every way of generating a set steps through it, so every generation stops at the maximum iterations and
+        gives the same divergence counts, which is what the tile cache relies on.
+
+        Returns:
+            bool: Whether an iteration was run, False once the generation is complete.
+        
+        """
+        if self.iteration >= self.max_iterations:
+            return False
+        next(self)
+
+        # Compacted generations are complete as soon as every point has been retired.
+        if self.compact and self._active_idx is not None and len(self._active_idx) == 0:
+            self.iteration = self.max_iterations
+        return True
+
+    def generate_selected(self, selection:np.ndarray, result:SetData):
+        """Generates only the selected pixels of the full grid up to the maximum number of iterations.
+
+        The selected pixels are usually scattered across the grid, so they are always compacted. The working arrays
+        go back to the buffer pool once the selected pixels are copied into the result.
+
+        Args:
+            selection (numpy.ndarray): Grid of boolean values selecting which pixels to generate.
+            result (setdata): The full grid to write the selected pixels into, its other pixels are left alone.
+        
+        """
+        selected = self.restrict(slice(None), slice(None))
+        selected.compact = True
+        selected.selection = selection
+        data = selected.generate_set()
+
+        np.copyto(result.re, data.re, where=selection)
+        np.copyto(result.im, data.im, where=selection)
+        np.copyto(result.count, data.count, where=selection)
+        selected.release()
+
     def __iter__(self):
         """Sets up the set generation stage upon creating an iterator."""
-        self.data = np.zeros_like(self.template)
-        self.mask = np.ones_like(self.template, dtype=bool)
-        self.generate_template(self.template.shape[1], self.template.shape[0])
+        self.generate_template(self.xy_vals[0], self.xy_vals[1])
+        self.data = self.allocate(self.template.shape)
+        self.mask = self.pool.full(self.template.shape, True, bool)
+        self.iteration = 0
+        self._periods = self.pool.zeros(self.template.shape, np.uint32) if self.periodicity else None
+        self._checkpoint = None
+        self._checkpoint_iteration = 0
+        self._active_z = None
+        self._active_c = None
+        self._active_idx = None
+        self._active_checkpoint = None
+
+        if self._seed is not None:
+            known, data, periods = self._seed
+            self.data.re[known] = data.re[known]
+            self.data.im[known] = data.im[known]
+            self.data.count[known] = data.count[known]
+            if self.periods is not None and periods is not None:
+                self.periods[known] = periods[known]
+            self.mask[known] = False
+
+        if self.selection is not None:
+            np.logical_and(self.mask, self.selection, out=self.mask)
         return self
 
+    def init_active(self, points:SetData, constants):
+        """Sets up the compacted arrays of points that haven't diverged yet.
+
+        Args:
+            points (setdata): Grid of starting points, matching the shape of the set data.
+            constants (setdata or template or complex): Grid of constants added on each iteration, or a single constant.
+        
+        """
+        self._active_idx = np.flatnonzero(self.mask)
+        self._active_z = points.take(self._active_idx)
+
+        if isinstance(constants, (SetData, Template)):
+            constants = constants.take(self._active_idx)
+        
+        self._active_c = constants
+
+    def next_active(self):
+        """Iterates the compacted points once, scattering divergence values back only for points that diverged."""
+        # The same complex arithmetic as next_grid(), so compacted and full grid generation give identical results.
+        self._active_z = self._active_z**2 + self._active_c
+        divergence_mask = np.absolute(self._active_z) > 2
+
+        if divergence_mask.any():
+            self.data.count.flat[self._active_idx[divergence_mask]] = self.iteration
+            self.retire_active(divergence_mask)
+
+        if self.periodicity:
+            self.check_periodicity()
+        
+        # Points that never diverge are only written back once the generation is complete.
+        if self.iteration >= self.max_iterations:
+            self.data.put(self._active_idx, self._active_z)
+
+    def retire_active(self, retired:np.ndarray):
+        """Writes the selected compacted points back to the set data and stops iterating them.
+
+        Args:
+            retired (numpy.ndarray): Boolean values selecting which compacted points to retire.
+        
+        """
+        idx = self._active_idx[retired]
+        self.data.put(idx, self._active_z[retired])
+        self.mask.flat[idx] = False
+
+        remaining = np.logical_not(retired)
+        self._active_z = self._active_z[remaining]
+        self._active_idx = self._active_idx[remaining]
+        if not np.isscalar(self._active_c):
+            self._active_c = self._active_c[remaining]
+        if self._active_checkpoint is not None:
+            self._active_checkpoint = self._active_checkpoint[remaining]
+
+    def check_periodicity(self):
+        """Stops iterating points whose orbit returned to its last checkpoint, recording the period of the orbit.
+
+        Checkpoints are moved whenever the iteration doubles (Brent's cycle detection), so any period shorter than
+        half the current iteration is eventually detected. Periodic orbits never diverge, so these points are members of the set.
+        """
+        if self.iteration >= 2 * self._checkpoint_iteration:
+            self._checkpoint_iteration = self.iteration
+            if self.compact:
+                self._active_checkpoint = self._active_z.copy()
+            else:
+                self._checkpoint = (self.data.re.copy(), self.data.im.copy())
+            return
+        
+        period = self.iteration - self._checkpoint_iteration
+        if self.compact:
+            distance = np.hypot(self._active_z.real - self._active_checkpoint.real, self._active_z.imag - self._active_checkpoint.imag)
+            periodic = distance < self.periodicity_tolerance
+            if periodic.any():
+                self.periods.flat[self._active_idx[periodic]] = period
+                self.retire_active(periodic)
+        else:
+            distance = np.hypot(self.data.re - self._checkpoint[0], self.data.im - self._checkpoint[1])
+            periodic = np.logical_and(distance < self.periodicity_tolerance, self.mask)
+            self.periods[periodic] = period
+            np.logical_and(self.mask, np.logical_not(periodic), out=self.mask)
+
+    def next_grid(self, constants):
+        """Iterates every point that hasn't diverged once, leaving the points that diverged or were skipped untouched.
+
+        Only the points left in the mask are gathered, iterated and scattered back, with the same complex arithmetic
+        as the compacted kernel, so points that were classified up front cost nothing per iteration.
+
+        Args:
+            constants (setdata or template or complex): Grid of constants added on each iteration, or a single constant.
+        
+        """
+        idx = np.flatnonzero(self.mask)
+        if isinstance(constants, (SetData, Template)):
+            constants = constants.take(idx)
+
+        z = self.data.take(idx)**2 + constants
+        self.data.put(idx, z)
+
+        diverged = idx[np.absolute(z) > 2]
+        self.data.count.flat[diverged] = self.iteration
+        self.mask.flat[diverged] = False
+
+        if self.periodicity:
+            self.check_periodicity()
+
     @abstractclassmethod
     def __next__(self):
         """To be overridden by implementation."""
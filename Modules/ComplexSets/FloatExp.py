@@ -0,0 +1,141 @@
+import numpy as np
+
+def ldexp_complex(values, exponents):
+    """Multiplies complex values by powers of two.
+
+    Args:
+        values (numpy.ndarray or complex): The complex values to scale.
+        exponents (numpy.ndarray or int): The powers of two to scale the values by.
+
+    Returns:
+        numpy.ndarray: The scaled complex values.
+
+    """
+    values = np.asarray(values, dtype=np.complex128)
+    exponents = np.asarray(exponents, dtype=np.int32)
+    return np.ldexp(values.real, exponents) + 1j * np.ldexp(values.imag, exponents)
+
+class FloatExp(object):
+    """Vectorized complex numbers with an extended exponent range.
+
+    Every value is stored as a complex128 mantissa and an integer power of two, so values far smaller than the
+    float64 range (around 1e-308) keep their full precision. Mantissas are kept normalized, so the larger of their
+    real and imaginary parts is in [0.5, 1).
+
+    Args:
+        mantissa (numpy.ndarray or complex): The complex mantissas.
+        exponent (numpy.ndarray or int, optional): The powers of two of each value, broadcast against the mantissas.
+
+    Attributes:
+        mantissa (numpy.ndarray): The normalized complex mantissas.
+        exponent (numpy.ndarray): The power of two of each value.
+        shape (tuple): The shape of the values.
+        ZERO_EXPONENT (int): The exponent given to zero, so it never shifts other values out of range when added.
+
+    """
+
+    ZERO_EXPONENT = -(2**28)
+
+    # Make NumPy defer to the operators below instead of converting extended values to complex128.
+    __array_ufunc__ = None
+
+    def __init__(self, mantissa, exponent=0):
+        mantissa = np.asarray(mantissa, dtype=np.complex128)
+        self._mantissa = mantissa
+        self._exponent = np.array(np.broadcast_to(exponent, mantissa.shape), dtype=np.int32)
+        self.normalize()
+
+    @property
+    def mantissa(self) -> np.ndarray:
+        """numpy.ndarray: The normalized complex mantissas."""
+        return self._mantissa
+
+    @property
+    def exponent(self) -> np.ndarray:
+        """numpy.ndarray: The power of two of each value."""
+        return self._exponent
+
+    @property
+    def shape(self) -> tuple:
+        """tuple: The shape of the values."""
+        return self._mantissa.shape
+
+    def normalize(self):
+        """Moves the magnitude of every mantissa into its exponent."""
+        scale = np.maximum(np.absolute(self._mantissa.real), np.absolute(self._mantissa.imag))
+        _, shift = np.frexp(scale)
+        self._mantissa = ldexp_complex(self._mantissa, -shift)
+        self._exponent = np.where(scale == 0, FloatExp.ZERO_EXPONENT, self._exponent + shift).astype(np.int32)
+
+    def log2abs(self) -> np.ndarray:
+        """Computes the base 2 logarithm of the magnitude of every value, to compare magnitudes outside of the float64 range.
+
+        Returns:
+            numpy.ndarray: The logarithms, -inf for zero.
+
+        """
+        with np.errstate(divide='ignore'):
+            return np.log2(np.absolute(self._mantissa)) + self._exponent
+
+    def to_complex(self) -> np.ndarray:
+        """Converts the values to complex128, flushing values outside of the float64 range to zero or infinity.
+
+        Returns:
+            numpy.ndarray: The values as complex128.
+
+        """
+        return ldexp_complex(self._mantissa, self._exponent)
+
+    @staticmethod
+    def convert(value):
+        """Converts complex values to extended values, leaving extended values untouched.
+
+        Args:
+            value (floatexp or numpy.ndarray or complex): The values to convert.
+
+        Returns:
+            floatexp: The extended values.
+
+        """
+        return value if isinstance(value, FloatExp) else FloatExp(value)
+
+    def __add__(self, other):
+        other = FloatExp.convert(other)
+        exponent = np.maximum(self._exponent, other._exponent)
+        mantissa = ldexp_complex(self._mantissa, self._exponent - exponent) + ldexp_complex(other._mantissa, other._exponent - exponent)
+        return FloatExp(mantissa, exponent)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __mul__(self, other):
+        other = FloatExp.convert(other)
+        # Zeros are given the lowest exponent, so keep the sum of two of them in range.
+        exponent = np.maximum(self._exponent.astype(np.int64) + other._exponent, FloatExp.ZERO_EXPONENT)
+        return FloatExp(self._mantissa * other._mantissa, exponent)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __pow__(self, power:int):
+        if power != 2:
+            raise ValueError('Extended values can only be squared, got the power %r.' % (power,))
+        return self * self
+
+    def __getitem__(self, key):
+        extended = FloatExp.__new__(FloatExp)
+        extended._mantissa = self._mantissa[key]
+        extended._exponent = self._exponent[key]
+        return extended
+
+    def __setitem__(self, key, value):
+        value = FloatExp.convert(value)
+        self._mantissa[key] = value._mantissa
+        self._exponent[key] = value._exponent
+
+    def __len__(self):
+        return len(self._mantissa)
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.to_complex()
+        return values if dtype is None else values.astype(dtype)
@@ -0,0 +1,91 @@
+from ..ComplexSet import ComplexSet
+from ..SetData import SetData
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+class ChunkedRenderer(object):
+    """Generates complex sets in blocks of rows across a pool of threads.
+
+    Each block is small enough to stay in the CPU cache and is iterated to completion before the thread moves on,
+    instead of streaming the full grid through memory on every iteration. NumPy releases the GIL inside its loops,
+    so the blocks run in parallel on a thread pool. The result and the working arrays of every block are drawn from
+    the buffer pool of the set, and the working arrays go back to it once their block is copied into the result.
+
+    Args:
+        threads (int, optional): Number of worker threads, defaults to the number of CPUs.
+        chunk_size (int, optional): Target size of each block of rows in bytes.
+    
+    Attributes:
+        threads (int): Number of worker threads.
+        chunk_size (int): Target size of each block of rows in bytes.
+        DEFAULT_CHUNK_SIZE (int): Default block size, chosen to fit in a typical L2 cache.
+    
+    """
+
+    DEFAULT_CHUNK_SIZE = 256 * 1024
+
+    def __init__(self, threads=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self._threads = threads if threads is not None else os.cpu_count()
+        self._chunk_size = chunk_size
+
+    @property
+    def threads(self) -> int:
+        """int: Number of worker threads."""
+        return self._threads
+
+    @threads.setter
+    def threads(self, threads:int):
+        self._threads = threads
+    
+    @property
+    def chunk_size(self) -> int:
+        """int: Target size of each block of rows in bytes."""
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, chunk_size:int):
+        self._chunk_size = chunk_size
+
+    def chunks(self, xy_vals:tuple, itemsize:int) -> list:
+        """Splits a grid into blocks of rows.
+
+        Args:
+            xy_vals (tuple) (int, int): How many intervals the x and y axis are split into.
+            itemsize (int): Size of each point of the grid in bytes.
+        
+        Returns:
+            list[slice]: The rows of every block.
+        
+        """
+        width, height = xy_vals
+        rows = max(1, self.chunk_size // (width * itemsize))
+        return [slice(y, min(y + rows, height)) for y in range(0, height, rows)]
+
+    def render(self, complex_set:ComplexSet) -> SetData:
+        """Generates the full complex set up to the maximum number of iterations.
+
+        Args:
+            complex_set (complexset): The set to generate.
+        
+        Returns:
+            setdata: The final set data, identical to the data returned by generate_set().
+        
+        """
+        shape = (complex_set.xy_vals[1], complex_set.xy_vals[0])
+        result = complex_set.allocate(shape)
+        cols = slice(0, shape[1])
+
+        # Every thread holds the real and imaginary parts of one block at a time, of the same shape and dtype.
+        complex_set.pool.depth = max(complex_set.pool.depth, 2 * self.threads)
+
+        def render_chunk(rows:slice):
+            chunk = complex_set.restrict(rows, cols)
+            result[rows, cols] = chunk.generate_set()
+            chunk.release()
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            # Consume the results to raise the first error from any of the threads.
+            itemsize = SetData.nbytes((1, 1), complex_set.float_dtype, complex_set.count_dtype)
+            list(executor.map(render_chunk, self.chunks(complex_set.xy_vals, itemsize)))
+        
+        return result
@@ -0,0 +1,130 @@
+from ..ComplexSet import ComplexSet
+from ..SetData import SetData
+import numpy as np
+
+class MarianiSilverRenderer(object):
+    """Generates connected complex sets by recursively subdividing rectangles (the Mariani-Silver algorithm).
+
+    Only the border of every rectangle is generated. The points that haven't diverged by any given iteration form a
+    connected region without holes for connected sets, so a rectangle whose border never diverges lies inside the set
+    and is filled with 0. A rectangle whose border diverged on a single iteration can only hold other values if that
+    whole region lies inside it, so it is filled with that iteration if one of the landmarks of the set, which belong
+    to the region, lies outside of it. Any other rectangle is split into four rectangles that share their borders, as
+    is the full grid, whose border may surround the whole set. Rectangles that get too small are generated in full.
+    Every level of rectangles is generated in a single pass over the selected pixels. Like any border tracing method,
+    filaments thinner than a pixel that slip between two pixels of a border are missed by the fill.
+
+    Filled pixels only get their divergence value, their points are left at 0. Sets that aren't connected, such as
+    Julia sets whose constant is outside the Mandelbrot set, are generated in full instead.
+
+    Args:
+        min_size (int, optional): Rectangles with fewer rows or columns than this inside their border are generated in full.
+        subdivide (bool, optional): Whether to subdivide connected sets, False always generates sets in full.
+
+    Attributes:
+        min_size (int): Rectangles with fewer rows or columns than this inside their border are generated in full.
+        subdivide (bool): Whether to subdivide connected sets, False always generates sets in full.
+        DEFAULT_MIN_SIZE (int): Default minimum rectangle size.
+
+    """
+
+    DEFAULT_MIN_SIZE = 8
+
+    def __init__(self, min_size=DEFAULT_MIN_SIZE, subdivide=True):
+        self._min_size = min_size
+        self._subdivide = subdivide
+
+    @property
+    def min_size(self) -> int:
+        """int: Rectangles with fewer rows or columns than this inside their border are generated in full."""
+        return self._min_size
+
+    @min_size.setter
+    def min_size(self, min_size:int):
+        self._min_size = min_size
+
+    @property
+    def subdivide(self) -> bool:
+        """bool: Whether to subdivide connected sets, False always generates sets in full."""
+        return self._subdivide
+
+    @subdivide.setter
+    def subdivide(self, subdivide:bool):
+        self._subdivide = subdivide
+
+    def generate(self, complex_set:ComplexSet, selection:np.ndarray, result:SetData):
+        """Generates the selected pixels of a set into the result.
+
+        Args:
+            complex_set (complexset): The set to generate.
+            selection (numpy.ndarray): Grid of boolean values selecting which pixels to generate.
+            result (setdata): The full result grid to write the selected pixels into.
+
+        """
+        if selection.any():
+            complex_set.generate_selected(selection, result)
+
+    def render(self, complex_set:ComplexSet) -> SetData:
+        """Generates the full complex set up to the maximum number of iterations.
+
+        Args:
+            complex_set (complexset): The set to generate.
+
+        Returns:
+            setdata: The final set data.
+
+        """
+        if not self.subdivide or not complex_set.connected:
+            return complex_set.generate_set()
+
+        shape = (complex_set.xy_vals[1], complex_set.xy_vals[0])
+        result = SetData(shape, complex_set.float_dtype, complex_set.count_dtype)
+        generated = np.zeros(shape, dtype=bool)
+
+        # Rectangles are (first row, last row, first column, last column), including their border.
+        rectangles = [(0, shape[0] - 1, 0, shape[1] - 1)]
+        full = []
+        root = True
+        real = complex_set.template.real
+        imag = complex_set.template.imag
+        landmarks = complex_set.landmarks
+
+        while rectangles or full:
+            selection = np.zeros(shape, dtype=bool)
+            for r0, r1, c0, c1 in rectangles:
+                selection[r0, c0:c1 + 1] = True
+                selection[r1, c0:c1 + 1] = True
+                selection[r0:r1 + 1, c0] = True
+                selection[r0:r1 + 1, c1] = True
+            for r0, r1, c0, c1 in full:
+                selection[r0:r1 + 1, c0:c1 + 1] = True
+
+            selection = np.logical_and(selection, np.logical_not(generated))
+            self.generate(complex_set, selection, result)
+            generated = np.logical_or(generated, selection)
+
+            subdivided = []
+            full = []
+            for r0, r1, c0, c1 in rectangles:
+                # Rectangles without an inside are done once their border is generated.
+                if r1 - r0 < 2 or c1 - c0 < 2:
+                    continue
+
+                count = result.count
+                border = np.concatenate((count[r0, c0:c1 + 1], count[r1, c0:c1 + 1], count[r0 + 1:r1, c0], count[r0 + 1:r1, c1]))
+
+                if not root and np.all(border == border[0]) and (border[0] == 0 or not all(
+                        real[c0] < point.real < real[c1] and imag[r0] < point.imag < imag[r1] for point in landmarks)):
+                    count[r0 + 1:r1, c0 + 1:c1] = border[0]
+                    generated[r0 + 1:r1, c0 + 1:c1] = True
+                elif r1 - r0 - 1 < self.min_size or c1 - c0 - 1 < self.min_size:
+                    full.append((r0 + 1, r1 - 1, c0 + 1, c1 - 1))
+                else:
+                    rm = (r0 + r1) // 2
+                    cm = (c0 + c1) // 2
+                    subdivided += [(r0, rm, c0, cm), (r0, rm, cm, c1), (rm, r1, c0, cm), (rm, r1, cm, c1)]
+
+            rectangles = subdivided
+            root = False
+
+        return result
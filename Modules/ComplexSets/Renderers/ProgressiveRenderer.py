@@ -0,0 +1,162 @@
+from ..ComplexSet import ComplexSet
+from ..SetData import SetData
+import numpy as np
+
+class ProgressiveRenderer(object):
+    """Generates complex sets in passes from a coarse to the full resolution, previewing the set after every pass.
+
+    Every pass samples every step-th row and column of the full grid, halving the step of the previous pass, so the
+    samples of earlier passes are reused. With guessing enabled, a new sample inside a block of four previous samples
+    that share one divergence value takes that value without being generated (solid guessing).
+
+    Guesses can miss details smaller than a block, so by default the last pass generates every pixel that wasn't
+    generated yet, guessed or not, and the final set is exact. The set takes over an exact final set, so it can be
+    extended like a set that generated itself. Guessed pixels of an inexact final set only get their divergence value,
+    their points are left at 0.
+
+    Args:
+        steps (tuple, optional): The step between the samples of every pass, ending with 1 for the full resolution.
+        guess (bool, optional): Whether to guess samples inside blocks whose corners agree instead of generating them.
+        exact (bool, optional): Whether the last pass generates the guessed pixels, False keeps the guesses in the final set.
+
+    Attributes:
+        steps (tuple): The step between the samples of every pass, ending with 1 for the full resolution.
+        guess (bool): Whether to guess samples inside blocks whose corners agree instead of generating them.
+        exact (bool): Whether the last pass generates the guessed pixels, False keeps the guesses in the final set.
+        DEFAULT_STEPS (tuple): Default passes, at 1/8, 1/4, 1/2 and the full resolution.
+
+    """
+
+    DEFAULT_STEPS = (8, 4, 2, 1)
+
+    def __init__(self, steps=DEFAULT_STEPS, guess=True, exact=True):
+        self._steps = steps
+        self._guess = guess
+        self._exact = exact
+
+    @property
+    def steps(self) -> tuple:
+        """tuple: The step between the samples of every pass, ending with 1 for the full resolution."""
+        return self._steps
+
+    @steps.setter
+    def steps(self, steps:tuple):
+        self._steps = steps
+
+    @property
+    def guess(self) -> bool:
+        """bool: Whether to guess samples inside blocks whose corners agree instead of generating them."""
+        return self._guess
+
+    @guess.setter
+    def guess(self, guess:bool):
+        self._guess = guess
+
+    @property
+    def exact(self) -> bool:
+        """bool: Whether the last pass generates the guessed pixels, False keeps the guesses in the final set."""
+        return self._exact
+
+    @exact.setter
+    def exact(self, exact:bool):
+        self._exact = exact
+
+    def passes(self, complex_set:ComplexSet):
+        """Generates a set pass by pass.
+
+        Args:
+            complex_set (complexset): The set to generate.
+
+        Yields:
+            tuple (int, numpy.ndarray): The step of the finished pass and a preview of the full divergence grid,
+            with every sample filling the block of pixels up to the next sample.
+
+        Returns:
+            setdata: The final set data, once every pass is finished.
+
+        """
+        shape = (complex_set.xy_vals[1], complex_set.xy_vals[0])
+        result = complex_set.allocate(shape)
+        sampled = np.zeros(shape, dtype=bool)
+        generated = np.zeros(shape, dtype=bool)
+        previous = None
+
+        for i, step in enumerate(self.steps):
+            samples = np.zeros(shape, dtype=bool)
+            samples[::step, ::step] = True
+
+            if self.exact and i == len(self.steps) - 1:
+                # The guesses of every earlier pass are replaced by generated pixels.
+                selection = np.logical_and(samples, np.logical_not(generated))
+            elif self.guess and previous is not None:
+                selection = np.logical_and(samples, np.logical_not(sampled))
+                guessed = self.solid_guess(result.count, selection, previous)
+                selection = np.logical_and(selection, np.logical_not(guessed))
+                sampled = np.logical_or(sampled, guessed)
+            else:
+                selection = np.logical_and(samples, np.logical_not(sampled))
+
+            if selection.any():
+                complex_set.generate_selected(selection, result)
+
+            sampled = np.logical_or(sampled, selection)
+            generated = np.logical_or(generated, selection)
+            previous = step
+
+            preview = np.repeat(np.repeat(result.count[::step, ::step], step, axis=0), step, axis=1)
+            yield (step, preview[:shape[0], :shape[1]])
+
+        # An exact final set is taken over by the set, so raising its maximum iterations continues it, see ComplexSet.resume().
+        if self.exact:
+            complex_set.resume(result)
+            complex_set.pool.release(result.re, result.im, result.count)
+            return complex_set.data
+        return result
+
+    @staticmethod
+    def solid_guess(count:np.ndarray, selection:np.ndarray, step:int) -> np.ndarray:
+        """Fills in new samples inside blocks of previous samples whose four corners share one divergence value.
+
+        Args:
+            count (numpy.ndarray): The divergence grid, holding the previous samples. Guessed samples are written into it.
+            selection (numpy.ndarray): Grid of boolean values selecting the new samples.
+            step (int): The step between the previous samples.
+
+        Returns:
+            numpy.ndarray: Grid of boolean values, True for the guessed samples.
+
+        """
+        rows, cols = np.nonzero(selection)
+        r0 = (rows // step) * step
+        c0 = (cols // step) * step
+        r1 = r0 + step
+        c1 = c0 + step
+
+        # Samples past the last previous row or column aren't enclosed by a block.
+        enclosed = np.logical_and(r1 < count.shape[0], c1 < count.shape[1])
+        rows, cols, r0, c0, r1, c1 = [a[enclosed] for a in (rows, cols, r0, c0, r1, c1)]
+
+        corner = count[r0, c0]
+        solid = np.logical_and.reduce((count[r0, c1] == corner, count[r1, c0] == corner, count[r1, c1] == corner))
+
+        guessed = np.zeros(selection.shape, dtype=bool)
+        guessed[rows[solid], cols[solid]] = True
+        count[rows[solid], cols[solid]] = corner[solid]
+        return guessed
+
+    def render(self, complex_set:ComplexSet) -> SetData:
+        """Generates the full complex set up to the maximum number of iterations.
+
+        Args:
+            complex_set (complexset): The set to generate.
+
+        Returns:
+            setdata: The final set data.
+
+        """
+        passes = self.passes(complex_set)
+        while True:
+            try:
+                next(passes)
+            except StopIteration as stop:
+                return stop.value
@@ -0,0 +1,119 @@
+from ..ComplexSet import ComplexSet
+from ..SetData import SetData
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+import numpy as np
+import os
+
+def render_tile(shm_name:str, shape:tuple, float_dtype:np.dtype, count_dtype:np.dtype, tile_set:ComplexSet):
+    """Generates a restricted set and writes it into its window of a shared result buffer.
+
+    Args:
+        shm_name (str): Name of the shared memory block holding the result buffer.
+        shape (tuple) (int, int): Shape of the full result grid.
+        float_dtype (numpy.dtype): Dtype of the real and imaginary parts of the full result grid.
+        count_dtype (numpy.dtype): Dtype of the divergence counts of the full result grid.
+        tile_set (complexset): The set restricted to the window of the tile.
+    
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        result = SetData(shape, float_dtype, count_dtype, buffer=shm.buf)
+        rows, cols = tile_set.window
+        result[rows, cols] = tile_set.generate_set()
+        del result
+    finally:
+        shm.close()
+
+class TileRenderer(object):
+    """Generates complex sets in tiles across a pool of processes.
+
+    Every tile is generated from a restricted copy of the set, so the rendered data is identical to generate_set().
+    Workers write their tiles directly into a shared memory buffer, so no set data is sent back between processes.
+
+    Args:
+        workers (int, optional): Number of worker processes, defaults to the number of CPUs.
+        tile_size (tuple) (int, int, optional): The (width, height) of each tile in pixels.
+    
+    Attributes:
+        workers (int): Number of worker processes.
+        tile_size (tuple) (int, int): The (width, height) of each tile in pixels.
+    
+    """
+    def __init__(self, workers=None, tile_size=(64, 64)):
+        self._workers = workers if workers is not None else os.cpu_count()
+        self._tile_size = tile_size
+        self._executor = None
+
+    @property
+    def workers(self) -> int:
+        """int: Number of worker processes."""
+        return self._workers
+    
+    @property
+    def tile_size(self) -> tuple:
+        """tuple (int, int): The (width, height) of each tile in pixels."""
+        return self._tile_size
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """concurrent.futures.processpoolexecutor: The worker pool, started on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def tiles(self, xy_vals:tuple) -> list:
+        """Splits a grid into tiles.
+
+        Args:
+            xy_vals (tuple) (int, int): How many intervals the x and y axis are split into.
+        
+        Returns:
+            list[tuple(slice, slice)]: The (rows, columns) window of every tile.
+        
+        """
+        width, height = xy_vals
+        tile_width, tile_height = self.tile_size
+        return [(slice(y, min(y + tile_height, height)), slice(x, min(x + tile_width, width)))
+                for y in range(0, height, tile_height) for x in range(0, width, tile_width)]
+
+    def render(self, complex_set:ComplexSet) -> SetData:
+        """Generates the full complex set up to the maximum number of iterations.
+
+        Args:
+            complex_set (complexset): The set to generate.
+        
+        Returns:
+            setdata: The final set data, identical to the data returned by generate_set().
+        
+        """
+        shape = (complex_set.xy_vals[1], complex_set.xy_vals[0])
+        float_dtype = complex_set.float_dtype
+        count_dtype = complex_set.count_dtype
+        shm = shared_memory.SharedMemory(create=True, size=SetData.nbytes(shape, float_dtype, count_dtype))
+
+        try:
+            futures = [self.executor.submit(render_tile, shm.name, shape, float_dtype, count_dtype, complex_set.restrict(rows, cols))
+                        for rows, cols in self.tiles(complex_set.xy_vals)]
+            wait(futures)
+
+            # Raise the first error from any of the workers.
+            for future in futures:
+                future.result()
+            
+            return SetData(shape, float_dtype, count_dtype, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    def close(self):
+        """Shuts down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,4 @@
+from .TileRenderer import TileRenderer
+from .ChunkedRenderer import ChunkedRenderer
+from .MarianiSilverRenderer import MarianiSilverRenderer
+from .ProgressiveRenderer import ProgressiveRenderer
\ No newline at end of file
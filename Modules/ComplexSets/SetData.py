@@ -0,0 +1,152 @@
+import numpy as np
+
+class SetData(object):
+    """Grid of complex set state, stored as separate contiguous arrays (struct of arrays).
+
+    The real and imaginary parts of every point and its divergence count each live in their own array, so the
+    generation kernels stream only the parts they need through the cache.
+    The 'point' and 'divergence' keys of the former structured layout are still available:
+    data['divergence'] is the count array itself, while data['point'] builds a new complex array.
+
+    Args:
+        shape (tuple) (int, int): The (rows, columns) of the grid.
+        float_dtype (numpy.dtype): The dtype of the real and imaginary parts.
+        count_dtype (numpy.dtype): The dtype of the divergence counts.
+        buffer (buffer, optional): A buffer to lay the arrays out in, one after another, instead of allocating them.
+
+    Attributes:
+        re (numpy.ndarray): The real parts of the points.
+        im (numpy.ndarray): The imaginary parts of the points.
+        count (numpy.ndarray): The iteration every point diverged on, 0 for points that haven't diverged.
+        shape (tuple) (int, int): The (rows, columns) of the grid.
+        float_dtype (numpy.dtype): The dtype of the real and imaginary parts.
+        count_dtype (numpy.dtype): The dtype of the divergence counts.
+
+    """
+    def __init__(self, shape:tuple, float_dtype:np.dtype, count_dtype:np.dtype, buffer=None):
+        float_dtype = np.dtype(float_dtype)
+        count_dtype = np.dtype(count_dtype)
+
+        if buffer is None:
+            self._re = np.zeros(shape, dtype=float_dtype)
+            self._im = np.zeros(shape, dtype=float_dtype)
+            self._count = np.zeros(shape, dtype=count_dtype)
+        else:
+            size = int(np.prod(shape))
+            offset = size * float_dtype.itemsize
+            self._re = np.ndarray(shape, dtype=float_dtype, buffer=buffer)
+            self._im = np.ndarray(shape, dtype=float_dtype, buffer=buffer, offset=offset)
+            self._count = np.ndarray(shape, dtype=count_dtype, buffer=buffer, offset=2 * offset)
+
+    @staticmethod
+    def nbytes(shape:tuple, float_dtype:np.dtype, count_dtype:np.dtype) -> int:
+        """Computes the size of the buffer needed to hold a grid.
+
+        Args:
+            shape (tuple) (int, int): The (rows, columns) of the grid.
+            float_dtype (numpy.dtype): The dtype of the real and imaginary parts.
+            count_dtype (numpy.dtype): The dtype of the divergence counts.
+
+        Returns:
+            int: The size of the buffer in bytes.
+
+        """
+        return int(np.prod(shape)) * (2 * np.dtype(float_dtype).itemsize + np.dtype(count_dtype).itemsize)
+
+    @staticmethod
+    def from_arrays(re:np.ndarray, im:np.ndarray, count:np.ndarray):
+        """Wraps existing arrays without copying them.
+
+        Args:
+            re (numpy.ndarray): The real parts of the points.
+            im (numpy.ndarray): The imaginary parts of the points.
+            count (numpy.ndarray): The divergence counts.
+
+        Returns:
+            setdata: The wrapped arrays.
+
+        """
+        data = SetData.__new__(SetData)
+        data._re = re
+        data._im = im
+        data._count = count
+        return data
+
+    @property
+    def re(self) -> np.ndarray:
+        """numpy.ndarray: The real parts of the points."""
+        return self._re
+
+    @property
+    def im(self) -> np.ndarray:
+        """numpy.ndarray: The imaginary parts of the points."""
+        return self._im
+
+    @property
+    def count(self) -> np.ndarray:
+        """numpy.ndarray: The iteration every point diverged on, 0 for points that haven't diverged."""
+        return self._count
+
+    @property
+    def shape(self) -> tuple:
+        """tuple (int, int): The (rows, columns) of the grid."""
+        return self._count.shape
+
+    @property
+    def float_dtype(self) -> np.dtype:
+        """numpy.dtype: The dtype of the real and imaginary parts."""
+        return self._re.dtype
+
+    @property
+    def count_dtype(self) -> np.dtype:
+        """numpy.dtype: The dtype of the divergence counts."""
+        return self._count.dtype
+
+    def take(self, idx:np.ndarray) -> np.ndarray:
+        """Gathers points by their flat index.
+
+        Args:
+            idx (numpy.ndarray): Flat indices of the points.
+
+        Returns:
+            numpy.ndarray: The complex points.
+
+        """
+        return self._re.ravel()[idx] + 1j * self._im.ravel()[idx]
+
+    def put(self, idx:np.ndarray, points:np.ndarray):
+        """Scatters points by their flat index.
+
+        Args:
+            idx (numpy.ndarray): Flat indices of the points.
+            points (numpy.ndarray): The complex points.
+
+        """
+        points = np.asarray(points)
+        self._re.flat[idx] = points.real
+        self._im.flat[idx] = points.imag
+
+    def copy(self):
+        """Copies the grid.
+
+        Returns:
+            setdata: The copied grid.
+
+        """
+        return SetData.from_arrays(self._re.copy(), self._im.copy(), self._count.copy())
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key == 'divergence':
+                return self._count
+            if key == 'point':
+                return self._re + 1j * self._im
+            raise KeyError(key)
+
+        return SetData.from_arrays(self._re[key], self._im[key], self._count[key])
+
+    def __setitem__(self, key, value):
+        target = self[key]
+        target.re[...] = value.re
+        target.im[...] = value.im
+        target.count[...] = value.count
@@ -0,0 +1,417 @@
+from ..ComplexSet import ComplexSet
+from ..CoordinateRange import CoordinateRange
+from ..FloatExp import FloatExp, ldexp_complex
+from ..SetData import SetData
+from ..Template import Template
+from decimal import Decimal, localcontext
+import numpy as np
+import math
+
+class DeepMandelbrot(ComplexSet):
+    """Generates the Mandelbrot set at deep zoom levels using perturbation theory.
+
+    A single reference orbit is computed at the center of the coordinate range with arbitrary precision decimals, and
+    every other point only iterates its float64 offset from that orbit. Offsets are rebased onto the start of the
+    reference orbit whenever they glitch (the point comes closer to zero than its offset) or run past the end of the
+    reference orbit. The coordinate range may be given as decimals or strings to zoom past float64 precision.
+
+    Before iterating, every offset can be jumped ahead along the reference orbit with a truncated power series in the
+    offset of its point, for as long as the series stays accurate at the edges of the view (series approximation).
+
+    Views smaller than EXTENDED_THRESHOLD would underflow float64, so their offsets are iterated as FloatExp values
+    with an extended exponent range instead. Shallower views keep iterating plain complex128 offsets.
+
+    Args:
+        iterations (int): The maximum number of iterations for Mandelbrot set generation.
+        coord_range (coordinaterange) ((decimal, decimal), (decimal, decimal)): X and Y range values, respectively.
+        xy_vals (tuple) (int, int): How many intervals to split the x and y axis into.
+        series_terms (int, optional): Number of terms in the series approximation, 0 to disable it.
+    
+    Raises:
+        ValueError: If the coordinate range is empty along either axis.
+
+    Attributes:
+        reference (tuple) (decimal, decimal): The real and imaginary parts of the reference point.
+        digits (int): Number of significant digits used to compute the reference orbit.
+        orbit (numpy.ndarray): The reference orbit, rounded to complex128.
+        series_terms (int): Number of terms in the series approximation, 0 to disable it.
+        series_tolerance (float): Maximum relative error of the series approximation at the probe points.
+        skipped_iterations (int): Number of iterations skipped by the series approximation in the last generation.
+        scale_exponent (int): Power of two the template offsets are scaled by.
+        extended (bool): Whether the offsets are iterated with an extended exponent range.
+        SERIES_TOLERANCE (float): The default series approximation tolerance.
+        EXTENDED_THRESHOLD (decimal): The view size below which offsets are iterated with an extended exponent range.
+    
+    Note:
+        Offsets are always iterated in float64 or wider, so the precision option is fixed to float64.
+        The template holds the offset of every point from the reference point, divided by 2**scale_exponent.
+    
+    """
+
+    SERIES_TOLERANCE = 1e-9
+    EXTENDED_THRESHOLD = Decimal('1e-290')
+
+    def __init__(self, iterations:int, coord_range:CoordinateRange, xy_vals:tuple, series_terms=5):
+        for low, high in (coord_range.x_range, coord_range.y_range):
+            if DeepMandelbrot.to_decimal(high) <= DeepMandelbrot.to_decimal(low):
+                raise ValueError('The coordinate range must span a positive width and height, got %s.' % str(coord_range).replace('\n', ' '))
+
+        self._reference = None
+        self._digits = None
+        self._half_spans = None
+        self._scale_exponent = 0
+        self._orbit = None
+        self._active_ref_idx = None
+        self._series_terms = series_terms
+        self._series_tolerance = DeepMandelbrot.SERIES_TOLERANCE
+        self._skipped_iterations = 0
+        super().__init__(iterations, coord_range, xy_vals, 'Deep Mandelbrot', compact=True)
+    
+    @property
+    def reference(self) -> tuple:
+        """tuple (decimal, decimal): The real and imaginary parts of the reference point."""
+        return self._reference
+    
+    @property
+    def digits(self) -> int:
+        """int: Number of significant digits used to compute the reference orbit."""
+        return self._digits
+    
+    @property
+    def orbit(self) -> np.ndarray:
+        """numpy.ndarray: The reference orbit, rounded to complex128."""
+        return self._orbit
+
+    @property
+    def scale_exponent(self) -> int:
+        """int: Power of two the template offsets are scaled by."""
+        return self._scale_exponent
+    
+    @property
+    def extended(self) -> bool:
+        """bool: Whether the offsets are iterated with an extended exponent range."""
+        return self._scale_exponent != 0
+
+    @property
+    def series_terms(self) -> int:
+        """int: Number of terms in the series approximation, 0 to disable it."""
+        return self._series_terms
+    
+    @series_terms.setter
+    def series_terms(self, terms:int):
+        self._series_terms = terms
+    
+    @property
+    def series_tolerance(self) -> float:
+        """float: Maximum relative error of the series approximation at the probe points."""
+        return self._series_tolerance
+    
+    @series_tolerance.setter
+    def series_tolerance(self, tolerance:float):
+        self._series_tolerance = tolerance
+    
+    @property
+    def skipped_iterations(self) -> int:
+        """int: Number of iterations skipped by the series approximation in the last generation."""
+        return self._skipped_iterations
+
+    @staticmethod
+    def to_decimal(value) -> Decimal:
+        """Converts a coordinate to a decimal without picking up binary rounding noise from floats.
+
+        Args:
+            value (float or numpy.floating or str or decimal): The coordinate to convert.
+        
+        Returns:
+            decimal: The coordinate as a decimal.
+        
+        """
+        # The shortest representation of the float, numpy floats repr() with their type name.
+        return Decimal(str(float(value))) if isinstance(value, (float, np.floating)) else Decimal(value)
+
+    def generate_template(self, xVals:int, yVals:int):
+        """Genereates a template of offsets from the reference point at the center of the coordinate range.
+
+        Args:
+            xVals (int): The number of intervals to split the real axis into.
+            yVals (int): The number of intervals to split the imaginary axis into
+        
+        returns:
+            (template): A grid of offsets from the reference point to match the x and y values given across the given XY ranges.
+        
+        """
+        xmin, xmax = [DeepMandelbrot.to_decimal(x) for x in self.coord_range.x_range]
+        ymin, ymax = [DeepMandelbrot.to_decimal(y) for y in self.coord_range.y_range]
+
+        min_span = min(xmax - xmin, ymax - ymin)
+        self._digits = max(30, 20 - min_span.adjusted())
+
+        with localcontext() as ctx:
+            ctx.prec = self._digits
+            self._reference = ((xmin + xmax) / 2, (ymin + ymax) / 2)
+
+            # Views too small for float64 are scaled up by a power of two close to their size.
+            self._scale_exponent = 0
+            if min_span < DeepMandelbrot.EXTENDED_THRESHOLD:
+                self._scale_exponent = int(min_span.adjusted() * math.log2(10))
+            
+            scale = Decimal(2) ** -self._scale_exponent
+            x_span = float((xmax - xmin) * scale)
+            y_span = float((ymax - ymin) * scale)
+
+        self._half_spans = (x_span / 2, y_span / 2)
+        real_parts = np.linspace(-x_span / 2, x_span / 2, xVals)
+        imag_parts = np.linspace(-y_span / 2, y_span / 2, yVals)
+        self._xy_vals = (xVals, yVals)
+
+        if self.window is not None:
+            imag_parts = imag_parts[self.window[0]]
+            real_parts = real_parts[self.window[1]]
+        
+        self._set_template = Template.shared(real_parts, imag_parts, self.float_dtype)
+        return self._set_template
+
+    def reference_orbit(self, length:int) -> np.ndarray:
+        """Computes the orbit of the reference point with arbitrary precision until it diverges.
+
+        Args:
+            length (int): The maximum number of iterations to compute.
+        
+        Returns:
+            numpy.ndarray: The orbit, starting from zero, rounded to complex128.
+        
+        """
+        orbit = [0j]
+        cx, cy = self.reference
+
+        with localcontext() as ctx:
+            ctx.prec = self.digits
+            x, y = Decimal(0), Decimal(0)
+
+            for _ in range(0, length):
+                x, y = x * x - y * y + cx, 2 * x * y + cy
+                orbit.append(complex(float(x), float(y)))
+
+                if x * x + y * y > 4:
+                    break
+        
+        return np.array(orbit, dtype=np.complex128)
+
+    def series_approximation(self) -> tuple:
+        """Fits a truncated power series in the offset of each point to the offsets along the reference orbit.
+
+        The offsets are scaled by the radius of the view, so every point in the view has a scaled offset within the unit
+        disk. The series is advanced until one of the following happens:
+        the last term is no longer negligible compared to the first,
+        the series no longer matches the directly iterated offsets at the corners and edges of the view,
+        or any point in the view could have diverged.
+
+        The coefficients and probe offsets share a single power of two, which is renormalized on every iteration,
+        so the series works at any zoom level.
+
+        Returns:
+            tuple (int, list[complex], int): The number of iterations the series is valid for,
+            its coefficients from the first power up, and the power of two the coefficients are scaled by.
+        
+        """
+        x_half, y_half = self._half_spans
+        radius = abs(complex(x_half, y_half))
+        probes = [complex(x * x_half, y * y_half) for x in (-1, 0, 1) for y in (-1, 0, 1) if x != 0 or y != 0]
+        probe_offsets = [0j] * len(probes)
+
+        coefficients = [0j] * self.series_terms
+        exponent = self.scale_exponent
+        skipped = (0, coefficients, exponent)
+
+        for n in range(0, min(len(self._orbit) - 1, self.max_iterations)):
+            ref = self._orbit[n]
+            scale = math.ldexp(1, exponent)
+            offset_scale = math.ldexp(1, self.scale_exponent - exponent)
+
+            advanced = []
+            for k in range(0, self.series_terms):
+                coefficient = 2 * ref * coefficients[k] + scale * sum(coefficients[i] * coefficients[k - 1 - i] for i in range(0, k))
+                advanced.append(coefficient + radius * offset_scale if k == 0 else coefficient)
+            
+            probe_offsets = [2 * ref * dz + scale * dz * dz + dc * offset_scale for dz, dc in zip(probe_offsets, probes)]
+
+            # Move the magnitude of the coefficients into the shared exponent.
+            _, shift = math.frexp(max(max(abs(a.real), abs(a.imag)) for a in advanced + probe_offsets))
+            advanced = [complex(math.ldexp(a.real, -shift), math.ldexp(a.imag, -shift)) for a in advanced]
+            probe_offsets = [complex(math.ldexp(dz.real, -shift), math.ldexp(dz.imag, -shift)) for dz in probe_offsets]
+            exponent += shift
+            
+            # No point in the view can have diverged while the reference plus the largest possible offset stays bounded.
+            if abs(self._orbit[n + 1]) + math.ldexp(sum(abs(a) for a in advanced), exponent) > 2:
+                break
+            
+            if abs(advanced[-1]) > self.series_tolerance * abs(advanced[0]):
+                break
+            
+            errors = [abs(DeepMandelbrot.evaluate_series(advanced, dc / radius) - dz) for dz, dc in zip(probe_offsets, probes)]
+            if any(err > self.series_tolerance * abs(dz) for err, dz in zip(errors, probe_offsets)):
+                break
+            
+            coefficients = advanced
+            skipped = (n + 1, coefficients, exponent)
+        
+        return skipped
+
+    @staticmethod
+    def evaluate_series(coefficients:list, scaled_offsets):
+        """Evaluates a power series without a constant term.
+
+        Args:
+            coefficients (list[complex]): The coefficients of the series from the first power up.
+            scaled_offsets (numpy.ndarray or complex): The scaled offsets to evaluate the series at.
+        
+        Returns:
+            numpy.ndarray or complex: The value of the series at each offset.
+        
+        """
+        result = 0
+        for coefficient in reversed(coefficients):
+            result = (result + coefficient) * scaled_offsets
+        return result
+
+    def __iter__(self):
+        """Iteration wrapper to setup the deep Mandelbrot set generation."""
+        super().__iter__()
+        self._orbit = self.reference_orbit(self.max_iterations + 1)
+        # Every point starts on the reference orbit, so its offset starts at zero like the fresh set data.
+        self.init_active(self.data, self.template)
+        self._active_ref_idx = np.zeros(self._active_idx.shape, dtype=np.intp)
+
+        if self.extended:
+            self._active_z = FloatExp(self._active_z)
+            self._active_c = FloatExp(self._active_c, self.scale_exponent)
+
+        self._skipped_iterations = 0
+        if self.series_terms > 0:
+            skipped, coefficients, exponent = self.series_approximation()
+
+            if skipped > 0:
+                radius = abs(complex(*self._half_spans))
+                scaled_offsets = self.template.take(self._active_idx) / radius
+                offsets = DeepMandelbrot.evaluate_series(coefficients, scaled_offsets)
+                self._active_z = FloatExp(offsets, exponent) if self.extended else ldexp_complex(offsets, exponent)
+                self._active_ref_idx[:] = skipped
+                self.iteration = skipped
+                self._skipped_iterations = skipped
+        
+        return self
+
+    @property
+    def connected(self) -> bool:
+        """bool: The Mandelbrot set is connected."""
+        return True
+
+    @property
+    def cacheable(self) -> bool:
+        """bool: The template holds offsets from the reference point, which moves with every view, so pixels are never cached."""
+        return False
+
+    def can_reuse(self, previous) -> bool:
+        """Checks whether the pixels of a previously generated set are valid for this set.
+
+        The template holds offsets from the reference point, which moves with every view, so pixels are never reused.
+
+        Args:
+            previous (complexset): The previously generated set.
+        
+        Returns:
+            bool: Always False.
+        
+        """
+        return False
+
+    def extend(self, iterations:int):
+        """Raises the maximum iterations of a finished or paused generation, see can_extend().
+
+        The reference orbit is computed again up to the new maximum. It starts with the previous orbit, so the offsets
+        keep their place along it.
+
+        Args:
+            iterations (int): The new maximum number of iterations.
+
+        """
+        super().extend(iterations)
+        self._orbit = self.reference_orbit(self.max_iterations + 1)
+
+    def resume(self, data:SetData):
+        """Takes over the final set data of a generation run outside of this set.
+
+        The offsets from the reference orbit can't be recovered from the full points at deep zooms, so the set data is
+        kept as is and the generation starts over when it is extended, see can_extend().
+
+        Args:
+            data (setdata): The final set data of the full grid.
+
+        """
+        self.release()
+        self.data = data
+        self.iteration = self.max_iterations
+
+    def _clear_state(self):
+        """Clears all of the generation state."""
+        super()._clear_state()
+        self._orbit = None
+        self._active_ref_idx = None
+
+    def rebase(self, rebased:np.ndarray):
+        """Moves the selected offsets back onto the start of the reference orbit.
+
+        Args:
+            rebased (numpy.ndarray): Boolean values selecting which compacted points to rebase.
+        
+        """
+        self._active_z[rebased] += self._orbit[self._active_ref_idx[rebased]]
+        self._active_ref_idx[rebased] = 0
+
+    def retire_active(self, retired:np.ndarray):
+        """Writes the selected compacted points back to the set data and stops iterating them.
+
+        Args:
+            retired (numpy.ndarray): Boolean values selecting which compacted points to retire.
+        
+        """
+        # The set data holds full points, so the offsets are rebased before being written back.
+        self.rebase(retired)
+        remaining = np.logical_not(retired)
+        super().retire_active(retired)
+        self._active_ref_idx = self._active_ref_idx[remaining]
+
+    def __next__(self):
+        """Deep Mandelbrot set generation logic."""
+        if self.iteration <= self.max_iterations:
+            self.iteration += 1
+
+            # Points can't step past the end of the reference orbit, so they start over from its beginning.
+            self.rebase(self._active_ref_idx >= len(self._orbit) - 1)
+
+            ref = self._orbit[self._active_ref_idx]
+            self._active_z = 2 * ref * self._active_z + self._active_z**2 + self._active_c
+            self._active_ref_idx += 1
+
+            # Extended offsets are flushed to complex128 here, they only matter while they're far smaller than the reference.
+            offsets = np.asarray(self._active_z)
+            points = self._orbit[self._active_ref_idx] + offsets
+            divergence_mask = np.absolute(points) > 2
+
+            if divergence_mask.any():
+                self.data.count.flat[self._active_idx[divergence_mask]] = self.iteration
+                self.retire_active(divergence_mask)
+                remaining = np.logical_not(divergence_mask)
+                points = points[remaining]
+                offsets = offsets[remaining]
+            
+            # Offsets that are larger than the point itself have lost their precision relative to the reference.
+            self.rebase(np.absolute(points) < np.absolute(offsets))
+
+            # Points that never diverge are only written back once the generation is complete.
+            if self.iteration >= self.max_iterations:
+                self.data.put(self._active_idx, self._orbit[self._active_ref_idx] + np.asarray(self._active_z))
+            
+            return (self.data, self.iteration)
+        else:
+            raise StopIteration
@@ -10,13 +10,16 @@ class Julia(ComplexSet):
         coord_range (coordinaterange) ((float, float), (float, float)): X and Y range values, respectively.
         xy_vals (tuple) (int, int): How many intervals to split the x and y axis into.
         constant (complex): The complex number to use for the Julia set generation.
+        compact (bool, optional): Whether to iterate only a compacted array of the points that haven't diverged.
+        periodicity (bool, optional): Whether to stop iterating points once their orbit is detected to be periodic.
+        precision (str, optional): Floating point precision of the generation, 'float32', 'float64' or 'auto'.
     
     Attributes:
         constant (complex): The complex number to use for the Julia set generation.
     
     """
-    def __init__(self, iterations:int, coord_range:CoordinateRange, xy_vals:tuple, constant:complex):
-        super().__init__(iterations, coord_range,  xy_vals, 'Julia')
+    def __init__(self, iterations:int, coord_range:CoordinateRange, xy_vals:tuple, constant:complex, compact=False, periodicity=False, precision='float64'):
+        super().__init__(iterations, coord_range,  xy_vals, 'Julia', compact, periodicity, precision)
         self._constant = constant
 
     @property
@@ -28,21 +31,69 @@ class Julia(ComplexSet):
     def constant(self, constant:complex):
         self._constant = constant
     
+    @property
+    def connected(self) -> bool:
+        """bool: Julia sets are connected when their constant is in the Mandelbrot set, tested up to the maximum iterations."""
+        z = 0
+        for _ in range(self.max_iterations):
+            z = z * z + self.constant
+            if abs(z) > 2:
+                return False
+        
+        return True
+
+    @property
+    def landmarks(self) -> tuple:
+        """tuple[complex]: Both fixed points of the iteration and their other preimages, whose orbits stay bounded."""
+        root = (1 - 4 * complex(self.constant)) ** 0.5
+        alpha = (1 - root) / 2
+        beta = (1 + root) / 2
+        return (alpha, -alpha, beta, -beta)
+
+    def can_reuse(self, previous) -> bool:
+        """Checks whether the pixels of a previously generated set are valid for this set.
+
+        Args:
+            previous (complexset): The previously generated set.
+        
+        Returns:
+            bool: True if the pixels are computed the same way and with the same constant as the pixels of this set.
+        
+        """
+        return super().can_reuse(previous) and previous.constant == self.constant
+
+    def can_extend(self, target) -> bool:
+        """Checks whether this generation can be continued up to the maximum iterations of another set instead of starting over.
+
+        Args:
+            target (complexset): The set to generate, with more iterations than this set.
+
+        Returns:
+            bool: True if the target covers the same view with the same constant as this set.
+
+        """
+        return super().can_extend(target) and target.constant == self.constant
+
     def __iter__(self):
         """Iteration wrapper to setup the Julia set generation."""
         super().__iter__()
-        self.data = self.template
+
+        # Points start from their coordinates, while seeded pixels keep their values.
+        np.copyto(self.data.re, self.template.re, where=self.mask)
+        np.copyto(self.data.im, self.template.im, where=self.mask)
+        if self.compact:
+            self.init_active(self.data, self.constant)
         return self
 
     def __next__(self):
         """Julia set generation logic."""
         if self.iteration <= self.max_iterations:
             self.iteration += 1
-            self.data['point'][self.mask] = self.data['point'][self.mask]**2 + self.constant
+            if self.compact:
+                self.next_active()
+                return (self.data, self.iteration)
 
-            divergence_mask = np.logical_and(np.absolute(self.data['point']) > 2, self.mask)
-            self.data['divergence'][divergence_mask] = self.iteration
-            self.mask = np.logical_and(self.mask, np.logical_not(divergence_mask))
+            self.next_grid(self.constant)
             return (self.data, self.iteration)
         else:
             raise StopIteration
\ No newline at end of file
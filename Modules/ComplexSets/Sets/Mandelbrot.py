@@ -9,22 +9,80 @@ class Mandelbrot(ComplexSet):
         iterations (int): The maximum number of iterations for Mandelbrot set generation.
         coord_range (coordinaterange) ((float, float), (float, float)): X and Y range values, respectively.
         xy_vals (tuple) (int, int): How many intervals to split the x and y axis into.
+        compact (bool, optional): Whether to iterate only a compacted array of the points that haven't diverged.
+        periodicity (bool, optional): Whether to stop iterating points once their orbit is detected to be periodic.
+        precision (str, optional): Floating point precision of the generation, 'float32', 'float64' or 'auto'.
+        interior_check (bool, optional): Whether to skip points inside the main cardioid and period-2 bulb.
+    
+    Attributes:
+        interior_check (bool): Whether to skip points inside the main cardioid and period-2 bulb.
     
     """
     
-    def __init__(self, iterations:int, coord_range:CoordinateRange, xy_vals:tuple):
-        super().__init__(iterations, coord_range, xy_vals, 'Mandelbrot')
+    def __init__(self, iterations:int, coord_range:CoordinateRange, xy_vals:tuple, compact=False, periodicity=False, interior_check=True, precision='float64'):
+        super().__init__(iterations, coord_range, xy_vals, 'Mandelbrot', compact, periodicity, precision)
+        self._interior_check = interior_check
+
+    @property
+    def interior_check(self) -> bool:
+        """bool: Whether to skip points inside the main cardioid and period-2 bulb."""
+        return self._interior_check
+    
+    @interior_check.setter
+    def interior_check(self, interior_check:bool):
+        self._interior_check = interior_check
+
+    @property
+    def connected(self) -> bool:
+        """bool: The Mandelbrot set is connected."""
+        return True
+
+    @property
+    def landmarks(self) -> tuple:
+        """tuple[complex]: The tip of the antenna, the cusp of the main cardioid and the two Misiurewicz points on the imaginary axis."""
+        return (complex(-2, 0), complex(0.25, 0), complex(0, 1), complex(0, -1))
+
+    @staticmethod
+    def interior(re:np.ndarray, im:np.ndarray) -> np.ndarray:
+        """Analytically determines which points lie strictly inside the main cardioid or the period-2 bulb.
+
+        These points are members of the Mandelbrot set, so they never diverge.
+
+        Args:
+            re (numpy.ndarray): Real parts of the points to test, broadcast against the imaginary parts.
+            im (numpy.ndarray): Imaginary parts of the points to test, broadcast against the real parts.
+        
+        Returns:
+            numpy.ndarray: Grid of boolean values, True for points inside the main cardioid or period-2 bulb.
+        
+        """
+        x = re
+        y2 = im**2
+
+        q = (x - 0.25)**2 + y2
+        cardioid = q * (q + (x - 0.25)) < 0.25 * y2
+        bulb = (x + 1)**2 + y2 < 0.0625
+        return np.logical_or(cardioid, bulb)
+
+    def __iter__(self):
+        """Iteration wrapper to setup the Mandelbrot set generation."""
+        super().__iter__()
+        if self.interior_check:
+            np.logical_and(self.mask, np.logical_not(Mandelbrot.interior(self.template.real, self.template.imag[:, np.newaxis])), out=self.mask)
+
+        if self.compact:
+            self.init_active(self.data, self.template)
+        return self
     
     def __next__(self):
         """Mandelbrot set generation logic."""
         if self.iteration <= self.max_iterations:
             self.iteration += 1
-            self.data['point'][self.mask] = self.data['point'][self.mask]**2 + self.template['point'][self.mask]
-
-            divergence_mask = np.logical_and(np.absolute(self.data['point']) > 2, self.mask)
-            self.data['divergence'][divergence_mask] = self.iteration
-            self.mask = np.logical_and(self.mask, np.logical_not(divergence_mask))
+            if self.compact:
+                self.next_active()
+                return (self.data, self.iteration)
 
+            self.next_grid(self.template)
             return (self.data, self.iteration)
         else:
             raise StopIteration
\ No newline at end of file
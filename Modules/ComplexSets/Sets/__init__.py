@@ -1,2 +1,3 @@
 from .Mandelbrot import Mandelbrot
-from .Julia import Julia
\ No newline at end of file
+from .Julia import Julia
+from .DeepMandelbrot import DeepMandelbrot
\ No newline at end of file
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+import numpy as np
+import threading
+
+class Template(object):
+    """Immutable grid of complex coordinates, stored as its real and imaginary axes.
+
+    Every row of the grid shares the real axis and every column shares the imaginary axis, so the full grid is never
+    materialized. The re and im grids broadcast the axes lazily without copying them, and the generation kernels only
+    gather the points they need. Templates are read-only, so sets covering the same grid share one template, see shared().
+
+    Args:
+        real (numpy.ndarray): The real part of every column.
+        imag (numpy.ndarray): The imaginary part of every row.
+        float_dtype (numpy.dtype, optional): The dtype of the axes, defaults to the dtype of the real axis.
+
+    Attributes:
+        real (numpy.ndarray): The real part of every column.
+        imag (numpy.ndarray): The imaginary part of every row.
+        re (numpy.ndarray): Read-only grid of the real parts of the points.
+        im (numpy.ndarray): Read-only grid of the imaginary parts of the points.
+        shape (tuple) (int, int): The (rows, columns) of the grid.
+        float_dtype (numpy.dtype): The dtype of the real and imaginary parts.
+        nbytes (int): The size of the axes in bytes.
+        CACHE_BUDGET (int): The maximum size of the axes of the templates kept for sharing, in bytes.
+
+    """
+
+    CACHE_BUDGET = 4 * 1024**2
+
+    _cache = OrderedDict()
+    _cache_nbytes = 0
+    _lock = threading.Lock()
+
+    def __init__(self, real:np.ndarray, imag:np.ndarray, float_dtype=None):
+        float_dtype = np.dtype(float_dtype) if float_dtype is not None else np.asarray(real).dtype
+        self._real = np.array(real, dtype=float_dtype)
+        self._imag = np.array(imag, dtype=float_dtype)
+        self._real.setflags(write=False)
+        self._imag.setflags(write=False)
+
+    @staticmethod
+    def shared(real:np.ndarray, imag:np.ndarray, float_dtype:np.dtype):
+        """Looks up the template of a grid, creating it if no recent template matches it.
+
+        Templates are kept until the shared templates outgrow CACHE_BUDGET, then the least recently used ones are forgotten.
+
+        Args:
+            real (numpy.ndarray): The real part of every column.
+            imag (numpy.ndarray): The imaginary part of every row.
+            float_dtype (numpy.dtype): The dtype of the axes.
+
+        Returns:
+            template: The shared template.
+
+        """
+        template = Template(real, imag, float_dtype)
+        key = (template.float_dtype.str, template.real.tobytes(), template.imag.tobytes())
+
+        with Template._lock:
+            cached = Template._cache.get(key)
+            if cached is not None:
+                Template._cache.move_to_end(key)
+                return cached
+
+            Template._cache[key] = template
+            Template._cache_nbytes += template.nbytes
+            while Template._cache_nbytes > Template.CACHE_BUDGET and len(Template._cache) > 1:
+                _, evicted = Template._cache.popitem(last=False)
+                Template._cache_nbytes -= evicted.nbytes
+        return template
+
+    @staticmethod
+    def cache_nbytes() -> int:
+        """Measures the shared templates.
+
+        Returns:
+            int: The size of the axes of the shared templates in bytes.
+
+        """
+        return Template._cache_nbytes
+
+    @staticmethod
+    def clear():
+        """Forgets every shared template, so the next lookup of every grid creates its template again."""
+        with Template._lock:
+            Template._cache.clear()
+            Template._cache_nbytes = 0
+
+    @property
+    def real(self) -> np.ndarray:
+        """numpy.ndarray: The real part of every column."""
+        return self._real
+
+    @property
+    def imag(self) -> np.ndarray:
+        """numpy.ndarray: The imaginary part of every row."""
+        return self._imag
+
+    @property
+    def re(self) -> np.ndarray:
+        """numpy.ndarray: Read-only grid of the real parts of the points."""
+        return np.broadcast_to(self._real, self.shape)
+
+    @property
+    def im(self) -> np.ndarray:
+        """numpy.ndarray: Read-only grid of the imaginary parts of the points."""
+        return np.broadcast_to(self._imag[:, np.newaxis], self.shape)
+
+    @property
+    def shape(self) -> tuple:
+        """tuple (int, int): The (rows, columns) of the grid."""
+        return (len(self._imag), len(self._real))
+
+    @property
+    def float_dtype(self) -> np.dtype:
+        """numpy.dtype: The dtype of the real and imaginary parts."""
+        return self._real.dtype
+
+    @property
+    def nbytes(self) -> int:
+        """int: The size of the axes in bytes."""
+        return self._real.nbytes + self._imag.nbytes
+
+    def take(self, idx:np.ndarray) -> np.ndarray:
+        """Gathers points by their flat index.
+
+        Args:
+            idx (numpy.ndarray): Flat indices of the points.
+
+        Returns:
+            numpy.ndarray: The complex points.
+
+        """
+        rows, cols = np.divmod(idx, len(self._real))
+        return self._real[cols] + 1j * self._imag[rows]
+
+    def __getitem__(self, key):
+        if key == 'point':
+            return self.re + 1j * self.im
+        raise KeyError(key)
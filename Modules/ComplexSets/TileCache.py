@@ -0,0 +1,403 @@
+from .ComplexSet import ComplexSet
+from .CoordinateRange import CoordinateRange
+from .SetData import SetData
+from .TileStore import TileStore
+from collections import OrderedDict
+import numpy as np
+import math
+
+class TileCache(object):
+    """In-memory cache of generated tiles, laid out on grids over the complex plane.
+
+    Every pixel spacing has its own grid, whose pixels sit on whole multiples of the spacing along each axis, so they
+    have the same coordinates in every view with that spacing. Every view lies on the grid of its spacing, see
+    ComplexSet.pixel_grid(), and snap() moves the coordinate range of a view onto the pixels it actually covers. Tiles
+    are kept until the cache outgrows its byte budget, then the least recently used tiles are evicted.
+
+    With a persistent store, every cached tile is also saved to disk, and tiles missing from memory are loaded from
+    the store, so tiles outlive the process.
+
+    Args:
+        budget (int, optional): The maximum size of the cached tiles in bytes.
+        tile_size (int, optional): The width and height of every tile in pixels.
+        tile_store (tilestore, optional): The persistent store backing the cache.
+
+    Attributes:
+        budget (int): The maximum size of the cached tiles in bytes.
+        tile_size (int): The width and height of every tile in pixels.
+        tile_store (tilestore): The persistent store backing the cache, or None.
+        nbytes (int): The size of the cached tiles in bytes.
+        hits (int): How many tiles were found in the cache.
+        misses (int): How many tiles had to be generated.
+        DEFAULT_BUDGET (int): Default byte budget.
+        DEFAULT_TILE_SIZE (int): Default tile size.
+        MAX_INDEX (int): The largest pixel index whose coordinates are exact, so the bounds of every tile give back its
+            grid, deeper views aren't cached.
+
+    """
+
+    DEFAULT_BUDGET = 256 * 1024**2
+    DEFAULT_TILE_SIZE = 64
+    MAX_INDEX = 2**(53 - ComplexSet.SPACING_BITS)
+
+    def __init__(self, budget=DEFAULT_BUDGET, tile_size=DEFAULT_TILE_SIZE, tile_store=None):
+        self._budget = budget
+        self._tile_size = tile_size
+        self._tile_store = tile_store
+        self._tiles = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def budget(self) -> int:
+        """int: The maximum size of the cached tiles in bytes."""
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget:int):
+        self._budget = budget
+        self.evict()
+
+    @property
+    def tile_size(self) -> int:
+        """int: The width and height of every tile in pixels."""
+        return self._tile_size
+
+    @property
+    def tile_store(self) -> TileStore:
+        """tilestore: The persistent store backing the cache, or None."""
+        return self._tile_store
+
+    @property
+    def nbytes(self) -> int:
+        """int: The size of the cached tiles in bytes."""
+        return self._nbytes
+
+    @property
+    def hits(self) -> int:
+        """int: How many tiles were found in the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """int: How many tiles had to be generated."""
+        return self._misses
+
+    @staticmethod
+    def grid(complex_set:ComplexSet) -> tuple:
+        """Finds the grid of the pixel spacing of a set, see ComplexSet.pixel_grid().
+
+        Args:
+            complex_set (complexset): The set.
+
+        Returns:
+            tuple (float, float): The pixel spacing of the real and imaginary axes of the grid.
+
+        """
+        spacings = []
+        for values, bounds in zip(complex_set.xy_vals, (complex_set.coord_range.x_range, complex_set.coord_range.y_range)):
+            grid = ComplexSet.pixel_grid(bounds, values)
+            spacings.append(grid[1] if grid is not None else 0.0)
+        return tuple(spacings)
+
+    def snap(self, complex_set:ComplexSet) -> CoordinateRange:
+        """Moves the coordinate range of a set onto the grid of its pixel spacing.
+
+        The lower left corner moves by at most half a pixel along each axis, while the spacing of both axes is kept up
+        to its rounding, see ComplexSet.pixel_grid().
+
+        Args:
+            complex_set (complexset): The set to snap.
+
+        Returns:
+            coordinaterange: The snapped XY range.
+
+        """
+        return complex_set.snap(complex_set.coord_range)
+
+    def locate(self, complex_set:ComplexSet) -> tuple:
+        """Finds where a set lies on the grid of its pixel spacing.
+
+        Args:
+            complex_set (complexset): The set to locate.
+
+        Returns:
+            tuple (tuple(float, float), int, int): The grid and the pixel index of the lower left corner of the set,
+            or None if the set can't be cached.
+
+        """
+        if not complex_set.cacheable or complex_set.window is not None or min(complex_set.xy_vals) < 2:
+            return None
+
+        grid = []
+        corner = []
+        for values, bounds in zip(complex_set.xy_vals, (complex_set.coord_range.x_range, complex_set.coord_range.y_range)):
+            located = ComplexSet.pixel_grid(bounds, values)
+            if located is None or abs(located[0]) + values + self.tile_size > TileCache.MAX_INDEX:
+                return None
+            corner.append(located[0])
+            grid.append(located[1])
+
+        return (tuple(grid), corner[0], corner[1])
+
+    def key(self, complex_set:ComplexSet, grid:tuple, tx:int, ty:int) -> tuple:
+        """Builds the cache key of a tile.
+
+        Args:
+            complex_set (complexset): The set the tile belongs to.
+            grid (tuple) (float, float): The grid of the tile, see grid().
+            tx (int): The column of the tile in its grid.
+            ty (int): The row of the tile in its grid.
+
+        Returns:
+            tuple: The key, (set name, Julia constant, grid, tile x, tile y, max iterations, precision).
+
+        """
+        constant = getattr(complex_set, 'constant', None)
+        return (complex_set.name, constant, grid, tx, ty, complex_set.max_iterations, complex_set.float_dtype.name)
+
+    def get(self, key:tuple) -> SetData:
+        """Looks up a tile, marking it as the most recently used, and loads it from the store if it isn't in memory.
+
+        Args:
+            key (tuple): The key of the tile.
+
+        Returns:
+            setdata: The tile, or None if it isn't cached.
+
+        """
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._hits += 1
+            self._tiles.move_to_end(key)
+            return tile
+
+        tile = self.tile_store.get(key) if self.tile_store is not None else None
+        if tile is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._remember(key, tile)
+        return tile
+
+    def put(self, key:tuple, tile:SetData):
+        """Caches a tile as the most recently used and saves it to the store.
+
+        Args:
+            key (tuple): The key of the tile.
+            tile (setdata): The tile.
+
+        """
+        self._remember(key, tile)
+        if self.tile_store is not None:
+            self.tile_store.put(key, tile)
+
+    def _remember(self, key:tuple, tile:SetData):
+        """Keeps a tile in memory as the most recently used, evicting the least recently used tiles if the budget is exceeded.
+
+        Args:
+            key (tuple): The key of the tile.
+            tile (setdata): The tile.
+
+        """
+        if key in self._tiles:
+            self._nbytes -= TileCache.tile_nbytes(self._tiles.pop(key))
+
+        self._tiles[key] = tile
+        self._nbytes += TileCache.tile_nbytes(tile)
+        self.evict()
+
+    def evict(self):
+        """Evicts the least recently used tiles until the cache fits in its budget."""
+        while self._tiles and self._nbytes > self.budget:
+            _, tile = self._tiles.popitem(last=False)
+            self._nbytes -= TileCache.tile_nbytes(tile)
+
+    def flush(self):
+        """Writes the index of the store, if any."""
+        if self.tile_store is not None:
+            self.tile_store.flush()
+
+    def clear(self):
+        """Evicts every tile from memory and resets the counters, the store is left untouched."""
+        self._tiles.clear()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def tile_nbytes(tile:SetData) -> int:
+        """Computes the size of a tile.
+
+        Args:
+            tile (setdata): The tile.
+
+        Returns:
+            int: The size of the tile in bytes.
+
+        """
+        return SetData.nbytes(tile.shape, tile.float_dtype, tile.count_dtype)
+
+    def generate(self, complex_set:ComplexSet, grid:tuple, missing:list) -> dict:
+        """Generates missing tiles in a single pass and caches them.
+
+        Args:
+            complex_set (complexset): The set the tiles belong to.
+            grid (tuple) (float, float): The grid of the tiles, see grid().
+            missing (list[tuple(int, int)]): The (tile x, tile y) of every missing tile.
+
+        Returns:
+            dict[tuple(int, int), setdata]: The generated tiles by their (tile x, tile y).
+
+        """
+        size = self.tile_size
+        x_spacing, y_spacing = grid
+        tx0 = min(tx for tx, _ in missing)
+        tx1 = max(tx for tx, _ in missing)
+        ty0 = min(ty for _, ty in missing)
+        ty1 = max(ty for _, ty in missing)
+
+        # One view covers every missing tile, and only the pixels of the missing tiles are generated. Its bounds are
+        # exact below MAX_INDEX, so it lies on the same grid and its pixels are the pixels of every view on the grid.
+        xy_vals = ((tx1 - tx0 + 1) * size, (ty1 - ty0 + 1) * size)
+        x_axis = ComplexSet.grid_axis(tx0 * size, x_spacing, xy_vals[0])
+        y_axis = ComplexSet.grid_axis(ty0 * size, y_spacing, xy_vals[1])
+        covering = complex_set.view(CoordinateRange(x_axis[0], x_axis[-1], y_axis[0], y_axis[-1]), xy_vals)
+        covering.precision = complex_set.resolve_precision()
+
+        windows = {(tx, ty): (slice((ty - ty0) * size, (ty - ty0 + 1) * size), slice((tx - tx0) * size, (tx - tx0 + 1) * size))
+                    for tx, ty in missing}
+        selection = np.zeros((xy_vals[1], xy_vals[0]), dtype=bool)
+        for rows, cols in windows.values():
+            selection[rows, cols] = True
+
+        data = covering.allocate(selection.shape)
+        covering.generate_selected(selection, data)
+
+        tiles = {}
+        for (tx, ty), (rows, cols) in windows.items():
+            tile = data[rows, cols].copy()
+            self.put(self.key(complex_set, grid, tx, ty), tile)
+            tiles[(tx, ty)] = tile
+
+        covering.pool.release(data.re, data.im, data.count)
+        return tiles
+
+    def tiles(self, located:tuple, xy_vals:tuple) -> list:
+        """Lists the tiles overlapping a view.
+
+        Args:
+            located (tuple) (tuple, int, int): The grid and the pixel index of the lower left corner of the view, see locate().
+            xy_vals (tuple) (int, int): How many intervals the x and y axis of the view are split into.
+
+        Returns:
+            list[tuple(int, int, tuple(slice, slice), tuple(slice, slice))]: The tile x, tile y, (rows, columns) window
+            of the view and (rows, columns) window of the tile where they overlap, for every tile.
+
+        """
+        _, i0, j0 = located
+        width, height = xy_vals
+        size = self.tile_size
+
+        tiles = []
+        for ty in range(j0 // size, (j0 + height - 1) // size + 1):
+            for tx in range(i0 // size, (i0 + width - 1) // size + 1):
+                r0 = max(j0, ty * size)
+                r1 = min(j0 + height, (ty + 1) * size)
+                c0 = max(i0, tx * size)
+                c1 = min(i0 + width, (tx + 1) * size)
+                view_window = (slice(r0 - j0, r1 - j0), slice(c0 - i0, c1 - i0))
+                tile_window = (slice(r0 - ty * size, r1 - ty * size), slice(c0 - tx * size, c1 - tx * size))
+                tiles.append((tx, ty, view_window, tile_window))
+        return tiles
+
+    def seed(self, complex_set:ComplexSet) -> int:
+        """Seeds the next generation of a set with its cached tiles, so only the pixels of the missing tiles are iterated.
+
+        Args:
+            complex_set (complexset): The set to seed.
+
+        Returns:
+            int: How many tiles are missing, or None if the set can't be cached, see locate().
+
+        """
+        located = self.locate(complex_set)
+        if located is None:
+            return None
+
+        shape = (complex_set.xy_vals[1], complex_set.xy_vals[0])
+        data = SetData(shape, complex_set.float_dtype, complex_set.count_dtype)
+        known = np.zeros(shape, dtype=bool)
+        missing = 0
+
+        for tx, ty, view_window, tile_window in self.tiles(located, complex_set.xy_vals):
+            tile = self.get(self.key(complex_set, located[0], tx, ty))
+            if tile is None:
+                missing += 1
+            else:
+                data[view_window] = tile[tile_window]
+                known[view_window] = True
+
+        if known.any():
+            complex_set.seed(known, data)
+        self.flush()
+        return missing
+
+    def store(self, complex_set:ComplexSet, data:SetData):
+        """Caches every tile that lies entirely inside a generated view and isn't cached in memory or in the store yet.
+
+        Args:
+            complex_set (complexset): The generated set.
+            data (setdata): The final set data.
+
+        """
+        located = self.locate(complex_set)
+        if located is None:
+            return
+
+        size = self.tile_size
+        for tx, ty, view_window, _ in self.tiles(located, complex_set.xy_vals):
+            rows, cols = view_window
+            key = self.key(complex_set, located[0], tx, ty)
+            stored = key in self._tiles or (self.tile_store is not None and key in self.tile_store)
+            if rows.stop - rows.start == size and cols.stop - cols.start == size and not stored:
+                self.put(key, data[view_window].copy())
+        self.flush()
+
+    def render(self, complex_set:ComplexSet) -> SetData:
+        """Assembles a set from cached tiles, only generating the tiles that aren't cached.
+
+        Sets that can't be cached, see locate(), are generated in full without the cache. Cached pixels have the
+        coordinates of the pixels of the set bit for bit, so the result is the result of generating the set.
+
+        Args:
+            complex_set (complexset): The set to render.
+
+        Returns:
+            setdata: The final set data.
+
+        """
+        located = self.locate(complex_set)
+        if located is None:
+            return complex_set.generate_set()
+
+        tiles = self.tiles(located, complex_set.xy_vals)
+        cached = {}
+        for tx, ty, _, _ in tiles:
+            tile = self.get(self.key(complex_set, located[0], tx, ty))
+            if tile is not None:
+                cached[(tx, ty)] = tile
+
+        missing = [(tx, ty) for tx, ty, _, _ in tiles if (tx, ty) not in cached]
+        if missing:
+            cached.update(self.generate(complex_set, located[0], missing))
+
+        width, height = complex_set.xy_vals
+        result = SetData((height, width), complex_set.float_dtype, complex_set.count_dtype)
+        for tx, ty, view_window, tile_window in tiles:
+            result[view_window] = cached[(tx, ty)][tile_window]
+
+        self.flush()
+        return result
@@ -0,0 +1,477 @@
+from .Colorizer import Colorizer
+from .ComplexSet import ComplexSet
+from .CoordinateRange import CoordinateRange
+from .Sets import Mandelbrot, Julia
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from urllib.parse import parse_qs, urlsplit
+import asyncio
+import io
+import json
+import math
+import multiprocessing
+import numpy as np
+import os
+import re
+import time
+
+class InvalidTile(Exception):
+    """Raised if a tile request names an unknown set or format, or lies outside the tile pyramid."""
+    pass
+
+class InvalidOption(InvalidTile):
+    """Raised if a query option of a tile request is malformed or out of range."""
+    pass
+
+def render_tile(key:tuple) -> bytes:
+    """Generates and encodes a tile in a worker process.
+
+    Args:
+        key (tuple): The tile, see TileServer.parse().
+
+    Returns:
+        bytes: The encoded tile.
+
+    """
+    name, z, x, y, extension, iterations, colormap, constant = key
+    count = TileServer.build(name, TileServer.coord_range(z, x, y), iterations, constant).generate_set().count
+
+    buffer = io.BytesIO()
+    if extension == 'npy':
+        # Rows are stored top down like the image, rather than from the lowest imaginary part.
+        np.save(buffer, np.ascontiguousarray(count[::-1]))
+    else:
+        # Every tile is colored on the same scale, so neighbouring tiles don't show seams.
+        Image.fromarray(Colorizer.shared(colormap).colorize(count, limits=(0, iterations))).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def start_worker():
+    """Does nothing in a worker process, submitted once per worker to start every process up front."""
+    pass
+
+class TileServer(object):
+    """Serves tiles of complex sets over HTTP on localhost, for slippy map viewers such as Leaflet or OpenLayers.
+
+    Tiles are addressed like web map tiles, /{set}/{z}/{x}/{y}.png for colored images or .npy for the divergence counts,
+    with x growing to the right and y growing downwards. Zoom level 0 is a single tile spanning EXTENT along both axes,
+    centered on the origin, and every zoom level halves the pixel spacing, so pixels sit on whole multiples of a power
+    of two like the levels of TileCache. The 'iterations', 'colormap', and for Julia sets 'real' and 'imag' query
+    options override the defaults of the server, ex: /julia/3/2/5.png?iterations=2000&real=-0.8&imag=0.156.
+
+    Tiles are generated and encoded across a pool of worker processes, which are spawned rather than forked so they
+    never hold on to the sockets of open connections. Requests for a tile that is already being
+    generated wait for it instead of generating it again, and encoded tiles are kept in memory until the cache
+    outgrows its byte budget, then the least recently used tiles are evicted. GET /metrics reports the queue depth,
+    the latency percentiles of tile requests and the cache hit rate as JSON.
+
+    Args:
+        port (int, optional): The port to listen on, 0 picks a free port.
+        workers (int, optional): Number of worker processes, defaults to the number of CPUs.
+        iterations (int, optional): Default maximum number of iterations.
+        colormap (str, optional): Default matplotlib colormap of .png tiles.
+        constant (complex, optional): Default Julia constant.
+        budget (int, optional): The maximum size of the cached tiles in bytes.
+
+    Attributes:
+        port (int): The port the server listens on, known once it is started if it was 0.
+        workers (int): Number of worker processes.
+        iterations (int): Default maximum number of iterations.
+        colormap (str): Default matplotlib colormap of .png tiles.
+        constant (complex): Default Julia constant.
+        budget (int): The maximum size of the cached tiles in bytes.
+        nbytes (int): The size of the cached tiles in bytes.
+        executor (concurrent.futures.processpoolexecutor): The worker pool, started by start() or created on first use.
+        HOST (str): The loopback address the server listens on, it is never exposed beyond the local machine.
+        DEFAULT_PORT (int): Default port.
+        DEFAULT_ITERATIONS (int): Default maximum number of iterations.
+        DEFAULT_CONSTANT (complex): Default Julia constant, the default of the viewer.
+        DEFAULT_BUDGET (int): Default byte budget of the cache.
+        MAX_ITERATIONS (int): The largest maximum number of iterations a request may ask for.
+        MAX_ZOOM (int): The deepest zoom level, deeper tiles would run out of float64 precision.
+        TILE_SIZE (int): The width and height of every tile in pixels.
+        EXTENT (float): The width and height of the zoom level 0 tile, a power of two.
+        LATENCY_WINDOW (int): How many of the latest tile requests the latency percentiles cover.
+        SETS (tuple): The names of the sets that are served.
+        CONTENT_TYPES (dict[str, str]): The content type of every tile extension.
+
+    """
+
+    HOST = '127.0.0.1'
+    DEFAULT_PORT = 8080
+    DEFAULT_ITERATIONS = 500
+    DEFAULT_CONSTANT = complex(-0.835, -0.2321)
+    DEFAULT_BUDGET = 64 * 1024**2
+    MAX_ITERATIONS = 100000
+    MAX_ZOOM = 40
+    TILE_SIZE = 256
+    EXTENT = 4.0
+    LATENCY_WINDOW = 1000
+    SETS = ('mandelbrot', 'julia')
+    CONTENT_TYPES = {'png': 'image/png', 'npy': 'application/octet-stream'}
+
+    _PATH = re.compile(r'^/(?P<set>[a-z]+)/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)\.(?P<extension>[a-z]+)$')
+    _REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+    def __init__(self, port=DEFAULT_PORT, workers=None, iterations=DEFAULT_ITERATIONS, colormap=Colorizer.DEFAULT_COLORMAP,
+                 constant=DEFAULT_CONSTANT, budget=DEFAULT_BUDGET):
+        self._port = port
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._iterations = iterations
+        self._colormap = colormap
+        self._constant = constant
+        self._budget = budget
+        self._executor = None
+        self._colormaps = frozenset(Colorizer.colormaps())
+
+        self._tiles = OrderedDict()
+        self._nbytes = 0
+        self._inflight = {}
+        self._latencies = deque(maxlen=TileServer.LATENCY_WINDOW)
+        self._requests = 0
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._errors = 0
+
+    @property
+    def port(self) -> int:
+        """int: The port the server listens on, known once it is started if it was 0."""
+        return self._port
+
+    @property
+    def workers(self) -> int:
+        """int: Number of worker processes."""
+        return self._workers
+
+    @property
+    def iterations(self) -> int:
+        """int: Default maximum number of iterations."""
+        return self._iterations
+
+    @property
+    def colormap(self) -> str:
+        """str: Default matplotlib colormap of .png tiles."""
+        return self._colormap
+
+    @property
+    def constant(self) -> complex:
+        """complex: Default Julia constant."""
+        return self._constant
+
+    @property
+    def budget(self) -> int:
+        """int: The maximum size of the cached tiles in bytes."""
+        return self._budget
+
+    @property
+    def nbytes(self) -> int:
+        """int: The size of the cached tiles in bytes."""
+        return self._nbytes
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """concurrent.futures.processpoolexecutor: The worker pool, started by start() or created on first use."""
+        if self._executor is None:
+            # Forked workers would inherit the sockets of open connections and keep them from ever closing.
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    @staticmethod
+    def coord_range(z:int, x:int, y:int) -> CoordinateRange:
+        """Finds the coordinate range of a tile.
+
+        Args:
+            z (int): The zoom level.
+            x (int): The column of the tile, from the left.
+            y (int): The row of the tile, from the top.
+
+        Returns:
+            coordinaterange: The XY range of the tile.
+
+        Raises:
+            InvalidTile: If the tile lies outside the pyramid.
+
+        """
+        if not (0 <= z <= TileServer.MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z):
+            raise InvalidTile('Tile %d/%d/%d is outside the pyramid, zoom levels go up to %d.' % (z, x, y, TileServer.MAX_ZOOM))
+
+        # Spacings and corners are powers of two times integers, so every coordinate is exact.
+        spacing = math.ldexp(TileServer.EXTENT / TileServer.TILE_SIZE, -z)
+        last = TileServer.TILE_SIZE - 1
+        x0 = -TileServer.EXTENT / 2 + x * TileServer.TILE_SIZE * spacing
+        y1 = TileServer.EXTENT / 2 - y * TileServer.TILE_SIZE * spacing
+        return CoordinateRange(x0, x0 + last * spacing, y1 - last * spacing, y1)
+
+    @staticmethod
+    def build(name:str, coord_range:CoordinateRange, iterations:int, constant=None) -> ComplexSet:
+        """Creates the set of a tile.
+
+        Args:
+            name (str): The name of the set, one of SETS.
+            coord_range (coordinaterange): The XY range of the tile.
+            iterations (int): The maximum number of iterations.
+            constant (complex, optional): The Julia constant.
+
+        Returns:
+            complexset: The set, ready to be generated.
+
+        """
+        xy_vals = (TileServer.TILE_SIZE, TileServer.TILE_SIZE)
+        if name == 'julia':
+            return Julia(iterations, coord_range, xy_vals, constant, compact=True)
+        return Mandelbrot(iterations, coord_range, xy_vals, compact=True)
+
+    def parse(self, target:str) -> tuple:
+        """Parses the target of a tile request.
+
+        Args:
+            target (str): The path and query of the request.
+
+        Returns:
+            tuple: The (set, z, x, y, extension, iterations, colormap, constant) of the tile, with the colormap and
+            constant being None where they don't apply, so equal tiles have equal keys.
+
+        Raises:
+            InvalidTile: If the target doesn't name a tile.
+            InvalidOption: If one of the query options is invalid.
+
+        """
+        url = urlsplit(target)
+        match = TileServer._PATH.match(url.path)
+        if match is None:
+            raise InvalidTile('Tiles are served at /{set}/{z}/{x}/{y}.png or .npy, not %s.' % url.path)
+
+        name = match['set']
+        extension = match['extension']
+        if name not in TileServer.SETS:
+            raise InvalidTile('Unknown set "%s", expected one of %s.' % (name, ', '.join(TileServer.SETS)))
+        if extension not in TileServer.CONTENT_TYPES:
+            raise InvalidTile('Unknown extension ".%s", expected one of %s.' % (extension, ', '.join(TileServer.CONTENT_TYPES)))
+
+        z, x, y = int(match['z']), int(match['x']), int(match['y'])
+        TileServer.coord_range(z, x, y)
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            iterations = int(query.get('iterations', self.iterations))
+            real = float(query.get('real', self.constant.real))
+            imag = float(query.get('imag', self.constant.imag))
+        except ValueError as e:
+            raise InvalidOption('Invalid option, %s.' % e)
+
+        if not 1 <= iterations <= TileServer.MAX_ITERATIONS:
+            raise InvalidOption('Iterations must be between 1 and %d.' % TileServer.MAX_ITERATIONS)
+
+        colormap = None
+        if extension == 'png':
+            colormap = query.get('colormap', self.colormap)
+            if colormap not in self._colormaps:
+                raise InvalidOption('Color map "%s" is not included in the Matplotlib list of color maps.' % colormap)
+
+        constant = complex(real, imag) if name == 'julia' else None
+        return (name, z, x, y, extension, iterations, colormap, constant)
+
+    async def tile(self, key:tuple) -> bytes:
+        """Looks up an encoded tile, generating it if it isn't cached or already being generated.
+
+        Args:
+            key (tuple): The tile, see parse().
+
+        Returns:
+            bytes: The encoded tile.
+
+        """
+        start = time.perf_counter()
+        self._requests += 1
+
+        body = self._tiles.get(key)
+        if body is not None:
+            self._hits += 1
+            self._tiles.move_to_end(key)
+        else:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._coalesced += 1
+            else:
+                self._misses += 1
+                future = asyncio.get_running_loop().run_in_executor(self.executor, render_tile, key)
+                self._inflight[key] = future
+                future.add_done_callback(lambda done: self.__finish(key, done))
+
+            # A client hanging up must not cancel the tile for the other clients waiting on it.
+            body = await asyncio.shield(future)
+
+        self._latencies.append(time.perf_counter() - start)
+        return body
+
+    def __finish(self, key:tuple, future:asyncio.Future):
+        """Caches a generated tile once its future is done."""
+        del self._inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        body = future.result()
+        self._tiles[key] = body
+        self._nbytes += len(body)
+        while self._nbytes > self.budget and self._tiles:
+            _, evicted = self._tiles.popitem(last=False)
+            self._nbytes -= len(evicted)
+
+    def metrics(self) -> dict:
+        """Reports the state of the server.
+
+        Returns:
+            dict: The 'queue_depth' (tiles waiting for a worker), 'in_flight' (tiles being generated or waiting),
+            'requests', 'errors', 'latency_ms' percentiles over the latest tile requests and 'cache' statistics.
+
+        """
+        latencies = np.array(self._latencies) * 1000
+        percentiles = {}
+        if len(latencies) > 0:
+            p50, p90, p99 = np.percentile(latencies, (50, 90, 99))
+            percentiles = {'p50': p50, 'p90': p90, 'p99': p99, 'max': latencies.max()}
+
+        return {
+            'queue_depth': max(0, len(self._inflight) - self.workers),
+            'in_flight': len(self._inflight),
+            'workers': self.workers,
+            'requests': self._requests,
+            'errors': self._errors,
+            'latency_ms': {'samples': len(latencies), **{name: round(float(value), 3) for name, value in percentiles.items()}},
+            'cache': {
+                'hits': self._hits,
+                'misses': self._misses,
+                'coalesced': self._coalesced,
+                'hit_rate': self._hits / self._requests if self._requests else 0.0,
+                'tiles': len(self._tiles),
+                'nbytes': self.nbytes,
+                'budget': self.budget
+            }
+        }
+
+    async def respond(self, method:str, target:str) -> tuple:
+        """Answers a request.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The path and query of the request.
+
+        Returns:
+            tuple (int, str, bytes): The status code, content type and body of the response.
+
+        """
+        if method not in ('GET', 'HEAD'):
+            return (405, 'text/plain', b'Only GET and HEAD requests are supported.')
+
+        if urlsplit(target).path == '/metrics':
+            return (200, 'application/json', json.dumps(self.metrics(), indent=2).encode())
+
+        try:
+            key = self.parse(target)
+            return (200, TileServer.CONTENT_TYPES[key[4]], await self.tile(key))
+        except InvalidOption as e:
+            return (400, 'text/plain', str(e).encode())
+        except InvalidTile as e:
+            return (404, 'text/plain', str(e).encode())
+        except Exception as e:
+            self._errors += 1
+            return (500, 'text/plain', ('%s: %s' % (type(e).__name__, e)).encode())
+
+    async def handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter):
+        """Serves the requests of a connection, keeping it open between requests unless the client closes it.
+
+        Args:
+            reader (asyncio.streamreader): The incoming stream of the connection.
+            writer (asyncio.streamwriter): The outgoing stream of the connection.
+
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'', b'\r\n', b'\n'):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = line.decode('latin-1').split()
+                if len(parts) != 3:
+                    status, content_type, body = (400, 'text/plain', b'Malformed request line.')
+                    method, version = ('GET', 'HTTP/1.0')
+                else:
+                    method, target, version = parts
+                    status, content_type, body = await self.respond(method, target)
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                head = ['HTTP/1.1 %d %s' % (status, TileServer._REASONS[status]),
+                        'Content-Type: %s' % content_type,
+                        'Content-Length: %d' % len(body),
+                        'Access-Control-Allow-Origin: *',
+                        'Cache-Control: %s' % ('max-age=86400' if status == 200 and content_type != 'application/json' else 'no-store'),
+                        'Connection: %s' % ('keep-alive' if keep_alive else 'close')]
+
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> asyncio.AbstractServer:
+        """Starts every worker process and starts listening on the loopback address.
+
+        Returns:
+            asyncio.abstractserver: The listening server.
+
+        """
+        # Workers are only started as tasks are submitted, so one task per worker starts them all before any
+        # connection is accepted, ready for the first tiles.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.executor, start_worker) for _ in range(0, self.workers)])
+        server = await asyncio.start_server(self.handle, TileServer.HOST, self._port)
+        self._port = server.sockets[0].getsockname()[1]
+        return server
+
+    async def serve(self, ready=None):
+        """Serves requests until the task is cancelled.
+
+        Args:
+            ready (function(int), optional): Called with the port once the server is listening.
+
+        """
+        server = await self.start()
+        if ready is not None:
+            ready(self.port)
+        async with server:
+            await server.serve_forever()
+
+    def run(self, ready=None):
+        """Serves requests until interrupted, then shuts down the worker pool.
+
+        Args:
+            ready (function(int), optional): Called with the port once the server is listening.
+
+        """
+        try:
+            asyncio.run(self.serve(ready))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """Shuts down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,311 @@
+from .SetData import SetData
+import numpy as np
+import hashlib
+import json
+import os
+import weakref
+import zlib
+
+class TileStore(object):
+    """Persistent store of generated tiles in a directory on disk, shared by every process that opens the directory.
+
+    Every tile is saved as a single buffer holding its real parts, imaginary parts and divergence counts one after
+    another, see SetData. Tiles are read back as exact pixels by every process, so only exact tiles may be stored,
+    never approximations such as guessed pixels. Tiles that compress well, such as tiles lying inside the set, are
+    saved zlib compressed, while the rest are saved as .npy files that are memory-mapped when loaded. An index file
+    keeps the layout of every tile and when it was last used, and the least recently used tiles are deleted once the
+    store outgrows its capacity. Stores written with another VERSION are cleared when they're opened.
+
+    Files can't be deleted while they're mapped on every platform, so the files of deleted tiles that are still
+    loaded are only deleted once every tile loaded from them is released, the next time the index is written.
+
+    Args:
+        directory (str): The directory of the store, created if it doesn't exist.
+        capacity (int, optional): The maximum size of the stored files in bytes.
+
+    Attributes:
+        directory (str): The directory of the store.
+        capacity (int): The maximum size of the stored files in bytes.
+        nbytes (int): The size of the stored files in bytes.
+        INDEX (str): The file name of the index.
+        VERSION (int): The version of the stored tiles, stores of other versions may hold tiles that are no longer valid.
+        DEFAULT_CAPACITY (int): Default capacity.
+        COMPRESSION_RATIO (float): Tiles are only compressed when that shrinks them to at most this fraction of their size.
+
+    """
+
+    INDEX = 'index.json'
+    VERSION = 2
+    DEFAULT_CAPACITY = 1024**3
+    COMPRESSION_RATIO = 0.5
+
+    def __init__(self, directory:str, capacity=DEFAULT_CAPACITY):
+        self._directory = os.path.expanduser(directory)
+        self._capacity = capacity
+        os.makedirs(self._directory, exist_ok=True)
+
+        self._entries = self.read_index(any_version=True)
+        self._nbytes = sum(entry['nbytes'] for entry in self._entries.values())
+        self._clock = max((entry['used'] for entry in self._entries.values()), default=0)
+        self._removed = set()
+        self._mapped = {}
+        self._orphans = {file: None for file in self.read_orphans()}
+        self._dirty = bool(self._orphans)
+
+        # Tiles of other versions may not be valid anymore, so they're deleted.
+        if self.read_version() != TileStore.VERSION:
+            for name in list(self._entries):
+                self.remove(name)
+            self.flush()
+        self.evict()
+        self.delete_orphans()
+
+    @property
+    def directory(self) -> str:
+        """str: The directory of the store."""
+        return self._directory
+
+    @property
+    def capacity(self) -> int:
+        """int: The maximum size of the stored files in bytes."""
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity:int):
+        self._capacity = capacity
+        self.evict()
+
+    @property
+    def nbytes(self) -> int:
+        """int: The size of the stored files in bytes."""
+        return self._nbytes
+
+    @staticmethod
+    def name(key:tuple) -> str:
+        """Builds the file name of a tile.
+
+        Args:
+            key (tuple): The key of the tile.
+
+        Returns:
+            str: The file name, without its extension.
+
+        """
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def read_version(self) -> int:
+        """Reads the version of the store.
+
+        Returns:
+            int: The version of the index, 1 for indices without a version, or VERSION if there is no index yet.
+
+        """
+        try:
+            with open(os.path.join(self.directory, TileStore.INDEX), 'r') as f:
+                index = json.load(f)
+        except OSError:
+            return TileStore.VERSION
+        except ValueError:
+            return None
+
+        return index.get('version', 1) if isinstance(index, dict) else None
+
+    def read_orphans(self) -> list:
+        """Reads the files of deleted tiles that were still loaded when the index was written.
+
+        Returns:
+            list[str]: The file names.
+
+        """
+        try:
+            with open(os.path.join(self.directory, TileStore.INDEX), 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return []
+
+        orphans = index.get('orphans', []) if isinstance(index, dict) else []
+        return [file for file in orphans if isinstance(file, str)]
+
+    def read_index(self, any_version=False) -> dict:
+        """Reads the index of the store, dropping entries whose files are missing.
+
+        Args:
+            any_version (bool, optional): Whether to read the entries of an index of another version too.
+
+        Returns:
+            dict[str, dict]: The entry of every stored tile by its file name.
+
+        """
+        try:
+            with open(os.path.join(self.directory, TileStore.INDEX), 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return dict()
+
+        if not isinstance(index, dict):
+            return dict()
+
+        # Indices before version 2 were a plain mapping of the entries.
+        entries = index.get('entries', {}) if 'version' in index else index
+        if index.get('version', 1) != TileStore.VERSION and not any_version:
+            return dict()
+
+        return {name: entry for name, entry in entries.items()
+                if isinstance(entry, dict) and 'file' in entry and os.path.exists(os.path.join(self.directory, entry['file']))}
+
+    def flush(self):
+        """Writes the index of the store if it changed, replacing the previous index in a single step.
+
+        Tiles that other processes stored since the index was read are merged in first, and the files of deleted tiles
+        that were released since are deleted.
+
+        """
+        self.delete_orphans()
+        if not self._dirty:
+            return
+
+        for name, entry in self.read_index().items():
+            if name not in self._entries and name not in self._removed:
+                self._entries[name] = entry
+                self._nbytes += entry['nbytes']
+                self._clock = max(self._clock, entry['used'])
+        self.evict()
+        self.delete_orphans()
+
+        index = {'version': TileStore.VERSION, 'entries': self._entries}
+        if self._orphans:
+            index['orphans'] = sorted(self._orphans)
+
+        path = os.path.join(self.directory, TileStore.INDEX)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(index, f)
+        os.replace(path + '.tmp', path)
+        self._dirty = False
+
+    def get(self, key:tuple) -> SetData:
+        """Loads a tile, marking it as the most recently used.
+
+        Args:
+            key (tuple): The key of the tile.
+
+        Returns:
+            setdata: The tile, read-only and memory-mapped unless it was compressed, or None if it isn't stored.
+
+        """
+        name = TileStore.name(key)
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+
+        path = os.path.join(self.directory, entry['file'])
+        try:
+            if entry['compressed']:
+                with open(path, 'rb') as f:
+                    buffer = bytearray(zlib.decompress(f.read()))
+            else:
+                buffer = np.load(path, mmap_mode='r')
+                self._mapped[entry['file']] = weakref.ref(buffer)
+        except (OSError, ValueError, zlib.error):
+            self.remove(name)
+            return None
+
+        self._clock += 1
+        entry['used'] = self._clock
+        self._dirty = True
+        return SetData(tuple(entry['shape']), entry['float_dtype'], entry['count_dtype'], buffer=buffer)
+
+    def put(self, key:tuple, tile:SetData):
+        """Saves a tile as the most recently used, deleting the least recently used tiles if the capacity is exceeded.
+
+        Only exact tiles are stored, so a tile that is already stored is only marked as the most recently used. Its
+        file is never written again, it may be mapped by the tiles loaded from it.
+
+        Args:
+            key (tuple): The key of the tile.
+            tile (setdata): The tile.
+
+        """
+        name = TileStore.name(key)
+        if name in self._entries:
+            self._clock += 1
+            self._entries[name]['used'] = self._clock
+            self._dirty = True
+            return
+        self._removed.discard(name)
+
+        buffer = np.concatenate([a.ravel().view(np.uint8) for a in (tile.re, tile.im, tile.count)])
+        compressed = zlib.compress(buffer.tobytes())
+
+        if len(compressed) <= TileStore.COMPRESSION_RATIO * buffer.nbytes:
+            file = name + '.zlib'
+            with open(os.path.join(self.directory, file), 'wb') as f:
+                f.write(compressed)
+        else:
+            file = name + '.npy'
+            np.save(os.path.join(self.directory, file), buffer)
+        self._orphans.pop(file, None)
+
+        self._clock += 1
+        self._entries[name] = {
+            'file': file,
+            'shape': list(tile.shape),
+            'float_dtype': tile.float_dtype.str,
+            'count_dtype': tile.count_dtype.str,
+            'compressed': file.endswith('.zlib'),
+            'nbytes': os.path.getsize(os.path.join(self.directory, file)),
+            'used': self._clock
+        }
+        self._nbytes += self._entries[name]['nbytes']
+        self._dirty = True
+        self.evict()
+
+    def remove(self, name:str):
+        """Deletes a stored tile, its file is only deleted once every tile loaded from it is released.
+
+        Args:
+            name (str): The file name of the tile, see name().
+
+        """
+        entry = self._entries.pop(name)
+        self._removed.add(name)
+        self._nbytes -= entry['nbytes']
+        self._dirty = True
+        self._orphans[entry['file']] = self._mapped.pop(entry['file'], None)
+        self.delete_orphans()
+
+    def delete_orphans(self):
+        """Deletes the files of deleted tiles that no loaded tile maps anymore."""
+        stored = {entry['file'] for entry in self._entries.values()}
+        for file, mapped in list(self._orphans.items()):
+            # The store only keeps weak references to its mappings, a live one is still used by a loaded tile.
+            if mapped is not None and mapped() is not None:
+                continue
+
+            if file not in stored:
+                try:
+                    os.remove(os.path.join(self.directory, file))
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+            del self._orphans[file]
+            self._dirty = True
+
+    def __contains__(self, key:tuple) -> bool:
+        return TileStore.name(key) in self._entries
+
+    def evict(self):
+        """Deletes the least recently used tiles until the store fits in its capacity."""
+        if self._nbytes <= self.capacity:
+            return
+
+        for name in sorted(self._entries, key=lambda name: self._entries[name]['used']):
+            if self._nbytes <= self.capacity:
+                break
+            self.remove(name)
+
+    def clear(self):
+        """Deletes every stored tile."""
+        for name in list(self._entries):
+            self.remove(name)
+        self.flush()
@@ -1,3 +1,14 @@
+from .AnimationRenderer import AnimationRenderer
+from .BatchRenderer import BatchRenderer
+from .BufferPool import BufferPool
+from .Colorizer import Colorizer
 from .ComplexSet import ComplexSet
 from .CoordinateRange import CoordinateRange
-from Modules.ComplexSets.Sets import *
\ No newline at end of file
+from .FloatExp import FloatExp
+from .SetData import SetData
+from .Template import Template
+from .TileCache import TileCache
+from .TileServer import TileServer
+from .TileStore import TileStore
+from Modules.ComplexSets.Sets import *
+from Modules.ComplexSets.Renderers import *
\ No newline at end of file
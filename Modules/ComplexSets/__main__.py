@@ -0,0 +1,146 @@
+"""Renders complex sets to image or array files without the GUI.
+
+Usage:
+    python -m Modules.ComplexSets render --set Julia --size 1920 1080 --iterations 500 --output julia.png
+    python -m Modules.ComplexSets render --center -0.745 0.113 --scale 0.01 --colormap magma --output zoom.png
+    python -m Modules.ComplexSets render --jobs jobs.json
+    python -m Modules.ComplexSets animate --path zoom.json --output frames/%05d.png
+    python -m Modules.ComplexSets serve --port 8080 --iterations 1000
+
+A job file holds a list of jobs, or {"defaults": {...}, "jobs": [...]}, with the keys described by BatchRenderer.
+A zoom path file is a job without an output, holding 'keyframes' as described by AnimationRenderer.
+The tile server only listens on localhost, its tiles and options are described by TileServer.
+
+"""
+import argparse
+import json
+import sys
+import time
+
+from .AnimationRenderer import AnimationRenderer
+from .BatchRenderer import BatchRenderer
+from .Renderers import ChunkedRenderer
+from .TileCache import TileCache
+from .TileServer import TileServer
+from .TileStore import TileStore
+
+RENDERERS = {
+    'direct': lambda args: None,
+    'chunked': lambda args: ChunkedRenderer(threads=args.threads)
+}
+
+def job_from_args(args) -> dict:
+    """Builds a job from the command line options, leaving out the options that weren't given."""
+    job = {'set': args.set, 'output': args.output}
+    if args.iterations is not None:
+        job['maxIterations'] = args.iterations
+    if args.precision is not None:
+        job['precision'] = args.precision
+    if args.size is not None:
+        job['dimensions'] = {'width': args.size[0], 'height': args.size[1]}
+    if args.colormap is not None:
+        job['colormap'] = args.colormap
+    if args.constant is not None:
+        job['julia_constant'] = {'real': float(args.constant[0]), 'imag': float(args.constant[1])}
+    if args.range is not None:
+        job['xRange'] = {'min': args.range[0], 'max': args.range[1]}
+        job['yRange'] = {'min': args.range[2], 'max': args.range[3]}
+    if args.center is not None:
+        job['center'] = {'real': args.center[0], 'imag': args.center[1]}
+    if args.scale is not None:
+        job['scale'] = args.scale
+    return job
+
+def render(args):
+    """Renders a single job from the command line options, or every job of a job file."""
+    cache = None
+    if args.tile_store is not None:
+        cache = TileCache(tile_store=TileStore(args.tile_store, args.tile_store_capacity))
+
+    batch = BatchRenderer(RENDERERS[args.renderer](args), cache)
+    if args.jobs is not None:
+        with open(args.jobs, 'r') as f:
+            jobs = json.load(f)
+        defaults = jobs.get('defaults') if isinstance(jobs, dict) else None
+        jobs = jobs['jobs'] if isinstance(jobs, dict) else jobs
+    else:
+        if args.output is None:
+            raise SystemExit('render: either --output or --jobs is required.')
+        defaults = None
+        jobs = [job_from_args(args)]
+
+    try:
+        start = time.perf_counter()
+        for path in batch.run_all(jobs, defaults):
+            print('%8.2fs  %s' % (time.perf_counter() - start, path))
+    finally:
+        if hasattr(batch.renderer, 'close'):
+            batch.renderer.close()
+
+def animate(args):
+    """Renders the frames of a zoom path file."""
+    with open(args.path, 'r') as f:
+        path = json.load(f)
+
+    job = {**BatchRenderer.DEFAULTS, **path}
+    complex_set = BatchRenderer.build(job)
+    start = time.perf_counter()
+
+    def progress(frame:int):
+        print('%8.2fs  frame %d/%d' % (time.perf_counter() - start, frame + 1, animation.frame_count))
+
+    with AnimationRenderer(complex_set, path['keyframes'], workers=args.workers) as animation:
+        animation.save(args.output, job['colormap'], path.get('duration', AnimationRenderer.DEFAULT_DURATION), progress)
+
+def serve(args):
+    """Serves tiles until interrupted."""
+    constant = complex(float(args.constant[0]), float(args.constant[1])) if args.constant is not None else TileServer.DEFAULT_CONSTANT
+    server = TileServer(args.port, args.workers, args.iterations, args.colormap, constant, args.cache_budget)
+
+    def ready(port:int):
+        print('Serving tiles at http://%s:%d/{set}/{z}/{x}/{y}.png, metrics at /metrics' % (TileServer.HOST, port))
+
+    server.run(ready)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m Modules.ComplexSets', description='Render complex sets without the GUI.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_render = commands.add_parser('render', help='Render views to .png (or any image format) and .npy files.')
+    parser_render.add_argument('--jobs', help='JSON job file with many views, rendered in one process.')
+    parser_render.add_argument('--set', default=BatchRenderer.DEFAULTS['set'], help='Mandelbrot, Julia or "Deep Mandelbrot".')
+    parser_render.add_argument('--range', nargs=4, metavar=('XMIN', 'XMAX', 'YMIN', 'YMAX'), help='Coordinate range of the view.')
+    parser_render.add_argument('--center', nargs=2, metavar=('REAL', 'IMAG'), help='Center of the view, used with --scale.')
+    parser_render.add_argument('--scale', help='Width of the view along the real axis, used with --center.')
+    parser_render.add_argument('--size', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'), help='Size of the output in pixels.')
+    parser_render.add_argument('--iterations', type=int, help='Maximum number of iterations.')
+    parser_render.add_argument('--constant', nargs=2, metavar=('REAL', 'IMAG'), help='Julia constant.')
+    parser_render.add_argument('--precision', choices=('float32', 'float64', 'auto'), help='Floating point precision.')
+    parser_render.add_argument('--colormap', help='Matplotlib colormap of image outputs.')
+    parser_render.add_argument('--output', help='Output path, .npy writes the divergence grid.')
+    parser_render.add_argument('--renderer', choices=tuple(RENDERERS), default='chunked', help='How every view is generated.')
+    parser_render.add_argument('--threads', type=int, default=None, help='Threads of the chunked renderer, defaults to the number of CPUs.')
+    parser_render.add_argument('--tile-store', help='Directory of a persistent tile store shared with the GUI.')
+    parser_render.add_argument('--tile-store-capacity', type=int, default=TileStore.DEFAULT_CAPACITY, help='Capacity of the tile store in bytes.')
+    parser_render.set_defaults(func=render)
+
+    parser_animate = commands.add_parser('animate', help='Render a keyframed zoom path to numbered images or an animated PNG/GIF.')
+    parser_animate.add_argument('--path', required=True, help='JSON zoom path file, a job with keyframes.')
+    parser_animate.add_argument('--output', required=True, help='Output path, with a number such as %%05d for one image per frame.')
+    parser_animate.add_argument('--workers', type=int, default=None, help='Number of worker processes, defaults to the number of CPUs.')
+    parser_animate.set_defaults(func=animate)
+
+    parser_serve = commands.add_parser('serve', help='Serve slippy map tiles over HTTP on localhost.')
+    parser_serve.add_argument('--port', type=int, default=TileServer.DEFAULT_PORT, help='Port to listen on, 0 picks a free port.')
+    parser_serve.add_argument('--workers', type=int, default=None, help='Number of worker processes, defaults to the number of CPUs.')
+    parser_serve.add_argument('--iterations', type=int, default=TileServer.DEFAULT_ITERATIONS, help='Default maximum number of iterations.')
+    parser_serve.add_argument('--colormap', default=BatchRenderer.DEFAULTS['colormap'], help='Default matplotlib colormap of .png tiles.')
+    parser_serve.add_argument('--constant', nargs=2, metavar=('REAL', 'IMAG'), help='Default Julia constant.')
+    parser_serve.add_argument('--cache-budget', type=int, default=TileServer.DEFAULT_BUDGET, help='Byte budget of the in-memory tile cache.')
+    parser_serve.set_defaults(func=serve)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
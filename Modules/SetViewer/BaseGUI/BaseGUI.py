@@ -2,11 +2,11 @@ from abc import ABC, abstractclassmethod
 import tkinter as tk
 from tkinter import ttk
 from os import path, makedirs
-from matplotlib import pyplot as plt
 from PIL import Image, ImageTk
 import webbrowser
 import time
 
+from ...ComplexSets.Colorizer import Colorizer
 from ...ComplexSets.CoordinateRange import CoordinateRange as crange
 from .Root import RootWidget as Root
 from .Sidepanel import SidepanelWidget as Sidepanel
@@ -34,7 +34,7 @@ class BaseGUI(ABC):
     Args:
         sets (dict[str, ComplexSets]): Mapping of set names to Complex Set objects.
         title (str): Title of the window.
-        colormap (str): Default colormap to apply to the GUI figure.
+        colormap (str): Default colormap to apply to the canvas.
         iterations (int): Max number of iterations to simulate.
         dimensions (tuple) (int, int): used to initialize the respective (width, height) of root widget.
         max_interval_delay (int): Max delay between frame animation.
@@ -44,7 +44,7 @@ class BaseGUI(ABC):
     Attributes:
         GITHUB_URL (str): GitHub URI.
         GITHUB_PNG (str): GitHub logo/icon path.
-        DEFAULT_PNG (str): Default image path to use for figure before set generation.
+        DEFAULT_PNG (str): Default image path to show on the canvas before set generation.
         SIMULATOR_ICON (str): Icon path for GUI.
         SAVE_DIRECTORY (str): Directory path where images will be saved.
         MIN_WIDTH (int): Minimum width of the GUI in pixels.
@@ -53,8 +53,7 @@ class BaseGUI(ABC):
 
         width (int): Width of the GUI.
         height (int): Height of the GUI.
-        figure (matplotlib.pyplot.figure): Figure to display the generated sets.
-        canvas (matplotlib.backends.backend_tkagg.figurecanvastkagg): Canvas to connect matplotlib figure and tkinter.
+        canvas (canvas): Canvas to display the generated sets.
         root (RootWidget): Top-level widget for GUI
         sidepanel (SidepanelWidget): Main sidepanel container for most of the GUI controls.
         
@@ -76,7 +75,7 @@ class BaseGUI(ABC):
     SIDEPANEL_WIDTH = 250
     
     def __init__(self, **kwargs):
-        colormaps = plt.colormaps()
+        colormaps = Colorizer.colormaps()
         if kwargs['colormap'] not in colormaps:
             raise ColorMapNotIncluded('Color map "%s" is not included in the Matplotlib list of color maps.' % kwargs['colormap'])
         
@@ -99,13 +98,15 @@ class BaseGUI(ABC):
         # Width/Height specifications
         self.width = new_dims[0]
         self.height = new_dims[1]
-        self.figure = plt.figure(figsize=(dims[0] / 100, dims[1] / 100), dpi=100)
 
         # Main GUI components
         self.root = Root(kwargs['title'], new_dims, minwidth=BaseGUI.SIDEPANEL_WIDTH)
         self.root.icon = BaseGUI.SIMULATOR_ICON
-        self.canvas = Canvas(self.root, self.canvas_onclick, (dims[0], dims[1]), BaseGUI.DEFAULT_PNG, 100)
-        self.canvas.get_tk_widget().grid(row=0, column=1, sticky='E')
+        self.canvas = Canvas(self.root, self.canvas_onclick, (dims[0], dims[1]), BaseGUI.DEFAULT_PNG, kwargs['colormap'], self.canvas_onrelease)
+        self.canvas.grid(row=0, column=1, sticky='E')
+
+        for key in ('<Left>', '<Right>', '<Up>', '<Down>'):
+            self.root.bind(key, self.arrow_key_pressed)
 
         # Validation function for coordinate range entries
         validate = (self.root.register(self.range_entry_handler), '%S', '%P')
@@ -183,7 +184,7 @@ class BaseGUI(ABC):
             makedirs(BaseGUI.SAVE_DIRECTORY)
         
         current_time = time.strftime("%Y-%m-%d %I %M %p")
-        plt.savefig(BaseGUI.SAVE_DIRECTORY + '/%s Set - %s' % (self.sidepanel.components['simulation'].setlist.val, current_time))
+        self.canvas.image.save(BaseGUI.SAVE_DIRECTORY + '/%s Set - %s.png' % (self.sidepanel.components['simulation'].setlist.val, current_time))
     
     def range_entry_handler(self, key:str, entry:str) -> bool:
         """Validation function for each keystroke of a XY range entry.
@@ -280,7 +281,28 @@ class BaseGUI(ABC):
         
         Args:
             widget (tkinter.widget): Widget container of what component triggered the event.
-            event (matplotlib.backend_bases.mouseevent): Event data regarding where on the canvas was clicked.
+            event (canvasevent): Event data regarding where on the canvas was clicked.
+        
+        """
+        pass
+
+    @abstractclassmethod
+    def canvas_onrelease(self, widget:tk.Widget, event):
+        """Event handler for the canvas click release. Overridden by implementation.
+        
+        Args:
+            widget (tkinter.widget): Widget container of what component triggered the event.
+            event (canvasevent): Event data regarding where on the canvas the click was released.
+        
+        """
+        pass
+
+    @abstractclassmethod
+    def arrow_key_pressed(self, event):
+        """Event handler for arrow key presses. Overridden by implementation.
+        
+        Args:
+            event (tkinter.event): Event data regarding which arrow key was pressed.
         
         """
         pass
\ No newline at end of file
@@ -1,30 +1,89 @@
 import tkinter as tk
-from matplotlib.backends.backend_tkagg import (
-    FigureCanvasTkAgg, NavigationToolbar2Tk)
-from matplotlib import pyplot as plt
+import numpy as np
 from os import path
 from PIL import Image, ImageTk
 from typing import Callable
 
-class Canvas(FigureCanvasTkAgg):
+from ...ComplexSets.Colorizer import Colorizer
+
+class CanvasEvent(object):
+    """Mouse event of the canvas, with the origin at the bottom left like the divergence grid.
+
+    Args:
+        x (int): The x position of the mouse, in pixels from the left.
+        y (int): The y position of the mouse, in pixels from the bottom.
+        button (str): The mouse button, one of 'left', 'middle' or 'right'.
+
+    """
+    def __init__(self, x:int, y:int, button:str):
+        self._x = x
+        self._y = y
+        self._button = button
+
+    @property
+    def x(self) -> int:
+        """int: The x position of the mouse, in pixels from the left."""
+        return self._x
+
+    @property
+    def y(self) -> int:
+        """int: The y position of the mouse, in pixels from the bottom."""
+        return self._y
+
+    @property
+    def button(self) -> str:
+        """str: The mouse button, one of 'left', 'middle' or 'right'."""
+        return self._button
+
+class Canvas(tk.Canvas):
     """Main canvas for viewing the complex set generation/image.
-    
+
+    Divergence grids are colored through the lookup table of the colormap and copied straight into a Tk photo image,
+    which is created once and reused by every frame.
+
     Args:
         master (tkinter.widget): Parent container of the canvas.
         handler (function(widget, event)): The event handler for the canvas click event.
         size (tuple) (int, int): Width and height of the canvas, respectively.
         fpath (str): File path of the default image to load onto the canvas.
-        dpi (int, optional): DPI of the figure, default is 100.
-    
+        colormap (str, optional): Name of the matplotlib colormap to color divergence grids with.
+        release_handler (function(widget, event), optional): The event handler for the canvas click release event.
+
+    Attributes:
+        width (int): Width of the canvas.
+        height (int): Height of the canvas.
+        colormap (str): Name of the matplotlib colormap to color divergence grids with.
+        image (pil.image): The image shown on the canvas.
+        BUTTONS (dict[int, str]): Name of every Tk mouse button number.
+
     """
-    def __init__(self, master:tk.Widget, handler:Callable, size:tuple, fpath:str, dpi=100):
+
+    BUTTONS = {1: 'left', 2: 'middle', 3: 'right'}
+
+    def __init__(self, master:tk.Widget, handler:Callable, size:tuple, fpath:str, colormap=Colorizer.DEFAULT_COLORMAP, release_handler=None):
         self._width = size[0]
         self._height = size[1]
-        self._figure = plt.figure(figsize=(self._width / dpi, self._height / dpi), dpi=dpi)
-        super().__init__(self._figure, master=master)
+        super().__init__(master, width=self._width, height=self._height, borderwidth=0, highlightthickness=0)
+
+        self._colorizer = Colorizer.shared(colormap)
+        self._indices = None
+        self._rgb = np.empty((self._height, self._width, 3), dtype=np.uint8)
+        self._photo = ImageTk.PhotoImage('RGB', (self._width, self._height), master=self)
+        self.create_image(0, 0, image=self._photo, anchor='nw')
+
+        # Tk numbers the right button 2 on macOS.
+        self._buttons = dict(Canvas.BUTTONS)
+        if self.tk.call('tk', 'windowingsystem') == 'aqua':
+            self._buttons.update({2: 'right', 3: 'middle'})
+
+        self.load_default_image(fpath)
+        self.bind('<ButtonPress>', lambda event: handler(self, self.__event(event)))
+        if release_handler is not None:
+            self.bind('<ButtonRelease>', lambda event: release_handler(self, self.__event(event)))
 
-        self.load_default_figure(fpath)
-        self.mpl_connect('button_press_event', lambda event: handler(self, event))
+    def __event(self, event:tk.Event) -> CanvasEvent:
+        """Converts a Tk mouse event to a canvas event."""
+        return CanvasEvent(event.x, self._height - event.y, self._buttons.get(event.num, 'middle'))
 
     @property
     def width(self) -> int:
@@ -37,48 +96,58 @@ class Canvas(FigureCanvasTkAgg):
         return self._height
 
     @property
-    def figure(self) -> plt.figure:
-        """matplotlib.pyplot.figure: Figure of the canvas."""
-        return self._figure
-
-    @figure.setter
-    def figure(self, figure:plt.figure):
-        self._figure = figure
-    
-    def load_default_figure(self, fpath:str):
-        """Load the default image into figure when the GUI loads.
-        
+    def colormap(self) -> str:
+        """str: Name of the matplotlib colormap to color divergence grids with."""
+        return self._colorizer.colormap
+
+    @colormap.setter
+    def colormap(self, colormap:str):
+        # The scaled grid is kept, so only the lookup table changes.
+        self._colorizer = Colorizer.shared(colormap)
+        if self._indices is not None:
+            self.__blit()
+
+    @property
+    def image(self) -> Image:
+        """pil.image: The image shown on the canvas."""
+        return Image.fromarray(self._rgb)
+
+    def load_default_image(self, fpath:str):
+        """Load the default image onto the canvas when the GUI loads.
+
         Args:
             fpath (str): File path of the default image to load onto the canvas.
-        
+
         Raises:
             FileNotFoundError: If the default image to load is not found.
-        
+
         """
         if not path.exists(fpath):
             raise FileNotFoundError('%s File not found.' % fpath)
-        
-        img = Image.open(fpath)
+
+        img = Image.open(fpath).convert('RGBA')
 
         # Pad image with emptiness
-        new_img = Image.new('RGBA', (self._width, self._height), 'white')
+        new_img = Image.new('RGB', (self._width, self._height), 'white')
         offset_width = (self._width - img.width) // 2
         offset_height = (self._height - img.height) // 2
-        new_img.paste(img, (offset_width, offset_height))
-        
-        self.update(new_img)
-    
-    def update(self, img:Image, cmap='gray', origin='lower', redraw=False):
-        """Update the canvas.
+        new_img.paste(img, (offset_width, offset_height), img)
+
+        self._indices = None
+        self._rgb[...] = np.asarray(new_img)
+        self._photo.paste(new_img)
+
+    def draw(self, divergence:np.ndarray):
+        """Colors a divergence grid and shows it on the canvas.
 
         Args:
-            img (pil.image): Image to update the canvas with.
-            cmap (str, optional): Colormap to apply to the figure.
-            origin (str, optional): Origin of figure.
-            redraw (bool): Redraw the canvas.
-        
+            divergence (numpy.ndarray): The divergence grid, its first row being the lowest imaginary part.
+
         """
-        self._figure.clear()
-        self._figure.figimage(img, cmap=cmap, origin=origin)
-        if redraw:
-            self.draw()
\ No newline at end of file
+        self._indices = self._colorizer.indices(divergence)[::-1]
+        self.__blit()
+
+    def __blit(self):
+        """Colors the scaled grid into the reused RGB buffer and copies it into the photo image."""
+        self._colorizer.apply(self._indices, out=self._rgb)
+        self._photo.paste(Image.fromarray(self._rgb))
@@ -0,0 +1,149 @@
+import queue
+import threading
+
+class GenerationWorker(threading.Thread):
+    """Runs a set generation on a background thread, posting snapshots of its progress to a bounded queue.
+
+    The generation is split into steps, such as single iterations or progressive passes, which all run on the worker
+    thread, so the GUI thread only has to draw the snapshots. A snapshot is only taken after a step if the queue has
+    room for it, so a GUI that falls behind skips the stale frames instead of holding the generation back. Once the
+    worker stops, a final snapshot always replaces whatever is still waiting in the queue.
+
+    Workers are stopped through a cancellation token that is checked between steps, so a cancelled worker finishes
+    its current step and exits on its own. A worker cancelled to be replaced discards its snapshots instead of posting
+    a final one, so none of its stale frames are drawn. A worker started with a previous worker waits for it to exit
+    first, so the generations of both never touch the same set at once.
+
+    Args:
+        steps (iterator): Runs one step per next() call and returns the function(bool) taking its snapshot, given whether
+            it is the final one. Its first step always runs, even if the worker is cancelled before it starts, so it can
+            set up the generation. Once finished, it may return the function taking the final snapshot.
+        previous (generationworker, optional): A worker to wait for before starting.
+        delay (float, optional): Seconds to wait after every step.
+        size (int, optional): Maximum number of snapshots waiting in the queue.
+
+    Attributes:
+        queue (queue.queue): The snapshots waiting to be drawn, oldest first.
+        delay (float): Seconds to wait after every step, may be changed while the worker runs.
+        cancelled (bool): Whether the worker was cancelled.
+        discarded (bool): Whether the worker was cancelled without posting any more snapshots.
+        finished (bool): Whether every step of the generation was run.
+        error (exception): The exception raised by a step, or None.
+        DEFAULT_SIZE (int): Default maximum number of snapshots waiting in the queue.
+
+    """
+
+    DEFAULT_SIZE = 2
+
+    def __init__(self, steps, previous=None, delay=0, size=DEFAULT_SIZE):
+        # Daemon threads don't keep the process alive once the window is closed.
+        super().__init__(daemon=True)
+        self._steps = steps
+        self._previous = previous
+        self._delay = delay
+        self._queue = queue.Queue(maxsize=size)
+        self._token = threading.Event()
+        self._discarded = False
+        self._finished = False
+        self._error = None
+
+    @property
+    def queue(self) -> queue.Queue:
+        """queue.queue: The snapshots waiting to be drawn, oldest first."""
+        return self._queue
+
+    @property
+    def delay(self) -> float:
+        """float: Seconds to wait after every step, may be changed while the worker runs."""
+        return self._delay
+
+    @delay.setter
+    def delay(self, delay:float):
+        self._delay = delay
+
+    @property
+    def cancelled(self) -> bool:
+        """bool: Whether the worker was cancelled."""
+        return self._token.is_set()
+
+    @property
+    def discarded(self) -> bool:
+        """bool: Whether the worker was cancelled without posting any more snapshots."""
+        return self._discarded
+
+    @property
+    def finished(self) -> bool:
+        """bool: Whether every step of the generation was run."""
+        return self._finished
+
+    @property
+    def error(self) -> Exception:
+        """exception: The exception raised by a step, or None."""
+        return self._error
+
+    def cancel(self, discard=False):
+        """Stops the worker once its current step is finished, without waiting for it.
+
+        Args:
+            discard (bool, optional): Whether to drop the snapshots waiting in the queue and post no final snapshot,
+                ex: when the generation is replaced by a newer one.
+
+        """
+        self._discarded = self._discarded or discard
+        self._token.set()
+        if discard:
+            self.latest()
+
+    def latest(self):
+        """Takes every snapshot waiting in the queue, dropping all but the newest one.
+
+        Returns:
+            object: The newest snapshot, or None if the queue was empty.
+
+        """
+        snapshot = None
+        while True:
+            try:
+                snapshot = self._queue.get_nowait()
+            except queue.Empty:
+                return snapshot
+
+    def run(self):
+        """Runs the steps of the generation until they are finished or the worker is cancelled."""
+        if self._previous is not None:
+            self._previous.join()
+            self._previous = None
+
+        take = None
+        try:
+            take = next(self._steps)
+            while not self._token.is_set():
+                # This thread is the only producer, so the queue can't fill up between the check and the put.
+                if not self._queue.full():
+                    self._queue.put_nowait(take(False))
+
+                # Waiting on the token ends the delay as soon as the worker is cancelled.
+                if self._token.wait(self._delay):
+                    break
+                take = next(self._steps)
+        except StopIteration as stop:
+            self._finished = True
+            take = stop.value if stop.value is not None else take
+        except Exception as error:
+            self._error = error
+            return
+
+        # A snapshot may have been posted while the worker was being cancelled, it's dropped once nothing else is posted.
+        if self._discarded:
+            self.latest()
+        elif take is not None:
+            self.__post(take(True))
+
+    def __post(self, snapshot):
+        """Puts a snapshot into the queue, dropping the stale snapshots in its way."""
+        while True:
+            try:
+                self._queue.put_nowait(snapshot)
+                return
+            except queue.Full:
+                self.latest()
@@ -1,17 +1,18 @@
 import tkinter as tk
 from tkinter import ttk
 from os import path, makedirs
-from matplotlib import pyplot as plt
 from PIL import Image, ImageTk
-from matplotlib.backends.backend_tkagg import (
-    FigureCanvasTkAgg, NavigationToolbar2Tk)
-import matplotlib.animation as anim
 import webbrowser
-import copy
+import numpy as np
 
+from ..ComplexSets.BufferPool import BufferPool
 from ..ComplexSets.ComplexSet import ComplexSet as Set
 from ..ComplexSets.CoordinateRange import CoordinateRange as crange 
+from ..ComplexSets.Renderers.ProgressiveRenderer import ProgressiveRenderer
+from ..ComplexSets.TileCache import TileCache
+from ..ComplexSets.TileStore import TileStore
 from .BaseGUI.BaseGUI import BaseGUI
+from .GenerationWorker import GenerationWorker
 
 class SetViewer(BaseGUI):
     """
@@ -20,12 +21,15 @@ class SetViewer(BaseGUI):
     Args:
         setlist (list): List of complex set objects.
         title (str): Title of the window.
-        colormap (str): Default colormap to apply to the GUI figure.
+        colormap (str): Default colormap to apply to the canvas.
         iterations (int): Max number of iterations to simulate.
         dimensions (tuple) (int, int): used to initialize respective width and height of the root widget.
         max_interval_delay (int): Max delay between frame animation.
         julia_constant (complex) (real, imag):  specific constant to use for simulating the Julia set.
         maintain_ratio (bool): Whether to attempt maintaining the aspect ratio when initialized.
+        progressive (bool): Whether to generate sets from a coarse to the full resolution when the animation is disabled.
+        tile_cache_budget (int): Byte budget of the tile cache, 0 disables the cache.
+        tile_store (dict, optional): The 'directory' and 'capacity' in bytes of the persistent tile store backing the cache, None disables the store.
     
     Attributes:
         sets (dict[str, complexset]): Dictionary of complex set objects, key being the name of the set.
@@ -34,17 +38,28 @@ class SetViewer(BaseGUI):
         picture (tkinter.widget): The picture subcomponent in the sidepanel.
         xy_frame (tkinter.widget): The xy frame subcomponent in the sidepanel.
         julia_constant (tkinter.widget): The Julia constant subcomponent in the sidepanel.
-        anim (function): The render function for the set generation animation.
-        after_id (str): The string ID to keep track of animation.
+        worker (generationworker): The worker running the latest generation, or None before the first generation.
+        preview (numpy.ndarray): Resampled divergence grid shown for pixels that are still being generated, if any, only used by the workers.
+        renderer (progressiverenderer): The renderer for progressive generation, or None if it is disabled.
+        cache (tilecache): The cache of generated tiles, or None if it is disabled.
+        pool (bufferpool): The buffer pool shared by every set, so the arrays of a discarded generation are reused by the next one.
+        PAN_STEP (int): How many pixels the arrow keys pan the view by.
+        DRAG_THRESHOLD (int): How many pixels the mouse must move while pressed for the click to pan instead of zoom.
+        POLL_INTERVAL (int): How often the worker is polled for snapshots to draw, in milliseconds.
 
     """
 
-    def __init_sets(self, setlist:list, dimensions:tuple):
-        """Initialization for each set in the set list by generating their respective templates.
+    PAN_STEP = 50
+    DRAG_THRESHOLD = 4
+    POLL_INTERVAL = 15
+
+    def __init_sets(self, setlist:list):
+        """Initialization for each set in the set list, sharing the buffer pool of the viewer.
+
+        Templates are generated on first use, see ComplexSet.template.
         
         Args:
             setlist (list): List of complex set objects.
-            dimensions (tuple) (int, int): Used to generate a template with respect to the canvas' (width, height).
         
         Raises:
             IndexError: If the set list is empty.
@@ -57,59 +72,156 @@ class SetViewer(BaseGUI):
 
         for s in setlist:
             if s.name not in sets:
-                if s.template is None:
-                    s.generate_template(dimensions[0], dimensions[1])
-
+                s.pool = self.pool
                 sets[s.name] = s
         
         self.sets = sets
-        self.selected_set = setlist[0]
+        self.selected_set = setlist[0].clone()
     
-    def __generate(self):
-        """Complex set generation helper function."""
-        try:
-            next(self.selected_set)
-            self.update_progress()
-            self.after_id = self.root.after(self.simulation.delay.val, self.__generate)
-        except StopIteration:
-            self.stop_generation()
-            self.canvas.update(self.selected_set.data['divergence'], cmap=self.picture.colormaps.val, redraw=True)
+    def __steps(self, complex_set:Set, prepare=None, passes=None, animate=False):
+        """Runs a generation on the worker thread, one iteration or progressive pass per step, see GenerationWorker.
+
+        Args:
+            complex_set (complexset): The set to generate.
+            prepare (function, optional): Sets up the generation before the first step, once every earlier generation has stopped.
+            passes (generator, optional): The progressive passes to continue, None to iterate the set itself.
+            animate (bool, optional): Whether every iteration is drawn, otherwise only the final grid is.
+
+        Yields:
+            function(bool): Takes the (progress, divergence grid) snapshot of a step, the grid being None if it isn't drawn.
+
+        Returns:
+            function(bool): Takes the snapshot of the finished set.
+
+        """
+        if prepare is not None:
+            prepare()
+
+        # Show the resampled previous view right away, while the missing pixels are generated.
+        yield lambda final: (0, self.divergence(complex_set, self.preview) if final or self.preview is not None else None)
+
+        if passes is not None:
+            while True:
+                try:
+                    step, preview = next(passes)
+                except StopIteration as stop:
+                    # An exact renderer hands its final set over to the set, which keeps it extendable, see ComplexSet.resume().
+                    # Guesses kept by an inexact renderer are never continued, reused or cached, see ComplexSet.can_reuse().
+                    if not self.renderer.exact:
+                        complex_set.release()
+                        complex_set.data = stop.value
+                    break
+
+                progress = (self.renderer.steps.index(step) + 1) / len(self.renderer.steps) * 100
+                yield lambda final: (progress, preview)
+        else:
+            # Stepping stops at the maximum iterations like every other generation, so the cached tiles agree.
+            while complex_set.step():
+                progress = complex_set.iteration / complex_set.max_iterations * 100
+                yield lambda final: (progress, self.divergence(complex_set, self.preview) if animate or final else None)
+
+        self.preview = None
+        self.__store(complex_set)
+        return lambda final: (100, self.divergence(complex_set))
+
+    def __prepare(self, complex_set:Set, previous:Set, discarded:Set):
+        """Seeds a new set with the pixels it shares with the previous set and the tile cache, on the worker thread.
+
+        Args:
+            complex_set (complexset): The new set.
+            previous (complexset): A previously generated set to reuse pixels from, or None.
+            discarded (complexset): The set being replaced.
+
+        """
+        self.preview = complex_set.reuse(previous) if previous is not None else None
+        if self.cache is not None:
+            self.cache.seed(complex_set)
+        iter(complex_set)
+
+        # Anything worth keeping from the previous generation has been copied by now, so its arrays go back to the pool.
+        discarded.release()
+
+    def __extend(self, complex_set:Set, iterations:int):
+        """Raises the maximum iterations of a set to continue its generation, on the worker thread.
+
+        Args:
+            complex_set (complexset): The set to extend.
+            iterations (int): The new maximum number of iterations.
+
+        """
+        complex_set.extend(iterations)
+        self.preview = None
+
+    def __poll(self, worker:GenerationWorker, animate:bool):
+        """Draws the newest snapshot of a worker, polling it again until it stops.
+
+        Args:
+            worker (generationworker): The worker of the current generation.
+            animate (bool): Whether the delay of the animation applies to the worker.
+
+        Raises:
+            exception: The exception raised by the generation, if any.
+
+        """
+        # A newer generation has replaced the worker, its snapshots are stale.
+        if worker is not self.worker:
+            return
+
+        if animate:
+            worker.delay = self.simulation.delay.val / 1000
+
+        snapshot = worker.latest()
+        if snapshot is not None:
+            progress, divergence = snapshot
+            if divergence is not None:
+                self.canvas.draw(divergence)
+            self.update_progress(progress)
+
+        if worker.is_alive() or not worker.queue.empty():
+            self.root.after(SetViewer.POLL_INTERVAL, lambda: self.__poll(worker, animate))
+            return
+
+        if worker.error is not None:
+            raise worker.error
+
+        if worker.finished:
+            self._passes = None
+            self.update_progress(0)
             self.simulation.generation.pause['state'] = 'disabled'
             self.simulation.generation.toggle_pause(continue_=False)
 
-    def __render(self):
-        """Callback for every frame in animation."""
-        if self.picture.animation.val:
-            self.anim.event_source.interval = self.simulation.delay.val
-            
-            try:
-                next(self.selected_set)
-                self.canvas.update(self.selected_set.data['divergence'], cmap=self.picture.colormaps.val)
-                self.update_progress()
-            except StopIteration:
-                self.canvas.update(self.selected_set.data['divergence'], cmap=self.picture.colormaps.val, redraw=True)
-                self.stop_generation()
-                self.simulation.generation.pause['state'] = 'disabled'
-                self.simulation.generation.toggle_pause(continue_=False)
-        else:
-            self.anim.event_source.stop()
+    def __store(self, complex_set:Set):
+        """Caches the tiles of a finished set, if the tile cache is enabled and every pixel of the set is exact.
+
+        Args:
+            complex_set (complexset): The finished set.
+
+        """
+        if self.cache is not None and complex_set.iteration >= complex_set.max_iterations:
+            self.cache.store(complex_set, complex_set.data)
 
     def __init__(self, **kwargs):
-        self.__init_sets(kwargs['setlist'], kwargs['dimensions'])
+        self.pool = BufferPool()
+        self.__init_sets(kwargs['setlist'])
 
         kwargs['coord_range'] = self.selected_set.coord_range
         kwargs['sets'] = self.sets
         super().__init__(**kwargs)
 
-        self._selected_set = None
         self.simulation = self.sidepanel.components['simulation']
         self.picture = self.sidepanel.components['picture']
         self.xy_frame = self.sidepanel.components['xy_range']
         self.julia_constant = self.sidepanel.components['julia_constant']
 
         self.maintain_ratio = kwargs['maintain_ratio']
-        self.anim = None
-        self.after_id = None
+        self.renderer = ProgressiveRenderer() if kwargs['progressive'] else None
+        store = kwargs.get('tile_store')
+        store = TileStore(store['directory'], store['capacity']) if store else None
+        self.cache = TileCache(kwargs['tile_cache_budget'], tile_store=store) if kwargs['tile_cache_budget'] > 0 else None
+        self._passes = None
+        self.worker = None
+        self.preview = None
+        self._press = None
 
     @property
     def selected_set(self) -> Set:
@@ -118,44 +230,60 @@ class SetViewer(BaseGUI):
     
     @selected_set.setter
     def selected_set(self, set_:Set):
-        self._selected_set = iter(copy.deepcopy(set_))
+        # The set is iterated in place by the worker, so pass a clone rather than one of the sets in self.sets.
+        self._selected_set = set_
     
-    def stop_generation(self, clear=True):
+    def stop_generation(self, clear=True, discard=False):
         """Stop the iterative generation of the current set being generated.
+
+        The worker finishes its current step in the background, the state it stops at is still drawn unless it's discarded.
         
         Args:
             clear (bool, optional): Whether to clear the progress bar after stopping the generation.
+            discard (bool, optional): Whether the worker posts no more snapshots, ex: when a new generation replaces it.
         
         """
-        # Check if a set is currently being generated
-        if self.after_id is not None:
-             self.root.after_cancel(self.after_id)
-        
-        # Stop animation on button click
-        if self.anim is not None:
-            self.anim.event_source.stop()
+        if self.worker is not None:
+            self.worker.cancel(discard)
 
-        self.update_progress(clear=clear)
+        if clear:
+            self.update_progress(0)
 
-    def update_progress(self, clear=False):
-        """Update the progress bar value.
+    @staticmethod
+    def divergence(complex_set:Set, preview=None):
+        """Copies the divergence grid of a set to draw, filled in with the preview for pixels that are still being generated.
 
         Args:
-            clear (bool, optional): Whether to clear the progress bar after stopping the generation.
+            complex_set (complexset): The set.
+            preview (numpy.ndarray, optional): Resampled divergence grid of the pixels that are still being generated.
+
+        Returns:
+            numpy.ndarray: A copy of the divergence grid, safe to draw while the set keeps generating.
         
         """
-        if clear:
-            self.simulation.progress_bar['value'] = 0
-        else:
-            self.simulation.progress_bar['value'] = (self.selected_set.iteration / self.selected_set.max_iterations) * 100
+        divergence = complex_set.data['divergence']
+        if preview is None:
+            return divergence.copy()
+        
+        return np.where(complex_set.mask, preview, divergence)
+
+    def update_progress(self, value:float):
+        """Update the progress bar value.
 
-        self.root.update_idletasks()
+        Args:
+            value (float): The progress of the generation, in percent.
+        
+        """
+        self.simulation.progress_bar['value'] = value
             
-    def generate(self, reset=True):
+    def generate(self, reset=True, previous=None):
         """Main initial generation function for generating complex sets.
+
+        The generation runs on a worker thread, while the GUI polls it for snapshots to draw, see GenerationWorker.
         
         Args:
             reset (bool, optional): Whether to reset the progress already generated, ex: set to False if generation is paused.
+            previous (complexset, optional): A previously generated set to reuse pixels from, ex: the set before zooming.
         
         Returns:
             coordinaterange.exception: If there was an error setting the coordinate range of the set.
@@ -164,7 +292,7 @@ class SetViewer(BaseGUI):
         """
         self.simulation.generation.pause['state'] = 'active'
         self.simulation.generation.toggle_pause(continue_=False)
-        self.stop_generation()
+        self.stop_generation(discard=True)
 
         selected_set = self.sets[self.simulation.setlist.val]
         coords = self.xy_frame.coord_range
@@ -176,19 +304,40 @@ class SetViewer(BaseGUI):
         
         selected_set.coord_range = coords
         selected_set.max_iterations = maxIters
+
+        # Cached tiles only line up with views whose origin is snapped onto the grid of their spacing, which is kept.
+        if self.cache is not None and reset:
+            selected_set.coord_range = self.cache.snap(selected_set)
+            self.xy_frame.update_all(selected_set.coord_range)
         
+        # The sets are only touched by the worker from here on, which waits for the previous worker to stop first.
+        complex_set = self.selected_set
+        prepare = None
+
+        # Raising the iterations of the same view continues the previous generation instead of starting over.
+        if reset and previous is None and complex_set.can_extend(selected_set):
+            prepare = lambda: self.__extend(complex_set, maxIters)
+            self._passes = None
+            reset = False
+
         if reset:
-            new_set = copy.deepcopy(selected_set)
-            self.selected_set = new_set
+            discarded = complex_set
+            complex_set = selected_set.clone()
+            self.selected_set = complex_set
+            prepare = lambda: self.__prepare(complex_set, previous, discarded)
         
         # Check for animation enabled
-        if self.picture.animation.val:
-            delay = self.simulation.delay.val
-            self.anim = anim.FuncAnimation(self.canvas.figure, lambda frame: self.__render(), interval=delay, 
-                                            repeat=False, blit=False, cache_frame_data=False)
-            self.canvas.draw()
-        else:
-            self.__generate()
+        animate = self.picture.animation.val
+        if animate:
+            self._passes = None
+        elif self.renderer is not None and reset:
+            self._passes = self.renderer.passes(complex_set)
+
+        delay = self.simulation.delay.val / 1000 if animate else 0
+        steps = self.__steps(complex_set, prepare, self._passes, animate)
+        self.worker = GenerationWorker(steps, previous=self.worker, delay=delay)
+        self.worker.start()
+        self.__poll(self.worker, animate)
 
     def show(self):
         """Show the GUI."""
@@ -196,34 +345,83 @@ class SetViewer(BaseGUI):
 
     def canvas_onclick(self, widget:tk.Widget, event):
         """Handler for clicking the canvas. Current implementation is left click for zoom in and right click for zoom out.
+
+        Left clicks only zoom in once the button is released, so that dragging the canvas pans the view instead.
         
         Args:
             widget (tkinter.widget): The widget that was clicked (canvas).
-            event (matplotlib.backend_bases.mouseevent): Event data regarding where on the canvas was clicked.
+            event (canvasevent): Event data regarding where on the canvas was clicked.
         
         """
 
         # Set must be generated first.
-        if self.selected_set == None:
+        if self.worker is None:
+            return
+
+        if event.button == 'left':
+            self._press = (event.x, event.y)
+        elif event.button == 'right':
+            self.zoom(event.x, event.y, 3)
+        else:
+            self.zoom(event.x, event.y, 1)
+
+    def canvas_onrelease(self, widget:tk.Widget, event):
+        """Handler for releasing a click on the canvas. Zooms in if the mouse stayed in place, otherwise pans the view along with the drag.
+        
+        Args:
+            widget (tkinter.widget): The widget that was released (canvas).
+            event (canvasevent): Event data regarding where on the canvas the click was released.
+        
+        """
+        if self._press is None or event.button != 'left':
             return
         
-        # Zoom multiplier
-        m = 1
+        x, y = self._press
+        self._press = None
+        dx = round(event.x - x)
+        dy = round(event.y - y)
 
-        btn_pressed = str(event.button)
-        if btn_pressed == 'MouseButton.LEFT':
-            m = 0.25
-        elif btn_pressed == 'MouseButton.RIGHT':
-            m = 3
+        if max(abs(dx), abs(dy)) < SetViewer.DRAG_THRESHOLD:
+            self.zoom(x, y, 0.25)
+        else:
+            # The view moves against the drag, so the picture follows the mouse.
+            self.pan(-dx, -dy)
+
+    def arrow_key_pressed(self, event):
+        """Handler for pressing an arrow key, pans the view by PAN_STEP pixels in the direction of the arrow.
+        
+        Args:
+            event (tkinter.event): Event data regarding which arrow key was pressed.
+        
+        """
+        # Arrow keys move the cursor or the slider of input widgets instead.
+        if isinstance(event.widget, (tk.Entry, tk.Scale)):
+            return
+        
+        directions = {'Left': (-1, 0), 'Right': (1, 0), 'Up': (0, 1), 'Down': (0, -1)}
+        if event.keysym in directions:
+            columns, rows = directions[event.keysym]
+            self.pan(columns * SetViewer.PAN_STEP, rows * SetViewer.PAN_STEP)
+
+    def zoom(self, x:float, y:float, m:float):
+        """Zooms the view around a point of the canvas.
+
+        The new view is snapped to the grid of the current one, so the pixels they share are reused instead of generated again.
+
+        Args:
+            x (float): The x position on the canvas to center the new view on, in pixels.
+            y (float): The y position on the canvas to center the new view on, in pixels.
+            m (float): Zoom multiplier of the span of the view, below 1 zooms in and above 1 zooms out.
         
+        """
         # Some zoom math
         x_range = self.selected_set.coord_range.x_range
         y_range = self.selected_set.coord_range.y_range
         
         x_len = abs(x_range[1] - x_range[0])
         y_len = abs(y_range[1] - y_range[0])
-        rel_x = x_range[0] + (x_len) * (event.x / self.canvas.width)
-        rel_y = y_range[0] + (y_len) * (event.y / self.canvas.height)
+        rel_x = x_range[0] + (x_len) * (x / self.canvas.width)
+        rel_y = y_range[0] + (y_len) * (y / self.canvas.height)
         pad_x = (m * x_len)
         pad_y = (m * y_len)
 
@@ -235,9 +433,26 @@ class SetViewer(BaseGUI):
         pad_x /= 2
         pad_y /= 2
 
-        new_crange = crange(rel_x - pad_x, rel_x + pad_x, rel_y - pad_y, rel_y + pad_y)
+        previous = self.selected_set
+        new_crange = previous.snap(crange(rel_x - pad_x, rel_x + pad_x, rel_y - pad_y, rel_y + pad_y))
         self.xy_frame.update_all(new_crange)
-        self.generate()
+        self.generate(previous=previous)
+
+    def pan(self, columns:int, rows:int):
+        """Moves the view by a whole number of pixels, only generating the newly exposed rows and columns.
+
+        Args:
+            columns (int): How many pixels to move the view right by, negative to move it left.
+            rows (int): How many pixels to move the view up by, negative to move it down.
+        
+        """
+        # Set must be generated first.
+        if self.worker is None:
+            return
+        
+        previous = self.selected_set
+        self.xy_frame.update_all(previous.offset(columns, rows))
+        self.generate(previous=previous)
 
     def pause_btn_clicked(self, widget:tk.Button):
         """Handler for clicking the pause button.
@@ -246,14 +461,9 @@ class SetViewer(BaseGUI):
             widget (tkinter.button): The button that was clicked (pause button).
         
         """
-        clear = (self.selected_set.iteration >= self.selected_set.max_iterations)
-
-        self.stop_generation(clear=clear)
+        # The state the worker stops at is drawn once its current step is finished.
+        self.stop_generation(clear=False)
         self.simulation.generation.toggle_pause(continue_=True)
-        self.canvas.update(self.selected_set.data['divergence'], cmap=self.picture.colormaps.val)
-        
-        if not self.picture.animation.val:
-            self.canvas.draw()
     
     def continue_btn_clicked(self, widget:tk.Button):
         """Handler for clicking the continue button.
@@ -271,8 +481,8 @@ class SetViewer(BaseGUI):
             widget (tkinter.widget): The colormap container.
         
         """
-        if self.selected_set.data is not None:
-            self.canvas.update(self.selected_set.data['divergence'], cmap=widget.val, redraw=True)
+        # The canvas keeps the scaled grid it shows, so only its lookup table is swapped.
+        self.canvas.colormap = widget.val
 
     def animation_checkbox_clicked(self, widget:tk.Widget):
         """Handler for when the animation checkbox has been ticked or unticked.
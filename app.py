@@ -18,6 +18,8 @@ def init():
         # Set config
         set_template = config['defaults']['set']
         max_iterations = set_template['maxIterations']
+        precision = set_template['precision']
+        compact = set_template['compact']
         xmin = float(set_template['xRange']['min'])
         xmax = float(set_template['xRange']['max'])
         ymin = float(set_template['yRange']['min'])
@@ -31,12 +33,14 @@ def init():
         
         julia_constant = set_template['julia_constant']['real'] + set_template['julia_constant']['imag'] * 1j
         crange = CoordinateRange(xmin, xmax, ymin, ymax)
-        mset = Mandelbrot(iterations=max_iterations, coord_range=crange, xy_vals=(width, height))
-        jset = Julia(iterations=max_iterations, coord_range=crange, constant=julia_constant, xy_vals=(width, height))
+        mset = Mandelbrot(iterations=max_iterations, coord_range=crange, xy_vals=(width, height), compact=compact, precision=precision)
+        jset = Julia(iterations=max_iterations, coord_range=crange, constant=julia_constant, xy_vals=(width, height), compact=compact, precision=precision)
         sets = [mset, jset]
 
         viewer = SetViewer(setlist=sets, title=title, colormap=colormap, iterations=max_iterations, julia_constant=julia_constant, 
-                            dimensions=(width, height), max_interval_delay=max_anim_frame_delay, maintain_ratio=viewer['maintain_aspect_ratio'])
+                            dimensions=(width, height), max_interval_delay=max_anim_frame_delay, maintain_ratio=viewer['maintain_aspect_ratio'],
+                            progressive=viewer['progressive'], tile_cache_budget=viewer['tile_cache_budget'],
+                            tile_store=viewer.get('tile_store'))
         viewer.show()
     
     except:
@@ -0,0 +1,42 @@
+"""Compares the chunked, thread-parallel renderer against full grid stepping.
+
+Usage:
+    python -m benchmarks.chunked_kernel [--size 650] [--iterations 1000] [--threads N] [--chunk-size BYTES]
+
+"""
+import argparse
+import time
+import numpy as np
+
+from Modules.ComplexSets import CoordinateRange, Mandelbrot, ChunkedRenderer
+
+def timed(func):
+    """Runs a function once and returns its result with the elapsed time in seconds."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the chunked renderer against full grid stepping.')
+    parser.add_argument('--size', type=int, default=650, help='Width and height of the grid in pixels.')
+    parser.add_argument('--iterations', type=int, default=1000, help='Maximum number of iterations.')
+    parser.add_argument('--threads', type=int, default=None, help='Number of threads, defaults to the number of CPUs.')
+    parser.add_argument('--chunk-size', type=int, default=ChunkedRenderer.DEFAULT_CHUNK_SIZE, help='Target block size in bytes.')
+    args = parser.parse_args()
+
+    crange = CoordinateRange(-2.5, 1, -1.75, 1.75)
+    xy_vals = (args.size, args.size)
+    renderer = ChunkedRenderer(threads=args.threads, chunk_size=args.chunk_size)
+
+    full, full_time = timed(lambda: Mandelbrot(args.iterations, crange, xy_vals).generate_set())
+    chunked, chunked_time = timed(lambda: renderer.render(Mandelbrot(args.iterations, crange, xy_vals)))
+    compact, compact_time = timed(lambda: renderer.render(Mandelbrot(args.iterations, crange, xy_vals, compact=True)))
+
+    print('Full grid:          %8.3fs' % full_time)
+    print('Chunked:            %8.3fs (%.2fx)' % (chunked_time, full_time / chunked_time))
+    print('Chunked + compact:  %8.3fs (%.2fx)' % (compact_time, full_time / compact_time))
+    print('Identical output:   %s' % (np.array_equal(full['divergence'], chunked['divergence'])
+                                        and np.array_equal(full['divergence'], compact['divergence'])))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""Times the set kernels and the viewer's drawing pipeline, and compares runs against a saved baseline.
+
+Usage:
+    python -m benchmarks.suite run [--sizes 650 1080p 4k] [--iterations 250 1000] [--repeat 3] [--output results.json]
+    python -m benchmarks.suite run --groups generate --sets mandelbrot --views seahorse --sizes 650
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.1]
+
+Every benchmark is named group/.../parameters, ex: generate/mandelbrot/seahorse/1080p/1000, and reports the fastest
+and the median of its runs after a warmup run. Results are written as JSON along with the machine they ran on.
+Compare matches benchmarks by name and flags those whose fastest run slowed down by more than the threshold, exiting
+with status 1 if any did, so it can gate a change. The full matrix takes a while at 4K, narrow it down with the options
+of run while iterating on a change.
+
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+
+from Modules.ComplexSets import BatchRenderer, Colorizer, Template
+
+SIZES = {'650': (650, 650), '1080p': (1920, 1080), '4k': (3840, 2160)}
+ITERATIONS = (250, 1000)
+
+# Canonical views as a center and the width of the real axis, the Julia views use the constant of the Douady rabbit,
+# whose set has an interior, unlike the default constant of the viewer. The Mandelbrot interior view crosses the period-3
+# bulb, which the cardioid and bulb check doesn't skip, so its interior points are iterated up to the maximum.
+JULIA_CONSTANT = {'real': -0.123, 'imag': 0.745}
+VIEWS = {
+    'mandelbrot': {
+        'full': (-0.75, 0.0, 3.5),
+        'seahorse': (-0.7453, 0.1127, 0.01),
+        'interior': (-0.12, 0.76, 0.3),
+        'exterior': (1.0, 1.0, 1.5)
+    },
+    'julia': {
+        'full': (0.0, 0.0, 3.5),
+        'boundary': (-0.27, 0.53, 0.05),
+        'interior': (0.0, 0.0, 0.2),
+        'exterior': (1.5, 1.5, 1.0)
+    }
+}
+GROUPS = ('generate', 'template', 'colormap')
+
+def measure(func, repeat:int, warmup=1, setup=None) -> list:
+    """Times a function over several runs.
+
+    Args:
+        func (function): The function to time, given the result of setup if there is one.
+        repeat (int): Number of timed runs.
+        warmup (int, optional): Number of untimed runs first, so caches and buffer pools are warm.
+        setup (function, optional): Prepares the argument of every run, outside of the timing.
+
+    Returns:
+        list[float]: The time of every timed run in seconds.
+
+    """
+    times = []
+    for run in range(warmup + repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(arg) if setup is not None else func()
+        elapsed = time.perf_counter() - start
+        if run >= warmup:
+            times.append(elapsed)
+    return times
+
+def uncached(spec:dict):
+    """Builds the set of a job after forgetting the shared templates, so generating its template isn't a cache hit."""
+    Template.clear()
+    return BatchRenderer.build(spec)
+
+def job(name:str, view:str, size:str, iterations:int) -> dict:
+    """Describes a benchmark view as a BatchRenderer job."""
+    real, imag, scale = VIEWS[name][view]
+    width, height = SIZES[size]
+    return {**BatchRenderer.DEFAULTS, 'set': name, 'center': {'real': real, 'imag': imag}, 'scale': scale,
+            'dimensions': {'width': width, 'height': height}, 'maxIterations': iterations, 'julia_constant': JULIA_CONSTANT}
+
+def machine() -> dict:
+    """Describes the machine and the code the benchmarks ran on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': '%s %s' % (platform.python_implementation(), platform.python_version()),
+        'numpy': np.__version__,
+        'commit': commit,
+        'dirty': dirty,
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+    }
+
+def cases(args) -> list:
+    """Lists the selected benchmarks.
+
+    Returns:
+        list[tuple] (str, dict, function): The name, parameters and function(repeat, warmup) running every benchmark.
+
+    """
+    selected = []
+    if 'generate' in args.groups:
+        for name in args.sets:
+            for view in VIEWS[name]:
+                if args.views is not None and view not in args.views:
+                    continue
+                for size in args.sizes:
+                    for iterations in args.iterations:
+                        spec = job(name, view, size, iterations)
+                        run = lambda repeat, warmup, spec=spec: measure(lambda complex_set: complex_set.generate_set(), repeat, warmup,
+                                                                      setup=lambda: BatchRenderer.build(spec))
+                        params = {'set': name, 'view': view, 'size': size, 'iterations': iterations}
+                        selected.append(('generate/%s/%s/%s/%d' % (name, view, size, iterations), params, run))
+
+    if 'template' in args.groups:
+        for name in args.sets:
+            for size in args.sizes:
+                spec = job(name, 'full', size, ITERATIONS[0])
+                width, height = SIZES[size]
+                run = lambda repeat, warmup, spec=spec, width=width, height=height: measure(
+                    lambda complex_set: complex_set.generate_template(width, height), repeat, warmup, setup=lambda: uncached(spec))
+                selected.append(('template/%s/%s' % (name, size), {'set': name, 'size': size}, run))
+
+    if 'colormap' in args.groups:
+        colorizer = Colorizer.shared()
+        for size in args.sizes:
+            width, height = SIZES[size]
+
+            # A fixed seed keeps the grid the same across runs and machines.
+            count = np.random.default_rng(0).integers(0, max(ITERATIONS), (height, width), dtype=np.uint16)
+            out = np.empty((height, width, 3), dtype=np.uint8)
+            indices = colorizer.indices(count)[::-1]
+
+            # Colorizing is every frame of the canvas, recoloring is a colormap change.
+            colorize = lambda repeat, warmup, count=count, out=out: measure(lambda: colorizer.colorize(count, out), repeat, warmup)
+            recolor = lambda repeat, warmup, indices=indices, out=out: measure(lambda: colorizer.apply(indices, out), repeat, warmup)
+            selected.append(('colormap/colorize/%s' % size, {'size': size}, colorize))
+            selected.append(('colormap/recolor/%s' % size, {'size': size}, recolor))
+
+    return selected
+
+def run(args):
+    """Runs the selected benchmarks and writes their results."""
+    results = []
+    for name, params, func in cases(args):
+        times = func(args.repeat, args.warmup)
+        results.append({'name': name, 'params': params, 'min': min(times), 'median': statistics.median(times), 'runs': times})
+        print('%-48s %10.6fs %10.6fs' % (name, results[-1]['min'], results[-1]['median']), flush=True)
+
+    report = {'machine': machine(), 'settings': {'repeat': args.repeat, 'warmup': args.warmup}, 'results': results}
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('Results written to %s' % args.output)
+
+def compare(args) -> int:
+    """Compares two result files and flags the benchmarks that got slower.
+
+    Returns:
+        int: 1 if any benchmark regressed, otherwise 0.
+
+    """
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    with open(args.results, 'r') as f:
+        current = json.load(f)
+
+    if baseline['machine'].get('platform') != current['machine'].get('platform') or baseline['machine'].get('cpus') != current['machine'].get('cpus'):
+        print('Warning: the results come from different machines, timings may not be comparable.')
+
+    before = {result['name']: result for result in baseline['results']}
+    regressions = 0
+    for result in current['results']:
+        old = before.get(result['name'])
+        if old is None:
+            print('%-48s %11s %10.6fs   new' % (result['name'], '', result['min']))
+            continue
+
+        # Timings below the noise floor are too short to flag, whatever their ratio.
+        ratio = result['min'] / old['min'] if old['min'] > 0 else 1.0
+        delta = result['min'] - old['min']
+        status = ''
+        if ratio > 1 + args.threshold and delta > args.min_delta:
+            status = 'REGRESSION'
+            regressions += 1
+        elif ratio < 1 - args.threshold and -delta > args.min_delta:
+            status = 'faster'
+        print('%-48s %10.6fs %10.6fs %6.2fx %s' % (result['name'], old['min'], result['min'], ratio, status))
+
+    print('%d regression(s) beyond %.0f%%.' % (regressions, args.threshold * 100))
+    return 1 if regressions else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description='Benchmark the set kernels and the viewer pipeline.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_run = commands.add_parser('run', help='Run the benchmarks and write their results.')
+    parser_run.add_argument('--groups', nargs='+', choices=GROUPS, default=list(GROUPS), help='Benchmark groups to run.')
+    parser_run.add_argument('--sets', nargs='+', choices=tuple(VIEWS), default=list(VIEWS), help='Sets to generate.')
+    parser_run.add_argument('--views', nargs='+', default=None, help='Views to generate, defaults to every view of every set.')
+    parser_run.add_argument('--sizes', nargs='+', choices=tuple(SIZES), default=list(SIZES), help='Resolutions.')
+    parser_run.add_argument('--iterations', nargs='+', type=int, default=list(ITERATIONS), help='Maximum numbers of iterations.')
+    parser_run.add_argument('--repeat', type=int, default=3, help='Number of timed runs of every benchmark.')
+    parser_run.add_argument('--warmup', type=int, default=1, help='Number of untimed runs before the timed runs.')
+    parser_run.add_argument('--output', help='JSON file to write the results to.')
+    parser_run.set_defaults(func=run)
+
+    parser_compare = commands.add_parser('compare', help='Compare results against a baseline and flag regressions.')
+    parser_compare.add_argument('baseline', help='JSON results of the baseline.')
+    parser_compare.add_argument('results', help='JSON results to check.')
+    parser_compare.add_argument('--threshold', type=float, default=0.1, help='Relative slowdown of the fastest run that counts as a regression.')
+    parser_compare.add_argument('--min-delta', type=float, default=0.001, help='Slowdowns shorter than this many seconds are ignored as noise.')
+    parser_compare.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import numpy as np
+
+from Modules.ComplexSets import AnimationRenderer, CoordinateRange
+from Modules.ComplexSets.Sets import Mandelbrot
+
+KEYFRAMES = [
+    {'frame': 0, 'center': {'real': -0.75, 'imag': 0.1}, 'scale': 0.5},
+    {'frame': 5, 'center': {'real': -0.70, 'imag': 0.1}, 'scale': 0.5},
+    {'frame': 7, 'center': {'real': -0.70, 'imag': 0.1}, 'scale': 0.25}
+]
+
+def test_frames_match_generate_set():
+    complex_set = Mandelbrot(150, CoordinateRange(-2, 1, -1.5, 1.5), (64, 48))
+
+    with AnimationRenderer(complex_set, KEYFRAMES, workers=1) as animation:
+        frames = [data.count.copy() for data in animation.frames()]
+
+        # A single worker always reuses the previous frame, so every frame lies on its grid.
+        previous = None
+        for frame, count in enumerate(frames):
+            expected = complex_set.view(animation.view(frame), complex_set.xy_vals)
+            if previous is not None:
+                expected.coord_range = previous.snap(expected.coord_range)
+            expected.generate_set()
+            np.testing.assert_array_equal(count, expected.data.count)
+            previous = expected
+
+    assert len(frames) == animation.frame_count
+
+def test_numbered_frames_are_written(tmp_path):
+    complex_set = Mandelbrot(50, CoordinateRange(-2, 1, -1.5, 1.5), (32, 24))
+    with AnimationRenderer(complex_set, KEYFRAMES, workers=2) as animation:
+        animation.save(str(tmp_path / '%03d.png'))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['%03d.png' % frame for frame in range(8)]
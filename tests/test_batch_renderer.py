@@ -0,0 +1,75 @@
+from decimal import Decimal
+import argparse
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import BatchRenderer, TileCache, TileStore, __main__
+from Modules.ComplexSets.Renderers import ChunkedRenderer
+
+JOB = {**BatchRenderer.DEFAULTS, 'xRange': {'min': -2.1, 'max': 0.7}, 'yRange': {'min': -1.2, 'max': 1.1},
+       'dimensions': {'width': 200, 'height': 150}, 'maxIterations': 200}
+
+class CountingRenderer(ChunkedRenderer):
+    """Chunked renderer counting how many sets it renders."""
+    def __init__(self):
+        super().__init__(threads=2)
+        self.rendered = 0
+
+    def render(self, complex_set):
+        self.rendered += 1
+        return super().render(complex_set)
+
+def expected(job):
+    return BatchRenderer.build(job).generate_set().count
+
+@pytest.mark.parametrize('job', [JOB, {**JOB, 'set': 'Julia', 'xRange': {'min': -1.5, 'max': 1.5}}])
+def test_tile_store_keeps_the_requested_view(tmp_path, job):
+    renderer = CountingRenderer()
+    batch = BatchRenderer(renderer, TileCache(tile_store=TileStore(str(tmp_path))))
+    complex_set = BatchRenderer.build(job)
+    coord_range = complex_set.coord_range
+
+    np.testing.assert_array_equal(batch.render(complex_set).count, expected(job))
+    assert complex_set.coord_range is coord_range
+    assert renderer.rendered == 1
+
+def test_views_on_a_grid_are_seeded_from_the_cache(tmp_path):
+    cache = TileCache(tile_size=32, tile_store=TileStore(str(tmp_path)))
+    complex_set = BatchRenderer.build(JOB)
+    complex_set.coord_range = cache.snap(complex_set)
+    reference = complex_set.clone().generate_set().count
+
+    for _ in range(2):
+        data = BatchRenderer(CountingRenderer(), cache).render(complex_set.clone())
+        np.testing.assert_array_equal(data.count, reference)
+    assert cache.hits > 0
+
+def test_deep_jobs_keep_scales_below_decimal_precision(tmp_path):
+    job = {**JOB, 'set': 'Deep Mandelbrot', 'center': {'real': '-0.743643887037151', 'imag': '0.131825904205330'},
+           'scale': '1e-30', 'dimensions': {'width': 40, 'height': 30}, 'maxIterations': 4000,
+           'output': str(tmp_path / 'deep.npy')}
+    coord_range = BatchRenderer.coord_range(job)
+    xmin, xmax = coord_range.x_range
+    ymin, ymax = coord_range.y_range
+    assert xmax - xmin == Decimal('1e-30')
+    assert ymax - ymin == Decimal('7.5e-31')
+
+    BatchRenderer().run(job)
+    count = np.load(job['output'])
+    assert count.shape == (30, 40)
+    assert count.min() > 0
+
+@pytest.mark.parametrize('threads', [1, 4])
+def test_jobs_reuse_warm_buffers_with_the_default_renderer(tmp_path, threads):
+    args = argparse.Namespace(threads=threads)
+    batch = BatchRenderer(__main__.RENDERERS['chunked'](args))
+    jobs = [{**JOB, 'xRange': {'min': -2.1 + 0.01 * i, 'max': 0.7}, 'output': str(tmp_path / ('%d.npy' % i))} for i in range(0, 4)]
+
+    misses = []
+    for path, job in zip(batch.run_all(jobs), jobs):
+        np.testing.assert_array_equal(np.load(path), expected(job))
+        misses.append(batch.pool.misses)
+
+    # Only the first job allocates, every later job draws the buffers the previous job released.
+    assert misses[1:] == misses[:1] * 3
+    assert batch.pool.hits >= 3 * misses[0]
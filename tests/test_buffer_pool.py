@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import BufferPool, CoordinateRange
+from Modules.ComplexSets.Renderers import MarianiSilverRenderer, ProgressiveRenderer
+from Modules.ComplexSets.Sets import Mandelbrot
+
+def test_released_arrays_are_reused():
+    pool = BufferPool()
+    array = pool.empty((4, 5), np.float64)
+    pool.release(array)
+    assert pool.nbytes == array.nbytes
+
+    assert pool.zeros((4, 5), np.float64) is array
+    assert not array.any()
+    assert (pool.hits, pool.misses, pool.nbytes) == (1, 1, 0)
+
+def test_arrays_are_keyed_by_shape_and_dtype():
+    pool = BufferPool()
+    array = np.empty((4, 5), np.float64)
+    pool.release(array)
+
+    assert pool.empty((5, 4), np.float64) is not array
+    assert pool.empty((4, 5), np.float32) is not array
+    assert pool.empty((4, 5), np.dtype('float64')) is array
+    assert pool.misses == 2
+
+def test_double_release_keeps_one_copy():
+    pool = BufferPool()
+    array = np.empty(8)
+    pool.release(array, array)
+    pool.release(array)
+
+    assert pool.nbytes == array.nbytes
+    assert pool.empty((8,), np.float64) is array
+    assert pool.empty((8,), np.float64) is not array
+
+def test_views_and_arrays_past_the_depth_are_left_alone():
+    pool = BufferPool(depth=2)
+    base = np.empty((4, 4))
+    pool.release(base[1:], base.T, None)
+    assert pool.nbytes == 0
+
+    pool.release(*[np.empty(3) for _ in range(0, 3)])
+    assert pool.nbytes == 2 * np.empty(3).nbytes
+
+def test_sets_reuse_released_buffers():
+    pool = BufferPool()
+    complex_set = Mandelbrot(50, CoordinateRange(-2.5, 1, -1.75, 1.75), (40, 30))
+    complex_set.pool = pool
+    expected = complex_set.clone().generate_set().count
+
+    data = complex_set.generate_set()
+    arrays = (data.re, data.im, data.count, complex_set.mask)
+    complex_set.release()
+    assert complex_set.data is None and complex_set.mask is None
+
+    # Releasing twice must not hand the same arrays out twice.
+    complex_set.release()
+    assert pool.nbytes == sum(array.nbytes for array in arrays)
+
+    cloned = complex_set.clone()
+    assert cloned.pool is pool
+    data = cloned.generate_set()
+    assert all(any(new is old for old in arrays) for new in (data.re, data.im, data.count, cloned.mask))
+    np.testing.assert_array_equal(data.count, expected)
+
+@pytest.mark.parametrize('renderer', [ProgressiveRenderer(), MarianiSilverRenderer()])
+def test_selected_generations_give_their_buffers_back(renderer):
+    complex_set = Mandelbrot(300, CoordinateRange(-2, 0.5, -1.25, 1.25), (120, 100))
+    expected = complex_set.clone().generate_set().count
+    for _ in range(0, 2):
+        renderer.render(complex_set)
+
+    # Once the pool is warm, renders only draw released buffers.
+    misses = complex_set.pool.misses
+    for _ in range(0, 3):
+        np.testing.assert_array_equal(renderer.render(complex_set).count, expected)
+    assert complex_set.pool.misses == misses
+    assert complex_set.pool.hits > 0
@@ -0,0 +1,41 @@
+from matplotlib import colors
+import matplotlib
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import Colorizer, CoordinateRange
+from Modules.ComplexSets.Sets import Mandelbrot
+
+ITERATIONS = 1000
+
+def matplotlib_colors(count:np.ndarray, colormap:str, vmin, vmax) -> np.ndarray:
+    """Colors a divergence grid with matplotlib itself, flipped so the highest imaginary part is the first row."""
+    norm = colors.Normalize(vmin=vmin, vmax=vmax)
+    return matplotlib.colormaps[colormap](norm(count), bytes=True)[::-1, :, :3]
+
+@pytest.fixture(scope='module')
+def count():
+    return Mandelbrot(ITERATIONS, CoordinateRange(-2.5, 1, -1.75, 1.75), (160, 120)).generate_set().count
+
+@pytest.mark.parametrize('colormap', ['coolwarm', 'viridis', 'magma'])
+def test_lookup_table_matches_matplotlib(count, colormap):
+    assert Colorizer.shared(colormap).lut.shape == (Colorizer.LUT_SIZE, 3)
+    expected = matplotlib_colors(count, colormap, count.min(), count.max())
+    np.testing.assert_array_equal(Colorizer.shared(colormap).colorize(count), expected)
+
+def test_fixed_limits_color_the_maximum_iterations_with_the_last_color(count):
+    # The viewer runs one iteration past the maximum, those counts are clipped like matplotlib clips them.
+    edge = count.astype(np.uint32)
+    edge[:4, :4] = ITERATIONS
+    edge[-4:, -4:] = ITERATIONS + 1
+    colorizer = Colorizer.shared('coolwarm')
+
+    image = colorizer.colorize(edge, limits=(0, ITERATIONS))
+    np.testing.assert_array_equal(image, matplotlib_colors(edge, 'coolwarm', 0, ITERATIONS))
+    np.testing.assert_array_equal(image[-4:, :4].reshape(-1, 3), np.tile(colorizer.lut[-1], (16, 1)))
+    np.testing.assert_array_equal(colorizer.indices(edge, limits=(0, ITERATIONS))[-4:, -4:], Colorizer.LUT_SIZE - 1)
+
+def test_uniform_grids_take_the_first_color():
+    colorizer = Colorizer.shared('coolwarm')
+    image = colorizer.colorize(np.full((3, 4), ITERATIONS, dtype=np.uint16))
+    np.testing.assert_array_equal(image, np.broadcast_to(colorizer.lut[0], (3, 4, 3)))
@@ -0,0 +1,87 @@
+from decimal import Decimal, localcontext
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import CoordinateRange
+from Modules.ComplexSets.Sets import DeepMandelbrot, Mandelbrot
+
+XY_VALS = (48, 40)
+
+def deep_view(center:complex, scale, xy_vals=XY_VALS) -> CoordinateRange:
+    """Coordinate range of a deep view, scale wide along the real axis with square pixels."""
+    with localcontext() as ctx:
+        ctx.prec = 30 - Decimal(scale).adjusted()
+        half_x = Decimal(scale) / 2
+        half_y = half_x * xy_vals[1] / xy_vals[0]
+        cx, cy = Decimal(repr(center.real)), Decimal(repr(center.imag))
+        return CoordinateRange(cx - half_x, cx + half_x, cy - half_y, cy + half_y)
+
+def test_shallow_view_matches_mandelbrot():
+    # Pixels 2**-11 apart, so the offsets from the reference point land on the grid of Mandelbrot exactly.
+    coord_range = CoordinateRange(-0.75, -0.703125, 0.078125, 0.1181640625)
+    expected = Mandelbrot(200, coord_range, (97, 83)).generate_set().count
+    np.testing.assert_array_equal(DeepMandelbrot(200, coord_range, (97, 83)).generate_set().count, expected)
+
+@pytest.mark.parametrize('scale, min_skipped', [('1e-20', 40), ('1e-300', 700)])
+def test_series_approximation_skips_iterations_and_keeps_counts(scale, min_skipped):
+    coord_range = deep_view(1j, scale)
+    direct = DeepMandelbrot(3000, coord_range, XY_VALS, series_terms=0)
+    expected = direct.generate_set().count
+    complex_set = DeepMandelbrot(3000, coord_range, XY_VALS)
+    count = complex_set.generate_set().count
+
+    assert direct.skipped_iterations == 0
+    assert min_skipped <= complex_set.skipped_iterations < count.min()
+    assert len(np.unique(count)) > 1
+    np.testing.assert_array_equal(count, expected)
+
+def test_numpy_coordinates_convert_to_decimals():
+    assert DeepMandelbrot.to_decimal(np.float64(0.1) * 3) == Decimal('0.30000000000000004')
+    assert DeepMandelbrot.to_decimal(np.float32(0.5)) == Decimal('0.5')
+
+    coord_range = CoordinateRange(*np.array([-0.76, -0.72, 0.08, 0.12]))
+    expected = DeepMandelbrot(200, CoordinateRange(-0.76, -0.72, 0.08, 0.12), (97, 83)).generate_set().count
+    np.testing.assert_array_equal(DeepMandelbrot(200, coord_range, (97, 83)).generate_set().count, expected)
+
+@pytest.mark.parametrize('bounds', [(1, 1, 0, 1), (0, 1, '1e-40', '1e-40'), (1, 0, 0, 1)])
+def test_empty_ranges_are_rejected(bounds):
+    with pytest.raises(ValueError):
+        DeepMandelbrot(100, CoordinateRange(*bounds), XY_VALS)
+
+def reference(coord_range:CoordinateRange, xy_vals:tuple, iterations:int) -> np.ndarray:
+    """Iterates every pixel of a view directly with decimals, precise enough for any zoom."""
+    (xmin, xmax), (ymin, ymax) = coord_range.x_range, coord_range.y_range
+    count = np.zeros((xy_vals[1], xy_vals[0]), dtype=np.uint32)
+
+    with localcontext() as ctx:
+        ctx.prec = 40 - (xmax - xmin).adjusted()
+        for row in range(0, xy_vals[1]):
+            cy = ymin + (ymax - ymin) * row / (xy_vals[1] - 1)
+            for col in range(0, xy_vals[0]):
+                cx = xmin + (xmax - xmin) * col / (xy_vals[0] - 1)
+                x, y = Decimal(0), Decimal(0)
+                for iteration in range(1, iterations + 1):
+                    x, y = x * x - y * y + cx, 2 * x * y + cy
+                    if x * x + y * y > 4:
+                        count[row, col] = iteration
+                        break
+    return count
+
+@pytest.mark.parametrize('factor, extended', [('1.01', False), ('0.99', True)])
+def test_extended_range_below_threshold(factor, extended):
+    # Square views, so the threshold applies to both spans.
+    coord_range = deep_view(1j, DeepMandelbrot.EXTENDED_THRESHOLD * Decimal(factor), (16, 16))
+    complex_set = DeepMandelbrot(100, coord_range, (16, 16))
+    complex_set.generate_template(16, 16)
+    assert complex_set.extended == extended
+    assert (complex_set.scale_exponent < -900) == extended
+
+def test_extended_range_matches_decimal_reference():
+    xy_vals = (10, 8)
+    coord_range = deep_view(1j, '1e-300', xy_vals)
+    complex_set = DeepMandelbrot(3000, coord_range, xy_vals)
+    count = complex_set.generate_set().count
+
+    assert complex_set.extended
+    assert len(np.unique(count)) > 1
+    np.testing.assert_array_equal(count, reference(coord_range, xy_vals, 3000))
@@ -0,0 +1,58 @@
+import math
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import FloatExp
+
+def value(extended:FloatExp, shift=0) -> np.ndarray:
+    """The complex128 values of extended values multiplied by 2**shift, to bring them back into the float64 range."""
+    return np.ldexp(extended.mantissa.real, extended.exponent + shift) + 1j * np.ldexp(extended.mantissa.imag, extended.exponent + shift)
+
+@pytest.mark.parametrize('mantissa, exponent', [(3 + 4j, 0), (-0.001 + 1e-9j, -1500), (1j, 2000), (math.ldexp(1, -1070), 0)])
+def test_mantissas_are_normalized(mantissa, exponent):
+    extended = FloatExp(np.array([mantissa]), exponent)
+    largest = max(abs(extended.mantissa[0].real), abs(extended.mantissa[0].imag))
+    assert 0.5 <= largest < 1
+    assert value(extended, -exponent)[0] == mantissa
+
+def test_zero_gets_the_lowest_exponent():
+    zero = FloatExp(np.zeros(2))
+    np.testing.assert_array_equal(zero.exponent, FloatExp.ZERO_EXPONENT)
+    np.testing.assert_array_equal((zero * zero).exponent, FloatExp.ZERO_EXPONENT)
+    np.testing.assert_array_equal(value(zero + FloatExp(np.full(2, 0.75), -1500), 1500), 0.75)
+
+def test_multiplication_adds_exponents_past_the_float64_range():
+    a = FloatExp(np.array([1.5 + 0.5j, -3 + 1j]), -1000)
+    b = FloatExp(np.array([0.75 - 0.25j, 2j]), -1100)
+    product = a * b
+    np.testing.assert_allclose(value(product, 2100), np.array([1.5 + 0.5j, -3 + 1j]) * np.array([0.75 - 0.25j, 2j]), rtol=1e-15)
+
+    # Back inside the float64 range.
+    np.testing.assert_array_equal((product * FloatExp(np.ones(2), 2100)).to_complex(), value(product, 2100))
+
+def test_addition_aligns_exponents():
+    a = FloatExp(np.array([1, 1, 1 + 1j]), np.array([-1100, 0, -1100]))
+    b = FloatExp(np.array([1, 1, -1j]), np.array([-1101, -2000, -1100]))
+    total = a + b
+    np.testing.assert_array_equal(value(total[0:1], 1100), [1.5])
+    # A value far below the precision of the other is lost, like in float64.
+    np.testing.assert_array_equal(value(total[1:2]), [1])
+    np.testing.assert_array_equal(value(total[2:3], 1100), [1])
+
+def test_square_below_the_float64_range():
+    square = FloatExp(np.array([3 + 4j]), -600)**2
+    np.testing.assert_array_equal(value(square, 1200), [-7 + 24j])
+    np.testing.assert_array_equal(square.to_complex(), [0])
+
+    with pytest.raises(ValueError, match='only be squared'):
+        FloatExp(np.array([1j]))**3
+
+def test_log2abs_across_exponents():
+    extended = FloatExp(np.array([3 + 4j, 3 + 4j, 0, 1]), np.array([0, -1174, 0, 1500]))
+    np.testing.assert_allclose(extended.log2abs(), [math.log2(5), math.log2(5) - 1174, -np.inf, 1500])
+
+def test_mixing_with_complex128():
+    extended = FloatExp(np.array([0.25 + 0.5j, 1]), -10)
+    mixed = 2 * extended + np.array([1j, 0])
+    assert isinstance(mixed, FloatExp)
+    np.testing.assert_array_equal(np.asarray(mixed), 2 * np.array([0.25 + 0.5j, 1]) / 1024 + np.array([1j, 0]))
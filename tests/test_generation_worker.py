@@ -0,0 +1,92 @@
+import threading
+
+from Modules.SetViewer.GenerationWorker import GenerationWorker
+
+TIMEOUT = 10
+
+def counting_steps(count:int, started=None, release=None, done=None):
+    """Steps taking snapshots of their number, returning the final snapshot once every step ran.
+
+    Every step after the first sets the started event and waits for the release event, so tests can cancel the worker mid-generation.
+    Steps are recorded in done as they run.
+
+    """
+    for step in range(0, count):
+        if started is not None and step > 0:
+            started.set()
+            release.wait(TIMEOUT)
+        if done is not None:
+            done.append(step)
+        yield lambda final, step=step: (step, final)
+    return lambda final: (count, final)
+
+def test_queue_is_bounded_and_ends_with_the_final_snapshot():
+    worker = GenerationWorker(counting_steps(50), size=2)
+    sizes = []
+    original = worker.queue.put_nowait
+    worker.queue.put_nowait = lambda item: (original(item), sizes.append(worker.queue.qsize()))
+    worker.start()
+    worker.join(TIMEOUT)
+
+    assert not worker.is_alive() and worker.finished and worker.error is None
+    assert max(sizes) <= 2
+    # Nobody drew the first snapshots, so the rest were skipped rather than holding the generation back.
+    assert worker.latest() == (50, True)
+    assert worker.latest() is None
+
+def test_cancelled_worker_posts_its_stopped_state():
+    started, release = threading.Event(), threading.Event()
+    done = []
+    worker = GenerationWorker(counting_steps(100, started, release, done))
+    worker.start()
+    started.wait(TIMEOUT)
+    worker.cancel()
+    release.set()
+    worker.join(TIMEOUT)
+
+    assert not worker.is_alive() and worker.cancelled and not worker.finished
+    assert worker.latest() == (done[-1], True)
+    assert len(done) < 100
+
+def test_discarded_worker_posts_no_stale_snapshot():
+    started, release = threading.Event(), threading.Event()
+    worker = GenerationWorker(counting_steps(100, started, release))
+    worker.start()
+    started.wait(TIMEOUT)
+    worker.cancel(discard=True)
+    assert worker.queue.empty()
+
+    release.set()
+    worker.join(TIMEOUT)
+    assert not worker.is_alive() and worker.discarded and not worker.finished
+    assert worker.queue.empty()
+
+def test_workers_wait_for_the_previous_worker_to_exit():
+    started, release = threading.Event(), threading.Event()
+    order = []
+    previous = GenerationWorker(counting_steps(100, started, release, order))
+    previous.start()
+    started.wait(TIMEOUT)
+
+    worker = GenerationWorker(counting_steps(1, done=order), previous=previous)
+    previous.cancel(discard=True)
+    worker.start()
+    release.set()
+    worker.join(TIMEOUT)
+
+    assert not previous.is_alive() and not worker.is_alive()
+    # The new generation only ran its step once the previous one stopped after its current step.
+    assert order[-1] == 0 and order[:-1] == list(range(0, len(order) - 1))
+    assert worker.latest() == (1, True)
+
+def test_errors_stop_the_worker():
+    def failing_steps():
+        yield lambda final: (0, final)
+        raise RuntimeError('step failed')
+
+    worker = GenerationWorker(failing_steps())
+    worker.start()
+    worker.join(TIMEOUT)
+
+    assert not worker.is_alive() and not worker.finished
+    assert isinstance(worker.error, RuntimeError)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import CoordinateRange
+from Modules.ComplexSets.Sets import Julia, Mandelbrot
+
+X_RANGE = (-2.5, 1)
+Y_RANGE = (-1.75, 1.75)
+XY_VALS = (130, 101)
+ITERATIONS = 1000
+JULIA_CONSTANT = complex(-0.835, -0.2321)
+
+def baseline(constant=None) -> np.ndarray:
+    """Iterates the pixels of the view with the original complex128 kernel, z**2 + c until abs(z) > 2."""
+    real, imag = np.meshgrid(*Mandelbrot(ITERATIONS, CoordinateRange(*X_RANGE, *Y_RANGE), XY_VALS).axes())
+    grid = real + 1j * imag
+    z = grid.copy() if constant is not None else np.zeros_like(grid)
+    c = constant if constant is not None else grid
+    mask = np.ones(grid.shape, dtype=bool)
+    count = np.zeros(grid.shape, dtype=np.uint32)
+
+    for iteration in range(1, ITERATIONS + 1):
+        z[mask] = z[mask]**2 + (c[mask] if constant is None else c)
+        diverged = np.logical_and(np.absolute(z) > 2, mask)
+        count[diverged] = iteration
+        mask = np.logical_and(mask, np.logical_not(diverged))
+    return count
+
+@pytest.mark.parametrize('options', [{}, {'compact': True}, {'interior_check': False}])
+def test_mandelbrot_float64_matches_baseline_kernel(options):
+    complex_set = Mandelbrot(ITERATIONS, CoordinateRange(*X_RANGE, *Y_RANGE), XY_VALS, **options)
+    np.testing.assert_array_equal(complex_set.generate_set().count, baseline())
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_julia_float64_matches_baseline_kernel(compact):
+    complex_set = Julia(ITERATIONS, CoordinateRange(*X_RANGE, *Y_RANGE), XY_VALS, JULIA_CONSTANT, compact=compact)
+    np.testing.assert_array_equal(complex_set.generate_set().count, baseline(JULIA_CONSTANT))
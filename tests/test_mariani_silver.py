@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import CoordinateRange
+from Modules.ComplexSets.Renderers import MarianiSilverRenderer
+from Modules.ComplexSets.Sets import Julia, Mandelbrot
+
+RABBIT = complex(-0.123, 0.745)
+
+@pytest.mark.parametrize('bounds', [(-4, 2, -3, 3), (-6, 6, -6, 6), (-10, 10, -10, 10), (-2.5, 1, -1.75, 1.75)])
+def test_mandelbrot_matches_generate_set(bounds):
+    make = lambda: Mandelbrot(500, CoordinateRange(*bounds), (128, 128))
+    expected = make().generate_set().count
+    np.testing.assert_array_equal(MarianiSilverRenderer().render(make()).count, expected)
+
+@pytest.mark.parametrize('bounds', [(-1.5, 1.5, -1.5, 1.5), (-2, 2, -2, 2), (-4, 4, -3, 3)])
+def test_julia_matches_generate_set(bounds):
+    make = lambda: Julia(500, CoordinateRange(*bounds), (128, 99), RABBIT)
+    expected = make().generate_set().count
+    np.testing.assert_array_equal(MarianiSilverRenderer().render(make()).count, expected)
+
+def test_root_border_of_one_value_is_subdivided():
+    # The border of a zoomed out view escapes at once all around the set.
+    complex_set = Mandelbrot(100, CoordinateRange(-10, 10, -10, 10), (64, 64))
+    count = MarianiSilverRenderer().render(complex_set).count
+    assert (count == 0).any()
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import ComplexSet, CoordinateRange
+from Modules.ComplexSets.ComplexSet import InvalidPrecision
+from Modules.ComplexSets.Sets import Julia, Mandelbrot
+
+XY_VALS = (101, 101)
+
+@pytest.mark.parametrize('precision, dtype', [('float32', np.float32), ('float64', np.float64), ('auto', np.float32)])
+def test_precision_picks_the_float_dtype(precision, dtype):
+    complex_set = Mandelbrot(50, CoordinateRange(-2.5, 1, -1.75, 1.75), XY_VALS, precision=precision)
+    data = complex_set.generate_set()
+
+    assert complex_set.float_dtype == dtype
+    assert complex_set.template.real.dtype == dtype
+    assert data.re.dtype == dtype and data.im.dtype == dtype
+
+def test_unknown_precisions_are_rejected():
+    with pytest.raises(InvalidPrecision):
+        Julia(50, CoordinateRange(-1.5, 1.5, -1.5, 1.5), XY_VALS, complex(-0.835, -0.2321), precision='float16')
+
+@pytest.mark.parametrize('factor, precision', [(1.01, 'float32'), (0.99, 'float64')])
+def test_auto_precision_switches_at_the_spacing_threshold(factor, precision):
+    # Coordinates up to 2 in magnitude, so the threshold is AUTO_PRECISION_MARGIN float32 epsilons of 2.
+    threshold = ComplexSet.AUTO_PRECISION_MARGIN * np.finfo(np.float32).eps * 2
+    span = threshold * factor * (XY_VALS[0] - 1)
+    complex_set = Mandelbrot(50, CoordinateRange(-0.75, -0.75 + span, 0.1, 0.1 + span), XY_VALS, precision='auto')
+
+    assert complex_set.resolve_precision() == precision
+    assert complex_set.float_dtype == ComplexSet.FLOAT_DTYPES[precision]
+
+@pytest.mark.parametrize('iterations, dtype', [(255, np.uint16), (254, np.uint8), (65534, np.uint16), (65535, np.uint32)])
+def test_count_dtype_fits_one_iteration_past_the_maximum(iterations, dtype):
+    complex_set = Mandelbrot(iterations, CoordinateRange(-2.5, 1, -1.75, 1.75), XY_VALS)
+    assert complex_set.count_dtype == dtype
+    assert np.iinfo(complex_set.count_dtype).max >= iterations + 1
+
+def test_iterating_past_the_maximum_records_its_count():
+    # Iterated until StopIteration rather than stepped, points diverging on the iteration past the maximum are counted.
+    complex_set = Mandelbrot(3, CoordinateRange(-2.5, 1, -1.75, 1.75), (351, 351), interior_check=False)
+    for _ in complex_set:
+        pass
+    assert complex_set.data.count.max() == 4
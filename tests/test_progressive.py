@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import CoordinateRange
+from Modules.ComplexSets.Renderers import ProgressiveRenderer
+from Modules.ComplexSets.Sets import Julia, Mandelbrot
+
+SETS = {
+    'mandelbrot': lambda: Mandelbrot(300, CoordinateRange(-0.76, -0.72, 0.08, 0.12), (97, 83)),
+    'julia': lambda: Julia(300, CoordinateRange(-1.5, 1.5, -1.5, 1.5), (97, 83), complex(-0.835, -0.2321))
+}
+
+@pytest.mark.parametrize('name', SETS)
+@pytest.mark.parametrize('guess', [True, False])
+def test_final_pass_matches_generate_set(name, guess):
+    expected = SETS[name]().generate_set().count
+    result = ProgressiveRenderer(guess=guess).render(SETS[name]())
+    np.testing.assert_array_equal(result.count, expected)
+
+def test_passes_preview_the_full_grid():
+    complex_set = SETS['mandelbrot']()
+    renderer = ProgressiveRenderer()
+    steps = [(step, preview.shape) for step, preview in renderer.passes(complex_set)]
+    assert steps == [(step, (83, 97)) for step in ProgressiveRenderer.DEFAULT_STEPS]
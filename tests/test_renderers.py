@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import CoordinateRange
+from Modules.ComplexSets.Renderers import ChunkedRenderer, TileRenderer
+from Modules.ComplexSets.Sets import Julia, Mandelbrot
+
+SETS = {
+    'mandelbrot': lambda **kwargs: Mandelbrot(300, CoordinateRange(-0.76, -0.72, 0.08, 0.12), (97, 83), **kwargs),
+    'julia': lambda **kwargs: Julia(300, CoordinateRange(-1.5, 1.5, -1.5, 1.5), (97, 83), complex(-0.123, 0.745), **kwargs)
+}
+
+def finish(complex_set):
+    """Iterates a set up to its maximum iterations without starting over, like the viewer does."""
+    while complex_set.iteration < complex_set.max_iterations:
+        next(complex_set)
+        if complex_set.compact and complex_set._active_idx is not None and len(complex_set._active_idx) == 0:
+            complex_set.iteration = complex_set.max_iterations
+    return complex_set.data
+
+@pytest.mark.parametrize('name', SETS)
+def test_chunked_renderer_matches_generate_set(name):
+    expected = SETS[name]().generate_set().count
+    result = ChunkedRenderer(threads=2, chunk_size=16).render(SETS[name]())
+    np.testing.assert_array_equal(result.count, expected)
+
+@pytest.mark.parametrize('name', SETS)
+def test_tile_renderer_matches_generate_set(name):
+    expected = SETS[name]().generate_set().count
+    renderer = TileRenderer(workers=2, tile_size=(32, 32))
+    try:
+        result = renderer.render(SETS[name]())
+    finally:
+        renderer.close()
+    np.testing.assert_array_equal(result.count, expected)
+
+@pytest.mark.parametrize('name', SETS)
+@pytest.mark.parametrize('options', [{'compact': True}, {'periodicity': True}, {'compact': True, 'periodicity': True}])
+def test_kernel_options_match_generate_set(name, options):
+    expected = SETS[name]().generate_set().count
+    np.testing.assert_array_equal(SETS[name](**options).generate_set().count, expected)
+
+def test_interior_check_matches_generate_set():
+    expected = SETS['mandelbrot'](interior_check=False).generate_set().count
+    np.testing.assert_array_equal(SETS['mandelbrot']().generate_set().count, expected)
+
+@pytest.mark.parametrize('name', SETS)
+@pytest.mark.parametrize('compact', [False, True])
+def test_extended_generation_matches_generate_set(name, compact):
+    expected = SETS[name](compact=compact).generate_set().count
+
+    complex_set = SETS[name](compact=compact)
+    complex_set.max_iterations = 100
+    complex_set.generate_set()
+    assert complex_set.can_extend(SETS[name](compact=compact))
+    complex_set.extend(300)
+    np.testing.assert_array_equal(finish(complex_set).count, expected)
+
+@pytest.mark.parametrize('name', SETS)
+def test_reused_generation_matches_generate_set(name):
+    previous = SETS[name]()
+    previous.generate_set()
+
+    # Panning by whole pixels lands the previous pixels on the new grid.
+    shifted = SETS[name]()
+    shifted.coord_range = previous.offset(13, -7)
+    expected = shifted.clone().generate_set().count
+
+    assert shifted.reuse(previous) is not None
+    np.testing.assert_array_equal(shifted.generate_set().count, expected)
+
+BOUNDARY = lambda: Mandelbrot(3000, CoordinateRange(-0.74364, -0.74360, 0.13181, 0.13185), (200, 200))
+
+@pytest.mark.parametrize('columns, rows', [(50, 0), (13, -7), (-37, 21)])
+def test_reused_boundary_pixels_match_generate_set(columns, rows):
+    previous = BOUNDARY()
+    previous.generate_set()
+
+    shifted = BOUNDARY()
+    shifted.coord_range = previous.offset(columns, rows)
+    expected = shifted.clone().generate_set().count
+
+    # Every overlapping pixel keeps its coordinates bit for bit.
+    (old_real, old_imag), (real, imag) = previous.axes(), shifted.axes()
+    np.testing.assert_array_equal(np.intersect1d(old_real, real), real[max(0, -columns):200 - max(0, columns)])
+    np.testing.assert_array_equal(np.intersect1d(old_imag, imag), imag[max(0, -rows):200 - max(0, rows)])
+
+    assert shifted.reuse(previous) is not None
+    np.testing.assert_array_equal(shifted.generate_set().count, expected)
+
+@pytest.mark.parametrize('center', [(0.5, 0.5), (0.3, 0.7), (0.61, 0.23)])
+def test_zoomed_boundary_pixels_match_generate_set(center):
+    previous = BOUNDARY()
+    previous.generate_set()
+
+    # Zooming in by 4 like the viewer, every fourth pixel of the new grid is a previous pixel.
+    (x0, x1), (y0, y1) = previous.coord_range.x_range, previous.coord_range.y_range
+    x, y = x0 + (x1 - x0) * center[0], y0 + (y1 - y0) * center[1]
+    pad_x, pad_y = (x1 - x0) / 8, (y1 - y0) / 8
+    zoomed = BOUNDARY()
+    zoomed.coord_range = previous.snap(CoordinateRange(x - pad_x, x + pad_x, y - pad_y, y + pad_y))
+    expected = zoomed.clone().generate_set().count
+
+    assert zoomed.reuse(previous) is not None
+    assert zoomed._seed[0].sum() == 50 * 50
+    np.testing.assert_array_equal(zoomed.generate_set().count, expected)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import CoordinateRange, TileCache, TileStore
+from Modules.ComplexSets.Renderers import ProgressiveRenderer
+from Modules.ComplexSets.Sets import Julia, Mandelbrot
+from Modules.SetViewer import SetViewer
+
+SETS = {
+    'mandelbrot': lambda iterations, compact: Mandelbrot(iterations, CoordinateRange(-0.76, -0.72, 0.08, 0.12), (97, 83), compact=compact),
+    'julia': lambda iterations, compact: Julia(iterations, CoordinateRange(-1.5, 1.5, -1.5, 1.5), (97, 83), complex(-0.835, -0.2321), compact=compact)
+}
+
+def headless_viewer(renderer):
+    """A viewer without any widgets, enough to run the generation steps the worker thread runs, see SetViewer.generate()."""
+    viewer = SetViewer.__new__(SetViewer)
+    viewer.renderer = renderer
+    viewer.cache = None
+    viewer.preview = None
+    return viewer
+
+def run(steps):
+    """Runs every step of a generation like the worker thread does."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration:
+            return
+
+def generate(viewer, complex_set, passes=None):
+    """Runs a new generation of a set like SetViewer.generate() does."""
+    run(viewer._SetViewer__steps(complex_set, lambda: viewer._SetViewer__prepare(complex_set, None, complex_set.clone()), passes))
+    return complex_set.data
+
+@pytest.mark.parametrize('name', SETS)
+@pytest.mark.parametrize('compact', [False, True])
+def test_raising_iterations_after_a_progressive_render_extends_it(name, compact):
+    viewer = headless_viewer(ProgressiveRenderer())
+    complex_set = SETS[name](100, compact)
+    data = generate(viewer, complex_set, viewer.renderer.passes(complex_set))
+    np.testing.assert_array_equal(data.count, SETS[name](100, compact).generate_set().count)
+
+    target = SETS[name](300, compact)
+    assert complex_set.can_extend(target)
+    run(viewer._SetViewer__steps(complex_set, lambda: viewer._SetViewer__extend(complex_set, 300)))
+    np.testing.assert_array_equal(complex_set.data.count, generate(headless_viewer(None), target).count)
+
+def test_inexact_progressive_renders_start_over():
+    viewer = headless_viewer(ProgressiveRenderer(exact=False))
+    complex_set = SETS['mandelbrot'](100, True)
+    generate(viewer, complex_set, viewer.renderer.passes(complex_set))
+    assert not complex_set.can_extend(SETS['mandelbrot'](300, True))
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_tiles_stored_by_the_viewer_match_batch_generation(tmp_path, compact):
+    # Few iterations, so many points diverge on the iteration past the maximum, on whole tiles 2**-5 apart.
+    make = lambda: Mandelbrot(3, CoordinateRange(-3, 0.96875, -2, 1.96875), (128, 128), compact=compact, interior_check=False)
+    viewer = headless_viewer(None)
+    viewer.cache = TileCache(tile_size=32, tile_store=TileStore(str(tmp_path)))
+    expected = make().generate_set().count
+    np.testing.assert_array_equal(generate(viewer, make()).count, expected)
+
+    # A batch process only finds the tiles the viewer stored.
+    batch = TileCache(tile_size=32, tile_store=TileStore(str(tmp_path)))
+    np.testing.assert_array_equal(batch.render(make()).count, expected)
+    assert batch.misses == 0
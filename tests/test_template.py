@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import CoordinateRange, Template
+from Modules.ComplexSets.Sets import Julia, Mandelbrot
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    Template.clear()
+    yield
+    Template.clear()
+
+def axes(start:float, size=64) -> tuple:
+    return (np.linspace(start, start + 1, size), np.linspace(-1, 1, size))
+
+def test_views_with_the_same_axes_share_the_template():
+    coord_range = CoordinateRange(-2.5, 1, -1.75, 1.75)
+    mandelbrot = Mandelbrot(50, coord_range, (80, 60))
+    julia = Julia(50, CoordinateRange(-2.5, 1, -1.75, 1.75), (80, 60), complex(-0.835, -0.2321))
+
+    assert mandelbrot.template is julia.template
+    assert mandelbrot.template is mandelbrot.clone().template
+    assert mandelbrot.template is not Mandelbrot(50, coord_range, (80, 61)).template
+    assert mandelbrot.template is not Mandelbrot(50, coord_range, (80, 60), precision='float32').template
+
+    with pytest.raises(ValueError):
+        mandelbrot.template.real[0] = 0
+
+def test_least_recently_used_templates_are_evicted_past_the_budget(monkeypatch):
+    nbytes = Template(*axes(0)).nbytes
+    monkeypatch.setattr(Template, 'CACHE_BUDGET', 2 * nbytes)
+
+    first = Template.shared(*axes(0), np.float64)
+    second = Template.shared(*axes(1), np.float64)
+    assert Template.shared(*axes(0), np.float64) is first
+    assert Template.cache_nbytes() == 2 * nbytes
+
+    # The second template is the least recently used one by now.
+    Template.shared(*axes(2), np.float64)
+    assert Template.cache_nbytes() == 2 * nbytes
+    assert Template.shared(*axes(0), np.float64) is first
+    assert Template.shared(*axes(1), np.float64) is not second
+
+def test_clear_forgets_every_template():
+    template = Template.shared(*axes(0), np.float64)
+    assert Template.cache_nbytes() == template.nbytes
+
+    Template.clear()
+    assert Template.cache_nbytes() == 0
+    assert Template.shared(*axes(0), np.float64) is not template
@@ -0,0 +1,83 @@
+import numpy as np
+
+from Modules.ComplexSets import ComplexSet, CoordinateRange, TileCache
+from Modules.ComplexSets.Sets import Julia, Mandelbrot
+
+def spacings(complex_set):
+    x_range, y_range = complex_set.coord_range.x_range, complex_set.coord_range.y_range
+    width, height = complex_set.xy_vals
+    return ((x_range[1] - x_range[0]) / (width - 1), (y_range[1] - y_range[0]) / (height - 1))
+
+def snapped(cache, complex_set):
+    complex_set.coord_range = cache.snap(complex_set)
+    return complex_set
+
+def test_snap_keeps_the_spacing():
+    cache = TileCache()
+    complex_set = Mandelbrot(100, CoordinateRange(-2.3, 0.9, -1.1, 1.3), (150, 90))
+    before = spacings(complex_set)
+    x0 = complex_set.coord_range.x_range[0]
+    snapped(cache, complex_set)
+
+    np.testing.assert_allclose(spacings(complex_set), before, rtol=2**-24)
+    assert abs(complex_set.coord_range.x_range[0] - x0) < before[0]
+    assert cache.locate(complex_set) is not None
+
+def test_views_lie_on_the_grid_of_their_spacing():
+    complex_set = Mandelbrot(100, CoordinateRange(-2.3, 0.9, -1.1, 1.3), (150, 90))
+    (x_spacing, y_spacing), i0, j0 = TileCache().locate(complex_set)
+    real, imag = complex_set.axes()
+    np.testing.assert_array_equal(real, (i0 + np.arange(150)) * x_spacing)
+    np.testing.assert_array_equal(imag, (j0 + np.arange(90)) * y_spacing)
+
+def test_render_matches_generate_set():
+    cache = TileCache(tile_size=32)
+    make = lambda: snapped(cache, Julia(200, CoordinateRange(-1.6, 1.6, -1.2, 1.2), (100, 75), complex(-0.835, -0.2321)))
+    expected = make().generate_set().count
+
+    np.testing.assert_array_equal(cache.render(make()).count, expected)
+    assert cache.misses > 0
+
+    # The second render is assembled from cached tiles only.
+    misses = cache.misses
+    np.testing.assert_array_equal(cache.render(make()).count, expected)
+    assert cache.misses == misses
+
+def test_seeded_pan_matches_generate_set():
+    cache = TileCache(tile_size=16)
+    first = snapped(cache, Mandelbrot(300, CoordinateRange(-0.8, -0.7, 0.05, 0.12), (96, 64)))
+    cache.store(first, first.generate_set())
+
+    panned = Mandelbrot(300, first.offset(20, -12), (96, 64))
+    expected = panned.clone().generate_set().count
+    assert cache.seed(panned) is not None
+    np.testing.assert_array_equal(panned.generate_set().count, expected)
+    assert cache.hits > 0
+
+BOUNDARY = lambda: Mandelbrot(3000, CoordinateRange(-0.74364, -0.74360, 0.13181, 0.13185), (200, 200))
+
+def test_tiles_give_back_the_grid_of_the_view():
+    cache = TileCache(tile_size=32)
+    complex_set = BOUNDARY()
+    (x_spacing, y_spacing), i0, j0 = cache.locate(complex_set)
+    real, imag = complex_set.axes()
+    np.testing.assert_array_equal(real, (i0 + np.arange(200)) * x_spacing)
+    np.testing.assert_array_equal(imag, (j0 + np.arange(200)) * y_spacing)
+
+    # The bounds of every tile are exact, so a view covering it lies on the same grid.
+    for tx in range(i0 // 32, (i0 + 199) // 32 + 1):
+        bounds = (tx * 32 * x_spacing, (tx * 32 + 31) * x_spacing)
+        assert ComplexSet.pixel_grid(bounds, 32) == (tx * 32, x_spacing)
+
+def test_boundary_views_from_the_cache_match_generate_set():
+    expected = BOUNDARY().generate_set().count
+    np.testing.assert_array_equal(TileCache(tile_size=32).render(BOUNDARY()).count, expected)
+
+    # A panned view caches part of the tiles of the view, which seed it.
+    cache = TileCache(tile_size=32)
+    panned = BOUNDARY()
+    panned.coord_range = panned.offset(40, -24)
+    cache.store(panned, panned.clone().generate_set())
+    seeded = BOUNDARY()
+    assert 0 < cache.seed(seeded) < len(cache.tiles(cache.locate(seeded), seeded.xy_vals))
+    np.testing.assert_array_equal(seeded.generate_set().count, expected)
@@ -0,0 +1,67 @@
+import asyncio
+import io
+import numpy as np
+import pytest
+
+from Modules.ComplexSets import TileServer
+
+async def fetch(port:int, target:str) -> tuple:
+    """Requests a target on a connection that the client asks to close, reading the response until EOF."""
+    reader, writer = await asyncio.open_connection(TileServer.HOST, port)
+    writer.write(('GET %s HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n' % target).encode('latin-1'))
+    await writer.drain()
+
+    # The server closing the connection ends the read, a worker holding on to the socket would time it out.
+    response = await asyncio.wait_for(reader.read(), timeout=30)
+    writer.close()
+
+    head, _, body = response.partition(b'\r\n\r\n')
+    return (int(head.split()[1]), body)
+
+def serve(targets:list) -> list:
+    """Starts a server, fetches every target one after another and shuts the server down."""
+    async def run():
+        tile_server = TileServer(port=0, workers=1, iterations=100)
+        server = await tile_server.start()
+        try:
+            return [await fetch(tile_server.port, target) for target in targets]
+        finally:
+            server.close()
+            await server.wait_closed()
+            tile_server.close()
+
+    return asyncio.run(run())
+
+def test_tile_round_trip():
+    (status, body), (cached, again) = serve(['/mandelbrot/1/0/1.npy', '/mandelbrot/1/0/1.npy'])
+
+    assert status == 200 and cached == 200
+    assert body == again
+    expected = TileServer.build('mandelbrot', TileServer.coord_range(1, 0, 1), 100).generate_set().count
+    np.testing.assert_array_equal(np.load(io.BytesIO(body)), expected[::-1])
+
+def test_start_spawns_every_worker():
+    async def run():
+        tile_server = TileServer(port=0, workers=2, iterations=100)
+        server = await tile_server.start()
+        try:
+            return len(tile_server.executor._processes)
+        finally:
+            server.close()
+            await server.wait_closed()
+            tile_server.close()
+
+    assert asyncio.run(run()) == 2
+
+@pytest.mark.parametrize('target, status', [
+    ('/mandelbrot/0/0/0.png?iterations=abc', 400),
+    ('/mandelbrot/0/0/0.png?iterations=0', 400),
+    ('/mandelbrot/0/0/0.png?colormap=nope', 400),
+    ('/julia/0/0/0.png?real=x', 400),
+    ('/mandelbrot/1/2/0.png', 404),
+    ('/newton/0/0/0.png', 404),
+    ('/mandelbrot/0/0/0.jpg', 404),
+    ('/tiles', 404)
+])
+def test_invalid_requests(target, status):
+    assert serve([target])[0][0] == status
@@ -0,0 +1,87 @@
+import json
+import os
+import numpy as np
+
+from Modules.ComplexSets import CoordinateRange, SetData, TileCache, TileStore
+from Modules.ComplexSets.Sets import Mandelbrot
+
+def test_stored_tiles_match_generate_set(tmp_path):
+    writer = TileCache(tile_size=16, tile_store=TileStore(str(tmp_path)))
+    complex_set = Mandelbrot(200, CoordinateRange(-2, 0.5, -1.25, 1.25), (81, 81))
+    complex_set.coord_range = writer.snap(complex_set)
+    expected = complex_set.clone().generate_set().count
+    writer.render(complex_set)
+
+    # A new process only finds the tiles on disk.
+    reader = TileCache(tile_size=16, tile_store=TileStore(str(tmp_path)))
+    np.testing.assert_array_equal(reader.render(complex_set.clone()).count, expected)
+    assert reader.misses == 0
+
+def test_stores_of_another_version_are_cleared(tmp_path):
+    (tmp_path / 'old.npy').write_bytes(b'')
+    with open(tmp_path / TileStore.INDEX, 'w') as f:
+        json.dump({'old': {'file': 'old.npy', 'shape': [1, 1], 'float_dtype': '<f8', 'count_dtype': '|u1',
+                           'compressed': False, 'nbytes': 0, 'used': 1}}, f)
+
+    store = TileStore(str(tmp_path))
+    assert store.nbytes == 0
+    assert not os.path.exists(tmp_path / 'old.npy')
+    with open(tmp_path / TileStore.INDEX, 'r') as f:
+        assert json.load(f) == {'version': TileStore.VERSION, 'entries': {}}
+
+def noisy_tile(seed=0):
+    """A tile that doesn't compress, so it's saved as a memory-mapped .npy file."""
+    rng = np.random.default_rng(seed)
+    return SetData.from_arrays(rng.random((16, 16)), rng.random((16, 16)), rng.integers(0, 200, (16, 16)).astype(np.uint8))
+
+def test_stored_tiles_are_never_written_again(tmp_path, monkeypatch):
+    writer = TileCache(tile_size=16, tile_store=TileStore(str(tmp_path)))
+    complex_set = Mandelbrot(200, CoordinateRange(-2, 0.5, -1.25, 1.25), (81, 81))
+    complex_set.coord_range = writer.snap(complex_set)
+    data = writer.render(complex_set)
+
+    # A new process only finds the tiles on disk, and they may be mapped by the tiles it loads.
+    store = TileStore(str(tmp_path))
+    tile = store.get(next(iter(writer._tiles)))
+    puts = []
+    monkeypatch.setattr(store, 'put', lambda *args: puts.append(args))
+    TileCache(tile_size=16, tile_store=store).store(complex_set, data)
+    assert puts == []
+    monkeypatch.undo()
+
+    store.put(('tile',), noisy_tile())
+    store.put(('tile',), noisy_tile(1))
+    np.testing.assert_array_equal(store.get(('tile',)).re, noisy_tile().re)
+    assert tile is not None
+
+def test_mapped_files_are_deleted_once_released(tmp_path):
+    store = TileStore(str(tmp_path))
+    store.put(('tile',), noisy_tile())
+    path = tmp_path / (TileStore.name(('tile',)) + '.npy')
+    tile = store.get(('tile',))
+
+    store.capacity = 0
+    assert ('tile',) not in store and store.nbytes == 0
+    assert path.exists()
+    store.flush()
+    with open(tmp_path / TileStore.INDEX, 'r') as f:
+        assert json.load(f)['orphans'] == [path.name]
+
+    del tile
+    store.flush()
+    assert not path.exists()
+    with open(tmp_path / TileStore.INDEX, 'r') as f:
+        assert 'orphans' not in json.load(f)
+
+def test_orphans_of_another_process_are_deleted_when_opened(tmp_path):
+    store = TileStore(str(tmp_path))
+    store.put(('tile',), noisy_tile())
+    tile = store.get(('tile',))
+    store.capacity = 0
+    store.flush()
+
+    path = tmp_path / (TileStore.name(('tile',)) + '.npy')
+    assert path.exists()
+    del tile, store
+    TileStore(str(tmp_path))
+    assert not path.exists()